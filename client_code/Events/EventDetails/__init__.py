@@ -9,6 +9,9 @@ import anvil.tables.query as q
 import anvil.users
 from anvil.tables import app_tables
 
+from ... import event_store
+from .. import task_edits
+
 
 class EventDetails(EventDetailsTemplate):
     def __init__(self, event_id=24, **properties):
@@ -17,6 +20,14 @@ class EventDetails(EventDetailsTemplate):
         self.event_id = event_id
         self.event_data = None
 
+        # Task edits show in place and are saved in batches
+        self.task_edits = task_edits.TaskEdits(
+            self.task_changes_saved, self.task_changes_failed
+        )
+        self.set_event_handler("hide", self.form_hide)
+        self.task_views = {}
+        self.stat_values = {}
+
         if event_id:
             self.load_event_data()
         else:
@@ -25,9 +36,12 @@ class EventDetails(EventDetailsTemplate):
 
     def load_event_data(self):
         """Load event data from server"""
+        # Save queued task edits first so the reload includes them
+        self.task_edits.flush()
+
         with Notification("Loading event...", timeout=None):
             try:
-                result = anvil.server.call("get_event_details", self.event_id)
+                result = event_store.get_full_event(self.event_id)
 
                 if result["success"]:
                     self.event_data = result["event"]
@@ -45,6 +59,7 @@ class EventDetails(EventDetailsTemplate):
 
         # Clear container
         self.column_panel_main.clear()
+        self.task_edits.attach(self.column_panel_main)
 
         # Header Section
         self.add_event_header()
@@ -217,12 +232,12 @@ class EventDetails(EventDetailsTemplate):
         )
 
         # Tasks
-        tasks = self.event_data.get("tasks", [])
-        completed_tasks = sum(1 for t in tasks if t.get("is_done"))
+        completed_tasks = self.event_data.get("task_done", 0)
+        total_tasks = self.event_data.get("task_total", 0)
         stats_panel.add_component(
             self.create_stat_card(
                 icon="✓",
-                value=f"{completed_tasks}/{len(tasks)}",
+                value=f"{completed_tasks}/{total_tasks}",
                 label="Tasks Done",
                 color="#ff9800",
             )
@@ -271,10 +286,12 @@ class EventDetails(EventDetailsTemplate):
         # Icon
         card_content.add_component(Label(text=icon, font_size=32, align="center"))
 
-        # Value
-        card_content.add_component(
-            Label(text=value, font_size=24, bold=True, align="center", foreground=color)
+        # Value (kept so counters can be patched without a re-render)
+        value_label = Label(
+            text=value, font_size=24, bold=True, align="center", foreground=color
         )
+        self.stat_values[label] = value_label
+        card_content.add_component(value_label)
 
         # Label
         card_content.add_component(
@@ -590,6 +607,7 @@ class EventDetails(EventDetailsTemplate):
                 )
             )
         else:
+            self.task_views = {}
             for task in tasks:
                 task_card = self.create_task_card(task)
                 card_content.add_component(task_card)
@@ -628,6 +646,13 @@ class EventDetails(EventDetailsTemplate):
 
         task_content.add_component(task_row)
 
+        self.task_views[task["id"]] = {
+            "task": task,
+            "card": task_card,
+            "checkbox": checkbox,
+            "text": task_text,
+        }
+
         # Due date
         if task.get("due_date"):
             due_date = task["due_date"]
@@ -683,9 +708,9 @@ class EventDetails(EventDetailsTemplate):
         budget = self.event_data.get("budget", 0)
         budget_items = self.event_data.get("budget_items", [])
 
-        # Calculate totals
-        estimated_total = sum(item.get("estimated_amount", 0) for item in budget_items)
-        actual_total = sum(item.get("actual_amount", 0) for item in budget_items)
+        # Totals are maintained on the event row
+        estimated_total = self.event_data.get("budget_estimated", 0)
+        actual_total = self.event_data.get("budget_actual", 0)
 
         # Total card
         total_card = m3.Card(appearance="filled", spacing_above="small")
@@ -911,28 +936,65 @@ class EventDetails(EventDetailsTemplate):
     # ========================================================================
 
     def toggle_task_complete(self, **event_args):
-        """Toggle task completion"""
+        """Tick or untick a task in place and queue the edit for saving"""
         sender = event_args["sender"]
         task_id = sender.tag.task_id
-        is_done = sender.checked
-
-        try:
-            result = anvil.server.call("update_task_status", task_id, is_done)
-            if result["success"]:
-                Notification(
-                    "Task updated!" if is_done else "Task marked incomplete",
-                    timeout=2,
-                    style="success",
-                ).show()
-                # Reload to refresh UI
-                self.load_event_data()
-            else:
-                alert(f"Error: {result.get('error')}", title="Error")
-                sender.checked = not is_done  # Revert
-        except Exception as e:
-            print(f"Error updating task: {e}")
-            alert(f"Failed to update task: {str(e)}", title="Error")
-            sender.checked = not is_done  # Revert
+        task = self.task_views[task_id]["task"]
+
+        changed = dict(task, is_done=sender.checked)
+        if not sender.checked and changed.get("status") == "Done":
+            changed["status"] = None
+
+        self.task_edits.queue(task_id, {"is_done": sender.checked}, dict(task))
+        self.apply_task(task_id, changed)
+
+    def apply_task(self, task_id, changed):
+        """Show a task's new state and shift the done counter to match"""
+        view = self.task_views.get(task_id)
+        if view is None:
+            return
+
+        task = view["task"]
+        delta = int(task_counts_done(changed)) - int(task_counts_done(task))
+        task.update(changed)
+        event_store.update_task(self.event_id, task_id, changed)
+
+        is_done = task.get("is_done")
+        view["checkbox"].checked = is_done
+        view["card"].appearance = "outlined" if is_done else "filled"
+        view["text"].text = f"~~{task['task']}~~" if is_done else task["task"]
+        view["text"].bold = not is_done
+        view["text"].foreground = "#999" if is_done else "#000"
+
+        self.event_data["task_done"] = self.event_data.get("task_done", 0) + delta
+        self.update_task_counters()
+
+    def update_task_counters(self):
+        """Patch the task count in the stats row"""
+        completed_tasks = self.event_data.get("task_done", 0)
+        total_tasks = self.event_data.get("task_total", 0)
+
+        if "Tasks Done" in self.stat_values:
+            self.stat_values["Tasks Done"].text = f"{completed_tasks}/{total_tasks}"
+
+    def task_changes_saved(self, rollups):
+        """Take the server's counts once a batch of edits is stored"""
+        if self.event_id in rollups:
+            self.event_data.update(rollups[self.event_id])
+            event_store.set_rollups(self.event_id, rollups[self.event_id])
+            self.update_task_counters()
+
+    def task_changes_failed(self, snapshots, error):
+        """Put back the tasks whose changes could not be saved"""
+        for task_id, task in snapshots.items():
+            self.apply_task(task_id, task)
+        Notification(
+            f"Could not update tasks: {error}", timeout=4, style="danger"
+        ).show()
+
+    def form_hide(self, **event_args):
+        """Save queued task edits when navigating away"""
+        self.task_edits.flush()
 
     def edit_event_details(self, **event_args):
         """Open edit dialog"""
@@ -955,3 +1017,8 @@ class EventDetails(EventDetailsTemplate):
         """Share event"""
         # TODO: Implement sharing functionality
         alert("Share functionality coming soon!", title="Share Event")
+
+
+def task_counts_done(task):
+    """Mirrors the server's rollup rule: ticked or in the Done status"""
+    return bool(task.get("is_done")) or task.get("status") == "Done"
@@ -10,6 +10,9 @@ import anvil.users
 from anvil.tables import app_tables
 from datetime import datetime, timezone
 
+from ... import event_store
+from .. import task_edits
+
 
 class EventDetails2(EventDetails2Template):
     def __init__(self, event_id=24, **properties):
@@ -17,6 +20,17 @@ class EventDetails2(EventDetails2Template):
 
         self.event_id = event_id
         self.event_data = None
+        # Plan sections fetched on first expand, kept across re-renders
+        self.section_cache = {}
+
+        # Task edits show in place and are saved in batches
+        self.task_edits = task_edits.TaskEdits(
+            self.task_changes_saved, self.task_changes_failed
+        )
+        self.set_event_handler("hide", self.form_hide)
+        self.task_views = {}
+        self.stat_values = {}
+        self.tasks_header_btn = None
 
         if event_id:
             self.load_event_data()
@@ -26,9 +40,12 @@ class EventDetails2(EventDetails2Template):
 
     def load_event_data(self):
         """Load event data from server"""
+        # Save queued task edits first so the reload includes them
+        self.task_edits.flush()
+
         with Notification("Loading event...", timeout=None):
             try:
-                result = anvil.server.call("get_event_details", self.event_id)
+                result = event_store.get_event(self.event_id)
 
                 if result["success"]:
                     self.event_data = result["event"]
@@ -46,6 +63,7 @@ class EventDetails2(EventDetails2Template):
 
         # Clear container
         self.column_panel_main.clear()
+        self.task_edits.attach(self.column_panel_main)
 
         # Apply mobile-first role
         self.column_panel_main.role = "mobile-page"
@@ -69,11 +87,11 @@ class EventDetails2(EventDetails2Template):
         left_column.add_component(self.create_event_details_card())
 
         # Selected Options Card (with accordion)
-        if self.event_data.get("event_options"):
+        if self.event_data.get("has_options"):
             left_column.add_component(self.create_selected_options_card())
 
         # AI Plan Sections (with accordions)
-        if self.event_data.get("ai_response"):
+        if self.event_data.get("plan_outline"):
             left_column.add_component(self.create_ai_plan_sections())
 
         content_grid.add_component(left_column, width="60%")
@@ -102,9 +120,13 @@ class EventDetails2(EventDetails2Template):
     # ACCORDION HELPER (Proven Pattern from ai_ui_builder)
     # ========================================================================
 
-    def create_accordion_container(self, title, initially_open=False, color="#1976d2"):
+    def create_accordion_container(
+        self, title, initially_open=False, color="#1976d2", build_content=None
+    ):
         """
         Create accordion header and content panel with toggle
+        build_content(content_panel) fills the panel the first time it is
+        opened; it returns False when loading failed, to retry next open.
         Returns: (header_container, header_btn, content_panel)
         """
 
@@ -145,10 +167,20 @@ class EventDetails2(EventDetails2Template):
         )
 
         # Toggle functionality
-        is_expanded = {"value": initially_open}
+        is_expanded = {"value": initially_open, "built": build_content is None}
+
+        def build():
+            if not is_expanded["built"]:
+                content_panel.clear()
+                is_expanded["built"] = build_content(content_panel) is not False
+
+        if initially_open:
+            build()
 
         def toggle(**event_args):
             is_expanded["value"] = not is_expanded["value"]
+            if is_expanded["value"]:
+                build()
             content_panel.visible = is_expanded["value"]
             header_btn.icon = (
                 "mi:expand_more" if is_expanded["value"] else "mi:chevron_right"
@@ -165,6 +197,59 @@ class EventDetails2(EventDetails2Template):
 
         return (header_container, header_btn, content_panel)
 
+    # ========================================================================
+    # LAZY SECTION DATA
+    # ========================================================================
+
+    def cached_section(self, key, load):
+        """Section data loaded once per form; re-expanding reads the cache"""
+        if key not in self.section_cache:
+            try:
+                result = load()
+            except Exception as e:
+                print(f"Error loading {key}: {e}")
+                return None
+            if not result["success"]:
+                print(f"Error loading {key}: {result.get('error')}")
+                return None
+            self.section_cache[key] = result
+        return self.section_cache[key]
+
+    def fetch_plan_section(self, section_key):
+        """Payload of one plan section, or None if it could not be loaded"""
+        result = self.cached_section(
+            section_key,
+            lambda: anvil.server.call(
+                "get_event_sections", self.event_id, [section_key]
+            ),
+        )
+        if result is None:
+            return None
+        sections = result["sections"]
+        return sections[0]["payload"] if sections else None
+
+    def fetch_event_part(self, part):
+        """Event options or budget items, or None if they could not be loaded"""
+        try:
+            if part == "budget_items":
+                return event_store.get_budget_items(self.event_id)
+            return event_store.get_part(self.event_id, part)
+        except Exception as e:
+            print(f"Error loading {part}: {e}")
+            return None
+
+    def add_load_error(self, content_panel):
+        content_panel.add_component(
+            Label(
+                text="Could not load this section. Close and reopen to retry.",
+                font_size=13,
+                italic=True,
+                foreground="#d32f2f",
+                role="section-content-padding",
+            )
+        )
+        return False
+
     # ========================================================================
     # HEADER SECTION (Sticky on Mobile)
     # ========================================================================
@@ -279,12 +364,12 @@ class EventDetails2(EventDetails2Template):
         )
 
         # Tasks
-        tasks = self.event_data.get("tasks", [])
-        completed_tasks = sum(1 for t in tasks if t.get("is_done"))
+        completed_tasks = self.event_data.get("task_done", 0)
+        total_tasks = self.event_data.get("task_total", 0)
         stats_panel.add_component(
             self.create_stat_card(
                 icon="✓",
-                value=f"{completed_tasks}/{len(tasks)}",
+                value=f"{completed_tasks}/{total_tasks}",
                 label="Tasks Done",
                 color="#ff9800",
             )
@@ -331,10 +416,12 @@ class EventDetails2(EventDetails2Template):
         # Icon
         card_content.add_component(Label(text=icon, font_size=32, align="center"))
 
-        # Value
-        card_content.add_component(
-            Label(text=value, font_size=24, bold=True, align="center", foreground=color)
+        # Value (kept so counters can be patched without a re-render)
+        value_label = Label(
+            text=value, font_size=24, bold=True, align="center", foreground=color
         )
+        self.stat_values[label] = value_label
+        card_content.add_component(value_label)
 
         # Label
         card_content.add_component(
@@ -433,13 +520,38 @@ class EventDetails2(EventDetails2Template):
 
         # Accordion
         header_container, header_btn, content_panel = self.create_accordion_container(
-            title="⭐ Your Selected Options", initially_open=False, color="#7b1fa2"
+            title="⭐ Your Selected Options",
+            initially_open=False,
+            color="#7b1fa2",
+            build_content=self.build_selected_options,
         )
 
+        # Assemble
+        card_content = m3.CardContentContainer(margin="0px")
+        card_content.add_component(header_container)
+        card_content.add_component(content_panel)
+
+        section.add_component(card_content)
+        return section
+
+    def build_selected_options(self, content_panel):
+        """Fetch and render the selected options on first expand"""
+        options = self.fetch_event_part("event_options")
+        if options is None:
+            return self.add_load_error(content_panel)
+
         # Content
         options_content = ColumnPanel(spacing="medium", role="section-content-padding")
 
-        options = self.event_data["event_options"]
+        if not options:
+            options_content.add_component(
+                Label(
+                    text="No options selected yet.",
+                    font_size=13,
+                    italic=True,
+                    foreground="#999",
+                )
+            )
 
         # Render each selected option
         for section_key, selection in options.items():
@@ -466,14 +578,6 @@ class EventDetails2(EventDetails2Template):
 
         content_panel.add_component(options_content)
 
-        # Assemble
-        card_content = m3.CardContentContainer(margin="0px")
-        card_content.add_component(header_container)
-        card_content.add_component(content_panel)
-
-        section.add_component(card_content)
-        return section
-
     def create_option_display_card(self, option):
         """Create display card for selected option"""
 
@@ -512,41 +616,67 @@ class EventDetails2(EventDetails2Template):
 
         container = ColumnPanel(spacing="medium")
 
-        ai_response = self.event_data.get("ai_response", {})
-        plan = ai_response.get("plan", {})
+        # Only the outline is loaded up front; bodies are fetched on expand
+        outline = self.event_data.get("plan_outline", [])
 
         # Decorations
-        if "decorations" in plan:
+        if "plan.decorations" in outline:
             container.add_component(
-                self.create_decorations_section(plan["decorations"])
+                self.create_lazy_section(
+                    "🎈 Decorations",
+                    "plan.decorations",
+                    self.create_decorations_content,
+                    color="#e91e63",
+                )
             )
 
         # Logistics
-        if "logistics" in ai_response:
+        if "logistics" in outline:
             container.add_component(
-                self.create_simple_section("🚚 Logistics", ai_response["logistics"])
+                self.create_lazy_section(
+                    "🚚 Logistics", "logistics", self.create_list_content
+                )
             )
 
         # Contingency Plans
-        if "contingency_notes" in ai_response:
+        if "contingency_notes" in outline:
             container.add_component(
-                self.create_simple_section(
-                    "🛡️ Contingency Plans", ai_response["contingency_notes"]
+                self.create_lazy_section(
+                    "🛡️ Contingency Plans",
+                    "contingency_notes",
+                    self.create_list_content,
                 )
             )
 
         return container
 
-    def create_decorations_section(self, decorations):
-        """Decorations section with accordion"""
+    def create_lazy_section(self, title, section_key, render, color="#3f51b5"):
+        """Plan section accordion; the section is fetched and rendered on first expand"""
 
         section = ColumnPanel(role="collapsible-section", spacing="none")
 
+        def build(content_panel):
+            payload = self.fetch_plan_section(section_key)
+            if payload is None:
+                return self.add_load_error(content_panel)
+            content_panel.add_component(render(payload))
+
         # Accordion
         header_container, header_btn, content_panel = self.create_accordion_container(
-            title="🎈 Decorations", initially_open=False, color="#e91e63"
+            title=title, initially_open=False, color=color, build_content=build
         )
 
+        # Assemble
+        card_content = m3.CardContentContainer(margin="0px")
+        card_content.add_component(header_container)
+        card_content.add_component(content_panel)
+
+        section.add_component(card_content)
+        return section
+
+    def create_decorations_content(self, decorations):
+        """Decorations section body"""
+
         # Content
         dec_content = ColumnPanel(spacing="small", role="section-content-padding")
 
@@ -590,25 +720,10 @@ class EventDetails2(EventDetails2Template):
             tip_card.add_component(tip_content)
             dec_content.add_component(tip_card)
 
-        content_panel.add_component(dec_content)
-
-        # Assemble
-        card_content = m3.CardContentContainer(margin="0px")
-        card_content.add_component(header_container)
-        card_content.add_component(content_panel)
-
-        section.add_component(card_content)
-        return section
-
-    def create_simple_section(self, title, items):
-        """Simple list section with accordion"""
-
-        section = ColumnPanel(role="collapsible-section", spacing="none")
+        return dec_content
 
-        # Accordion
-        header_container, header_btn, content_panel = self.create_accordion_container(
-            title=title, initially_open=False, color="#3f51b5"
-        )
+    def create_list_content(self, items):
+        """Simple list section body"""
 
         # Content
         list_content = ColumnPanel(spacing="tiny", role="section-content-padding")
@@ -619,15 +734,7 @@ class EventDetails2(EventDetails2Template):
         else:
             list_content.add_component(Label(text=str(items), font_size=13))
 
-        content_panel.add_component(list_content)
-
-        # Assemble
-        card_content = m3.CardContentContainer(margin="0px")
-        card_content.add_component(header_container)
-        card_content.add_component(content_panel)
-
-        section.add_component(card_content)
-        return section
+        return list_content
 
     def create_bullet_item(self, text, icon="•"):
         """Create bullet item"""
@@ -646,14 +753,16 @@ class EventDetails2(EventDetails2Template):
         section = ColumnPanel(role="collapsible-section", spacing="none")
 
         tasks = self.event_data.get("tasks", [])
-        completed_tasks = sum(1 for t in tasks if t.get("is_done"))
+        completed_tasks = self.event_data.get("task_done", 0)
+        total_tasks = self.event_data.get("task_total", 0)
 
         # Accordion
         header_container, header_btn, content_panel = self.create_accordion_container(
-            title=f"✓ Tasks ({completed_tasks}/{len(tasks)})",
+            title=f"✓ Tasks ({completed_tasks}/{total_tasks})",
             initially_open=True,
             color="#ff9800",
         )
+        self.tasks_header_btn = header_btn
 
         # Add task button in header
         add_btn = m3.Button(
@@ -679,6 +788,7 @@ class EventDetails2(EventDetails2Template):
                 )
             )
         else:
+            self.task_views = {}
             for task in tasks:
                 tasks_content.add_component(self.create_task_card(task))
 
@@ -722,6 +832,13 @@ class EventDetails2(EventDetails2Template):
 
         task_content.add_component(task_row)
 
+        self.task_views[task["id"]] = {
+            "task": task,
+            "card": task_card,
+            "checkbox": checkbox,
+            "text": task_text,
+        }
+
         # Due date
         if task.get("due_date"):
             due_date = task["due_date"]
@@ -759,7 +876,10 @@ class EventDetails2(EventDetails2Template):
 
         # Accordion
         header_container, header_btn, content_panel = self.create_accordion_container(
-            title="💰 Budget", initially_open=False, color="#4caf50"
+            title="💰 Budget",
+            initially_open=False,
+            color="#4caf50",
+            build_content=self.build_budget_content,
         )
 
         # Add item button in header
@@ -773,15 +893,28 @@ class EventDetails2(EventDetails2Template):
         add_btn.set_event_handler("click", self.add_budget_item)
         header_container.add_component(add_btn)
 
+        # Assemble
+        card_content = m3.CardContentContainer(margin="0px")
+        card_content.add_component(header_container)
+        card_content.add_component(content_panel)
+
+        section.add_component(card_content)
+        return section
+
+    def build_budget_content(self, content_panel):
+        """Fetch and render the budget items on first expand"""
+        budget_items = self.fetch_event_part("budget_items")
+        if budget_items is None:
+            return self.add_load_error(content_panel)
+
         # Content
         budget_content = ColumnPanel(spacing="small", role="section-content-padding")
 
         budget = self.event_data.get("budget", 0)
-        budget_items = self.event_data.get("budget_items", [])
 
-        # Calculate totals
-        estimated_total = sum(item.get("estimated_amount", 0) for item in budget_items)
-        actual_total = sum(item.get("actual_amount", 0) for item in budget_items)
+        # Totals are maintained on the event row
+        estimated_total = self.event_data.get("budget_estimated", 0)
+        actual_total = self.event_data.get("budget_actual", 0)
 
         # Total card
         total_card = m3.Card(appearance="filled", role="budget-summary")
@@ -839,14 +972,6 @@ class EventDetails2(EventDetails2Template):
 
         content_panel.add_component(budget_content)
 
-        # Assemble
-        card_content = m3.CardContentContainer(margin="0px")
-        card_content.add_component(header_container)
-        card_content.add_component(content_panel)
-
-        section.add_component(card_content)
-        return section
-
     def create_budget_item_card(self, item):
         """Create budget item card"""
 
@@ -900,20 +1025,36 @@ class EventDetails2(EventDetails2Template):
     def create_timeline_card(self):
         """Event timeline card with accordion"""
 
+        if "plan.timeline" in self.event_data.get("plan_outline", []):
+            return self.create_lazy_section(
+                "⏰ Timeline",
+                "plan.timeline",
+                self.create_timeline_content,
+                color="#1976d2",
+            )
+
         section = ColumnPanel(role="collapsible-section", spacing="none")
 
         # Accordion
         header_container, header_btn, content_panel = self.create_accordion_container(
             title="⏰ Timeline", initially_open=False, color="#1976d2"
         )
+        content_panel.add_component(self.create_timeline_content([]))
+
+        # Assemble
+        card_content = m3.CardContentContainer(margin="0px")
+        card_content.add_component(header_container)
+        card_content.add_component(content_panel)
+
+        section.add_component(card_content)
+        return section
+
+    def create_timeline_content(self, timeline):
+        """Timeline section body"""
 
         # Content
         timeline_content = ColumnPanel(spacing="small", role="section-content-padding")
 
-        # Get timeline from AI response
-        ai_response = self.event_data.get("ai_response", {})
-        timeline = ai_response.get("plan", {}).get("timeline", [])
-
         if not timeline:
             timeline_content.add_component(
                 Label(
@@ -927,15 +1068,7 @@ class EventDetails2(EventDetails2Template):
             for i, item in enumerate(timeline):
                 timeline_content.add_component(self.create_timeline_item(item, i))
 
-        content_panel.add_component(timeline_content)
-
-        # Assemble
-        card_content = m3.CardContentContainer(margin="0px")
-        card_content.add_component(header_container)
-        card_content.add_component(content_panel)
-
-        section.add_component(card_content)
-        return section
+        return timeline_content
 
     def create_timeline_item(self, item, index):
         """Create timeline item"""
@@ -1025,27 +1158,66 @@ class EventDetails2(EventDetails2Template):
     # ========================================================================
 
     def toggle_task_complete(self, **event_args):
-        """Toggle task completion"""
+        """Tick or untick a task in place and queue the edit for saving"""
         sender = event_args["sender"]
         task_id = sender.tag.task_id
-        is_done = sender.checked
-
-        try:
-            result = anvil.server.call("update_task_status", task_id, is_done)
-            if result["success"]:
-                Notification(
-                    "Task updated!" if is_done else "Task marked incomplete",
-                    timeout=2,
-                    style="success",
-                ).show()
-                self.load_event_data()
-            else:
-                alert(f"Error: {result.get('error')}", title="Error")
-                sender.checked = not is_done
-        except Exception as e:
-            print(f"Error updating task: {e}")
-            alert(f"Failed to update task: {str(e)}", title="Error")
-            sender.checked = not is_done
+        task = self.task_views[task_id]["task"]
+
+        changed = dict(task, is_done=sender.checked)
+        if not sender.checked and changed.get("status") == "Done":
+            changed["status"] = None
+
+        self.task_edits.queue(task_id, {"is_done": sender.checked}, dict(task))
+        self.apply_task(task_id, changed)
+
+    def apply_task(self, task_id, changed):
+        """Show a task's new state and shift the done counters to match"""
+        view = self.task_views.get(task_id)
+        if view is None:
+            return
+
+        task = view["task"]
+        delta = int(task_counts_done(changed)) - int(task_counts_done(task))
+        task.update(changed)
+        event_store.update_task(self.event_id, task_id, changed)
+
+        is_done = task.get("is_done")
+        view["checkbox"].checked = is_done
+        view["card"].appearance = "outlined" if is_done else "filled"
+        view["text"].bold = not is_done
+        view["text"].foreground = "#999" if is_done else "#000"
+
+        self.event_data["task_done"] = self.event_data.get("task_done", 0) + delta
+        self.update_task_counters()
+
+    def update_task_counters(self):
+        """Patch the task counts in the stats row and the tasks header"""
+        completed_tasks = self.event_data.get("task_done", 0)
+        total_tasks = self.event_data.get("task_total", 0)
+
+        if "Tasks Done" in self.stat_values:
+            self.stat_values["Tasks Done"].text = f"{completed_tasks}/{total_tasks}"
+        if self.tasks_header_btn is not None:
+            self.tasks_header_btn.text = f"✓ Tasks ({completed_tasks}/{total_tasks})"
+
+    def task_changes_saved(self, rollups):
+        """Take the server's counts once a batch of edits is stored"""
+        if self.event_id in rollups:
+            self.event_data.update(rollups[self.event_id])
+            event_store.set_rollups(self.event_id, rollups[self.event_id])
+            self.update_task_counters()
+
+    def task_changes_failed(self, snapshots, error):
+        """Put back the tasks whose changes could not be saved"""
+        for task_id, task in snapshots.items():
+            self.apply_task(task_id, task)
+        Notification(
+            f"Could not update tasks: {error}", timeout=4, style="danger"
+        ).show()
+
+    def form_hide(self, **event_args):
+        """Save queued task edits when navigating away"""
+        self.task_edits.flush()
 
     def edit_event_details(self, **event_args):
         """Open edit dialog"""
@@ -1066,3 +1238,8 @@ class EventDetails2(EventDetails2Template):
     def share_event(self, **event_args):
         """Share event"""
         alert("Share functionality coming soon!", title="Share Event")
+
+
+def task_counts_done(task):
+    """Mirrors the server's rollup rule: ticked or in the Done status"""
+    return bool(task.get("is_done")) or task.get("status") == "Done"
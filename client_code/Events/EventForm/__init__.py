@@ -60,43 +60,88 @@ class EventForm(EventFormTemplate):
         self.btn_start.text = "⏳ Creating Plan..."
 
         try:
-            # result = anvil.server.call("create_event", **self.user_input)
-            result = anvil.server.call("get_event_with_ai_plan", 24)
-
-            if result["success"]:
-                # Store event ID
-                self.event_id = result["event"]["id"]
-
-                # Add event_id to output for save function
-                ai_plan_data = result["ai_plan"]
-                ai_plan_data["event_id"] = self.event_id
-
-                # Hide form, show AI results
-                self.btn_start.visible = False
-
-                ui_builder.build_event_plan_ui(ai_plan_data, self.cpanel_options)
-                self.cpanel_options.visible = True
-
-                # Success notification
-                Notification(
-                    f"✅ Event plan created! Event ID: {self.event_id}",
-                    timeout=3,
-                    style="success",
-                ).show()
-            else:
-                alert(f"Error:\n{result['error']}", title="Error")
-                self.btn_start.enabled = True
-                self.btn_start.text = "🎉 Start Planning"
+            # The event is created first so the plan, its usage and the saved
+            # selections all link to it; a retry reuses it
+            if self.event_id is None:
+                result = anvil.server.call("create_event", self.user_input)
+                if not result["success"]:
+                    raise Exception(result["error"])
+                self.event_id = result["event_id"]
+
+            # Plan in a background job; sections are rendered as the model
+            # finishes them, polled without holding a server call open
+            job = anvil.server.call("submit_plan_job", self.user_input, self.event_id)
+            self.plan_job_id = job["job_id"]
+            self.streamed_count = 0
+
+            # Rendering is keyed, so a re-plan reuses whatever an earlier
+            # attempt left in the panel and only touches changed sections
+            self.cpanel_options.visible = True
+
+            self.stream_timer = Timer(interval=0.5)
+            self.stream_timer.set_event_handler("tick", self.poll_plan_stream)
+            self.cpanel_start.add_component(self.stream_timer)
 
         except Exception as e:
-            print(f"Exception: {e}")
-            import traceback
+            self.show_plan_error(e)
 
-            traceback.print_exc()
+    def poll_plan_stream(self, **event_args):
+        """Render any plan sections finished since the last tick"""
 
-            alert(f"An error occurred:\n{str(e)}", title="Error")
-            self.btn_start.enabled = True
-            self.btn_start.text = "🎉 Start Planning"
+        try:
+            with anvil.server.no_loading_indicator:
+                job = anvil.server.call("get_plan_job", self.plan_job_id)
+            if not job["success"]:
+                raise Exception(job["error"])
+
+            if job["status"] == "failed":
+                raise Exception(job["error"])
+            if job["status"] != "done":
+                if len(job["sections"]) > self.streamed_count:
+                    self.streamed_count = len(job["sections"])
+                    ui_builder.build_event_plan_ui(
+                        ui_builder.plan_from_sections(job["sections"]),
+                        self.cpanel_options,
+                        keyed=True,
+                        partial=True,
+                    )
+                return
+
+            self.stop_plan_stream()
+
+            # Add event_id to output for save function
+            ai_plan_data = job["ai_plan"]
+            ai_plan_data["event_id"] = self.event_id
+            ui_builder.build_event_plan_ui(
+                ai_plan_data, self.cpanel_options, keyed=True
+            )
+
+            # Hide form, show AI results
+            self.btn_start.visible = False
+
+            Notification(
+                "✅ Event plan created!",
+                timeout=3,
+                style="success",
+            ).show()
+
+        except Exception as e:
+            self.stop_plan_stream()
+            self.show_plan_error(e)
+
+    def stop_plan_stream(self):
+        self.stream_timer.interval = 0
+        self.stream_timer.remove_from_parent()
+
+    def show_plan_error(self, e):
+        print(f"Exception: {e}")
+        import traceback
+
+        traceback.print_exc()
+
+        alert(f"An error occurred:\n{str(e)}", title="Error")
+        self.btn_start.enabled = True
+        self.btn_start.text = "🎉 Start Planning"
 
     # def btn_save_click(self, **event_args):
     #     """This method is called when the component is clicked."""
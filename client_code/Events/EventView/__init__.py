@@ -12,6 +12,7 @@ from collections import OrderedDict
 from anvil_extras.persistence import persisted_class
 from anvil_extras import popover
 from ...Tasks.TaskForm import TaskForm
+from ... import event_store
 
 
 @persisted_class
@@ -24,10 +25,20 @@ class EventView(EventViewTemplate):
         self.init_components(**properties)
 
         self.event_id = event_id
-        self.event_data, tasks, options = anvil.server.call("get_event_data", event_id)
+        self.event_data = event_store.get_event(event_id)["event"]
+        plan = event_store.get_part(event_id, "ai_response") or {}
         self._bind_event_details(self.event_data)
-        self._bind_task_details(tasks)
-        self._bind_budget_tracker(options["budget_tracker"])
+        self._bind_task_details(self._task_list())
+        self._bind_budget_tracker(plan.get("budget_tracker") or [])
+
+    def _task_list(self):
+        """The event's tasks and counts, shaped like get_event_tasks' result"""
+        done = self.event_data.get("task_done", 0)
+        return {
+            "tasks": self.event_data["tasks"],
+            "compl_cnt": done,
+            "incompl_cnt": self.event_data.get("task_total", 0) - done,
+        }
 
     def _bind_event_details(self, event_data):
         lst_keys = [
@@ -109,8 +120,6 @@ class EventView(EventViewTemplate):
         self.btn_add_task.pop("show")
 
     def refresh_tasks(self, **event_args):
-        task_list = anvil.server.call(
-            "get_event_tasks",
-            self.event_id,
-        )
-        self._bind_task_details(task_list)
+        # TaskForm has already put the new task in the store
+        self.event_data = event_store.get_event(self.event_id)["event"]
+        self._bind_task_details(self._task_list())
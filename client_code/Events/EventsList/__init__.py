@@ -4,36 +4,94 @@ from ._anvil_designer import EventsListTemplate
 from anvil import *
 import m3.components as m3
 import anvil.server
+import anvil.js
 import anvil.tables as tables
 import anvil.tables.query as q
 import anvil.users
 from anvil.tables import app_tables
 from datetime import datetime, timezone
 
+from ... import event_store
+from .. import virtual_grid
+
+SEARCH_DEBOUNCE = 0.3
+
+# sort_by -> (sort key, descending), matching EventsModule.EVENT_SORTS
+LOCAL_SORTS = {
+    "date_desc": ("datetime", True),
+    "date_asc": ("datetime", False),
+    "title_asc": ("title", False),
+    "created_desc": ("created", True),
+    "budget_desc": ("budget", True),
+}
+
 
 class EventsList(EventsListTemplate):
     def __init__(self, **properties):
         self.init_components(**properties)
 
         self.events = []
+        self.stats = {}
         self.filter_status = "all"
         self.sort_by = "date_desc"
 
+        # Events as loaded from the server for loaded_filter, in server order;
+        # self.events is the filtered and sorted view of them being shown
+        self.loaded = []
+        self.loaded_filter = None
+        self.sort_keys = {}  # event_id -> precomputed filter/sort values
+        self.filter_buttons = []
+
+        # Pagination state: cursor for the next page, None after the last one
+        self.cursor = None
+        self.loading_more = False
+        self.events_grid = None
+        self.load_more_panel = None
+        self.scroll_observer = None
+        self.set_event_handler("hide", self.form_hide)
+
+        # Search-as-you-type: query runs once typing pauses for SEARCH_DEBOUNCE
+        self.search_query = ""
+        self.search_timer = None
+        self.results_panel = None
+
         self.load_events()
 
     def load_events(self):
-        """Load user's events from server"""
+        """
+        Load the first page of the user's events, or every page already
+        loaded for this filter and sort from the event store
+        """
+
+        self.search_query = ""
 
         # with Notification("Loading events...", timeout=None):
         try:
+            listing = event_store.get_listing(self.filter_status, self.sort_by)
+            if listing is not None:
+                self.set_loaded(listing["events"])
+                self.stats = listing["stats"]
+                self.cursor = listing["cursor"]
+                self.render_event_list()
+                return
+
             result = anvil.server.call(
-                "get_user_events",
+                "get_event_summaries",
                 self.filter_status,
                 self.sort_by,
             )
 
             if result["success"]:
-                self.events = result["events"]
+                self.set_loaded(result["events"])
+                self.stats = result.get("stats", {})
+                self.cursor = result.get("cursor")
+                event_store.put_listing(
+                    self.filter_status,
+                    self.sort_by,
+                    result["events"],
+                    self.cursor,
+                    self.stats,
+                )
                 self.render_event_list()
             else:
                 alert(f"Error loading events: {result.get('error')}", title="Error")
@@ -41,10 +99,108 @@ class EventsList(EventsListTemplate):
             print(f"Error loading events: {e}")
             alert(f"Failed to load events: {str(e)}", title="Error")
 
+    def load_more_events(self, **event_args):
+        """Fetch the next page and append its cards to the grid"""
+
+        if not self.cursor or self.loading_more:
+            return
+
+        self.loading_more = True
+        try:
+            if self.search_query:
+                result = anvil.server.call(
+                    "search_events", self.search_query, self.cursor
+                )
+            else:
+                result = anvil.server.call(
+                    "get_event_summaries",
+                    self.filter_status,
+                    self.sort_by,
+                    self.cursor,
+                )
+
+            if result["success"]:
+                self.events.extend(result["events"])
+                self.cursor = result.get("cursor")
+                self.events_grid.set_items(self.events)
+                if self.search_query:
+                    event_store.put_events(result["events"])
+                else:
+                    # Pages only load while the view is the server's own order
+                    self.index_events(result["events"])
+                    self.loaded.extend(result["events"])
+                    event_store.put_listing(
+                        self.filter_status,
+                        self.sort_by,
+                        result["events"],
+                        self.cursor,
+                    )
+                self.update_load_more()
+            else:
+                alert(f"Error loading events: {result.get('error')}", title="Error")
+        except Exception as e:
+            print(f"Error loading events: {e}")
+            alert(f"Failed to load more events: {str(e)}", title="Error")
+        finally:
+            self.loading_more = False
+
+    def set_loaded(self, events):
+        """Take the first page (or every cached page) of a server listing"""
+        self.loaded = list(events)
+        self.loaded_filter = self.filter_status
+        self.sort_keys = {}
+        self.index_events(self.loaded)
+        self.events = list(self.loaded)
+
+    def index_events(self, events):
+        for event in events:
+            self.sort_keys[event["id"]] = sort_keys(event)
+
+    def can_show_locally(self, filter_status):
+        """
+        True when every event matching filter_status is already loaded:
+        the server listing has no more pages and covers that filter
+        """
+        return (
+            not self.search_query
+            and self.cursor is None
+            and self.loaded_filter in ("all", filter_status)
+        )
+
+    def show_local_events(self):
+        """Filter and sort the loaded events in place and re-render the grid"""
+        now = datetime.now(timezone.utc).timestamp()
+        events = [
+            event
+            for event in self.loaded
+            if matches_filter(self.sort_keys[event["id"]], self.filter_status, now)
+        ]
+
+        key, descending = LOCAL_SORTS.get(self.sort_by, LOCAL_SORTS["date_desc"])
+        present = [e for e in events if self.sort_keys[e["id"]][key] is not None]
+        missing = [e for e in events if self.sort_keys[e["id"]][key] is None]
+        present.sort(key=lambda e: self.sort_keys[e["id"]][key], reverse=descending)
+        # Events without a value go last either way
+        events = present + missing
+
+        self.events = events
+        for button in self.filter_buttons:
+            button.appearance = (
+                "filled"
+                if button.tag.filter_value == self.filter_status
+                else "outlined"
+            )
+
+        if self.events and self.events_grid is not None:
+            self.events_grid.set_items(self.events)
+        else:
+            self.render_results()
+
     def render_event_list(self):
         """Render the event list with filters and cards"""
 
         # Clear container
+        self.stop_scroll_observer()
         self.column_panel_main.clear()
 
         # Add header
@@ -56,11 +212,24 @@ class EventsList(EventsListTemplate):
         # Add stats summary
         self.add_stats_summary()
 
-        # Add events grid
-        if not self.events:
-            self.add_empty_state()
-        else:
+        # Events grid, re-rendered on its own by search
+        self.results_panel = ColumnPanel(spacing="none")
+        self.column_panel_main.add_component(self.results_panel)
+        self.render_results()
+
+    def render_results(self):
+        """Render the events grid (or empty state) into the results panel"""
+
+        self.stop_scroll_observer()
+        self.stop_events_grid()
+        self.results_panel.clear()
+
+        if self.events:
             self.add_events_grid()
+        elif self.search_query:
+            self.add_no_search_results()
+        else:
+            self.add_empty_state()
 
     # ========================================================================
     # HEADER SECTION
@@ -131,6 +300,7 @@ class EventsList(EventsListTemplate):
             ("completed", "Completed"),
         ]
 
+        self.filter_buttons = []
         for value, label in status_options:
             filter_btn = m3.Button(
                 text=label,
@@ -140,6 +310,7 @@ class EventsList(EventsListTemplate):
             filter_btn.tag.filter_value = value
             filter_btn.set_event_handler("click", self.apply_filter)
             filters_panel.add_component(filter_btn)
+            self.filter_buttons.append(filter_btn)
 
         # Spacer
         filters_panel.add_component(Spacer(width=20))
@@ -163,9 +334,19 @@ class EventsList(EventsListTemplate):
         filters_panel.add_component(sort_dropdown)
 
         # Search box (future enhancement)
-        search_box = TextBox(placeholder="🔍 Search events...", spacing_above="none")
+        search_box = TextBox(
+            placeholder="🔍 Search events...",
+            text=self.search_query,
+            spacing_above="none",
+        )
+        search_box.set_event_handler("change", self.search_changed)
         search_box.set_event_handler("pressed_enter", self.search_events)
         filters_panel.add_component(search_box)
+        self.search_box = search_box
+
+        self.search_timer = Timer(interval=0)
+        self.search_timer.set_event_handler("tick", self.search_events)
+        filters_panel.add_component(self.search_timer)
 
         self.column_panel_main.add_component(filters_panel)
 
@@ -178,11 +359,11 @@ class EventsList(EventsListTemplate):
 
         stats_panel = FlowPanel(spacing="medium", align="left", spacing_below="medium")
 
-        # Calculate stats
-        total_events = len(self.events)
-        upcoming_events = sum(1 for e in self.events if self.is_upcoming(e))
-        planning_events = sum(1 for e in self.events if e.get("status") == "planning")
-        total_budget = sum(e.get("budget", 0) for e in self.events)
+        # Stats cover every matching event, not just the loaded pages
+        total_events = self.stats.get("total", len(self.events))
+        upcoming_events = self.stats.get("upcoming", 0)
+        planning_events = self.stats.get("planning", 0)
+        total_budget = self.stats.get("total_budget", 0)
 
         # Total Events
         stats_panel.add_component(
@@ -226,388 +407,64 @@ class EventsList(EventsListTemplate):
     # ========================================================================
 
     def add_events_grid(self):
-        """Add grid of event cards"""
-
-        # Grid container (3 columns on desktop, responsive)
-        grid = FlowPanel(spacing="medium", align="left")
-
-        for event in self.events:
-            event_card = self.create_event_card(event)
-            grid.add_component(event_card, width="32%")
-
-        self.column_panel_main.add_component(grid)
-
-    def create_event_card(self, event):
-        """
-        Create comprehensive event card with all relevant info
-
-        Card includes:
-        - Status badge
-        - Event title
-        - Date & countdown
-        - Location
-        - Guest count
-        - Budget
-        - Progress indicators (tasks, budget)
-        - Quick actions (View, Edit, Delete)
-        """
-
-        # Main card container
-        card_container = ColumnPanel(
-            spacing="none", spacing_above="none", spacing_below="small"
-        )
-
-        # Card
-        card = m3.Card(appearance="outlined")
-        card.role = "card"
-        card_content = m3.CardContentContainer(margin="16px")
-
-        # Status badge (top right)
-        status = event.get("status", "planning")
-        status_badge = self.create_status_badge(status)
-        card_content.add_component(status_badge)
-
-        # Event Title
-        title = Label(
-            text=event["title"], font_size=18, bold=True, foreground="#1976d2"
-        )
-        title.role = "headline"
-        card_content.add_component(title)
-
-        # Description (truncated)
-        if event.get("description"):
-            desc_text = event["description"]
-            if len(desc_text) > 80:
-                desc_text = desc_text[:77] + "..."
-
-            card_content.add_component(
-                Label(
-                    text=desc_text,
-                    font_size=12,
-                    foreground="#666",
-                    spacing_above="tiny",
-                )
-            )
-
-        # Divider
-        card_content.add_component(Spacer(height=8))
-
-        # Date & Countdown
-        event_datetime = event.get("event_datetime")
-        if event_datetime:
-            date_panel = self.create_date_section(event_datetime)
-            card_content.add_component(date_panel)
-
-        # Location
-        location = event.get("location")
-        if location and location.get("formatted_address"):
-            loc_panel = FlowPanel(spacing="tiny", spacing_above="small")
-            loc_panel.add_component(Label(text="📍", font_size=14))
-
-            # Truncate long addresses
-            address = location["formatted_address"]
-            if len(address) > 40:
-                address = address[:37] + "..."
-
-            loc_panel.add_component(
-                Label(text=address, font_size=12, foreground="#666")
-            )
-            card_content.add_component(loc_panel)
-
-        # Info Row (Guests & Budget)
-        info_row = FlowPanel(spacing="medium", spacing_above="medium")
-
-        # Guest count
-        guest_count = event.get("guest_count", 0)
-        guest_panel = FlowPanel(spacing="tiny")
-        guest_panel.add_component(Label(text="👥", font_size=14))
-        guest_panel.add_component(
-            Label(
-                text=f"{guest_count} guests",
-                font_size=12,
-                bold=True,
-                foreground="#2196f3",
-            )
-        )
-        info_row.add_component(guest_panel)
-
-        # Budget
-        budget = event.get("budget", 0)
-        if budget > 0:
-            budget_panel = FlowPanel(spacing="tiny")
-            budget_panel.add_component(Label(text="💰", font_size=14))
-            budget_panel.add_component(
-                Label(
-                    text=f"${budget:,.0f}",
-                    font_size=12,
-                    bold=True,
-                    foreground="#4caf50",
-                )
-            )
-            info_row.add_component(budget_panel)
-
-        card_content.add_component(info_row)
-
-        # Progress Indicators
-        progress_section = self.create_progress_section(event)
-        if progress_section:
-            card_content.add_component(progress_section)
-
-        # Event Type Badge
-        if event.get("ai_response"):
-            event_classification = event["ai_response"].get("event_classification", "")
-            if event_classification:
-                type_badge = Label(
-                    text=f"🎯 {event_classification}",
-                    font_size=11,
-                    foreground="#673ab7",
-                    italic=True,
-                    spacing_above="small",
-                )
-                card_content.add_component(type_badge)
+        """Add the virtualized grid of event cards"""
 
-        # Divider
-        card_content.add_component(Spacer(height=8))
-
-        # Action Buttons
-        actions_row = FlowPanel(
-            spacing="small",
-            spacing_above="small",
+        # 3 columns; only rows near the viewport get (recycled) cards
+        self.events_grid = virtual_grid.VirtualGrid(
+            lambda: EventCard(self.view_event_details), columns=3, card_width="32%"
         )
+        self.results_panel.add_component(self.events_grid.component)
+        self.events_grid.set_items(self.events)
+        self.events_grid.start()
 
-        # View Details button
-        view_btn = m3.Button(
-            text="Details",
-            icon="mi:visibility",
-            appearance="filled",
-            size="tiny",
-            align="center",
-        )
-        view_btn.tag.event_id = event["id"]
-        view_btn.set_event_handler("click", self.view_event_details)
-        actions_row.add_component(view_btn, width="100%")
-
-        # # Edit button
-        # edit_btn = m3.Button(
-        #     text="Edit", icon="mi:edit", appearance="outlined", size="small"
-        # )
-        # edit_btn.tag.event_id = event["id"]
-        # edit_btn.set_event_handler("click", self.edit_event)
-        # actions_row.add_component(edit_btn)
-
-        # # Delete button
-        # delete_btn = m3.Button(
-        #     text="", icon="mi:delete", appearance="outlined", size="small"
-        # )
-        # delete_btn.foreground = "#f44336"
-        # delete_btn.tag.event_id = event["id"]
-        # delete_btn.set_event_handler("click", self.delete_event)
-        # actions_row.add_component(delete_btn)
-
-        card_content.add_component(actions_row)
-
-        # Make entire card clickable
-        def card_click(**event_args):
-            self.view_event_details(event_id=event["id"])
-
-        card.set_event_handler("x-click", card_click)
-
-        card.add_component(card_content)
-        card_container.add_component(card)
+        # Next-page sentinel below the grid
+        self.load_more_panel = ColumnPanel(spacing_above="medium")
+        self.results_panel.add_component(self.load_more_panel)
+        self.update_load_more()
 
-        return card_container
+    def update_load_more(self):
+        """Show a Load more button while pages remain and watch it for scrolling"""
 
-    def create_status_badge(self, status):
-        """Create status badge"""
+        self.stop_scroll_observer()
+        self.load_more_panel.clear()
+        if not self.cursor:
+            return
 
-        status_config = {
-            "planning": {"text": "PLANNING", "bg": "#ff9800", "icon": "✏️"},
-            "confirmed": {"text": "CONFIRMED", "bg": "#4caf50", "icon": "✓"},
-            "completed": {"text": "COMPLETED", "bg": "#2196f3", "icon": "🎉"},
-            "cancelled": {"text": "CANCELLED", "bg": "#f44336", "icon": "✗"},
-        }
-
-        config = status_config.get(
-            status, {"text": status.upper(), "bg": "#757575", "icon": "•"}
+        load_more_btn = m3.Button(
+            text="Load more", icon="mi:expand_more", appearance="outlined", align="center"
         )
+        load_more_btn.set_event_handler("click", self.load_more_events)
+        self.load_more_panel.add_component(load_more_btn)
 
-        badge_panel = FlowPanel(
-            spacing="tiny",
-            align="right",
-            spacing_below="small",
-        )
-        badge = Label(
-            text=f"{config['icon']} {config['text']}",
-            font_size=10,
-            bold=True,
-            background=config["bg"],
-            foreground="white",
-        )
-        badge_panel.add_component(badge)
-
-        return badge_panel
-
-    def create_date_section(self, event_datetime):
-        """Create date section with countdown"""
-
-        date_panel = ColumnPanel(spacing="tiny", spacing_above="small")
-
-        # Format date
-        if isinstance(event_datetime, str):
-            try:
-                event_datetime = datetime.fromisoformat(
-                    event_datetime.replace("Z", "+00:00")
-                )
-            except:
-                pass
-
-        if hasattr(event_datetime, "strftime"):
-            date_str = event_datetime.strftime("%B %d, %Y at %I:%M %p")
-        else:
-            date_str = str(event_datetime)
+        # Load the next page as the button scrolls into view; the button itself
+        # stays as the fallback where IntersectionObserver isn't available
+        def on_intersect(entries, *args):
+            if any(entry.isIntersecting for entry in entries):
+                self.load_more_events()
 
-        # Date display
-        date_row = FlowPanel(spacing="tiny")
-        date_row.add_component(Label(text="📅", font_size=14))
-        date_row.add_component(
-            Label(text=date_str, font_size=12, bold=True, foreground="#1976d2")
-        )
-        date_panel.add_component(date_row)
-
-        # Countdown
-        if hasattr(event_datetime, "replace"):
-            try:
-                now = datetime.now(timezone.utc)
-                if event_datetime.tzinfo is None:
-                    event_datetime = event_datetime.replace(tzinfo=timezone.utc)
-
-                delta = event_datetime - now
-                days_until = delta.days
-
-                countdown_text = ""
-                countdown_color = "#666"
-
-                if days_until < 0:
-                    countdown_text = f"{abs(days_until)} days ago"
-                    countdown_color = "#999"
-                elif days_until == 0:
-                    countdown_text = "📢 TODAY!"
-                    countdown_color = "#f44336"
-                elif days_until == 1:
-                    countdown_text = "⚡ Tomorrow"
-                    countdown_color = "#ff5722"
-                elif days_until <= 7:
-                    countdown_text = f"⏰ {days_until} days away"
-                    countdown_color = "#ff9800"
-                elif days_until <= 30:
-                    countdown_text = f"📆 {days_until} days away"
-                    countdown_color = "#2196f3"
-                else:
-                    countdown_text = f"🗓️ {days_until} days away"
-                    countdown_color = "#9c27b0"
-
-                countdown_label = Label(
-                    text=countdown_text,
-                    font_size=11,
-                    bold=True if days_until <= 7 else False,
-                    foreground=countdown_color,
-                    spacing_above="tiny",
-                )
-                date_panel.add_component(countdown_label)
-            except:
-                pass
-
-        return date_panel
-
-    def create_progress_section(self, event):
-        """Create progress indicators for tasks and budget"""
-
-        tasks = event.get("tasks", [])
-        budget_items = event.get("budget_items", [])
-
-        if not tasks and not budget_items:
-            return None
-
-        progress_panel = ColumnPanel(spacing="tiny", spacing_above="medium")
-
-        # Tasks progress
-        if tasks:
-            total_tasks = len(tasks)
-            completed_tasks = sum(1 for t in tasks if t.get("is_done"))
-            task_percentage = (
-                (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-            )
-
-            task_row = FlowPanel(spacing="small", align="left")
-            task_row.add_component(Label(text="✓", font_size=12, foreground="#4caf50"))
-            task_row.add_component(
-                Label(
-                    text=f"Tasks: {completed_tasks}/{total_tasks}",
-                    font_size=11,
-                    foreground="#666",
-                )
-            )
-
-            # Progress bar
-            progress_bar = self.create_progress_bar(task_percentage, "#4caf50")
-
-            task_col = ColumnPanel(spacing="tiny")
-            task_col.add_component(task_row)
-            task_col.add_component(progress_bar)
-
-            progress_panel.add_component(task_col)
-
-        # Budget progress
-        budget = event.get("budget", 0)
-        if budget_items and budget > 0:
-            estimated_total = sum(
-                item.get("estimated_amount", 0) for item in budget_items
-            )
-            budget_percentage = (
-                min((estimated_total / budget * 100), 100) if budget > 0 else 0
-            )
-
-            budget_row = FlowPanel(spacing="small", align="left", spacing_above="small")
-            budget_row.add_component(Label(text="💰", font_size=12))
-            budget_row.add_component(
-                Label(
-                    text=f"Budget: ${estimated_total:,.0f} / ${budget:,.0f}",
-                    font_size=11,
-                    foreground="#666",
-                )
+        try:
+            self.scroll_observer = anvil.js.window.IntersectionObserver(
+                on_intersect, {"rootMargin": "400px"}
             )
+            self.scroll_observer.observe(anvil.js.get_dom_node(load_more_btn))
+        except Exception as e:
+            print(f"Infinite scroll unavailable: {e}")
+            self.scroll_observer = None
 
-            # Progress bar (red if over budget)
-            bar_color = "#f44336" if budget_percentage > 100 else "#4caf50"
-            progress_bar = self.create_progress_bar(budget_percentage, bar_color)
-
-            budget_col = ColumnPanel(spacing="tiny")
-            budget_col.add_component(budget_row)
-            budget_col.add_component(progress_bar)
-
-            progress_panel.add_component(budget_col)
-
-        return progress_panel
-
-    def create_progress_bar(self, percentage, color):
-        """Create progress bar"""
-
-        bar_container = ColumnPanel(background="#e0e0e0", spacing="none")
-
-        # Fill (cap at 100% visually)
-        fill_width = min(percentage, 100)
-
-        bar_fill = Label(
-            text=f"  {percentage:.0f}%",
-            background=color,
-            foreground="white",
-            font_size=9,
-            bold=True,
-        )
+    def stop_scroll_observer(self):
+        if self.scroll_observer is not None:
+            self.scroll_observer.disconnect()
+            self.scroll_observer = None
 
-        bar_container.add_component(bar_fill)
+    def stop_events_grid(self):
+        if self.events_grid is not None:
+            self.events_grid.stop()
+            self.events_grid = None
 
-        return bar_container
+    def form_hide(self, **event_args):
+        """Drop page listeners when navigating away"""
+        self.stop_scroll_observer()
+        self.stop_events_grid()
 
     # ========================================================================
     # EMPTY STATE
@@ -654,29 +511,72 @@ class EventsList(EventsListTemplate):
         create_btn.set_event_handler("click", self.create_new_event)
         empty_container.add_component(create_btn)
 
-        self.column_panel_main.add_component(empty_container)
+        self.results_panel.add_component(empty_container)
+
+    def add_no_search_results(self):
+        """Empty state for a search with no matches"""
+
+        self.results_panel.add_component(
+            Label(
+                text=f"No events match \"{self.search_query}\"",
+                font_size=16,
+                align="center",
+                foreground="#999",
+                spacing_above="large",
+            )
+        )
 
     # ========================================================================
     # EVENT HANDLERS
     # ========================================================================
 
     def apply_filter(self, **event_args):
-        """Apply status filter"""
+        """Apply status filter; only goes to the server for missing pages"""
         sender = event_args["sender"]
+        local = self.can_show_locally(sender.tag.filter_value)
         self.filter_status = sender.tag.filter_value
-        self.load_events()
+        if local:
+            self.show_local_events()
+        else:
+            self.load_events()
 
     def apply_sort(self, **event_args):
-        """Apply sort order"""
+        """Apply sort order; only goes to the server for missing pages"""
         sender = event_args["sender"]
         self.sort_by = sender.selected_value
-        self.load_events()
+        if self.can_show_locally(self.filter_status):
+            self.show_local_events()
+        else:
+            self.load_events()
+
+    def search_changed(self, **event_args):
+        """Restart the debounce timer on every keystroke"""
+        self.search_timer.interval = 0
+        self.search_timer.interval = SEARCH_DEBOUNCE
 
     def search_events(self, **event_args):
-        """Search events (future enhancement)"""
-        search_text = event_args["sender"].text
-        Notification(f"Searching for: {search_text}", timeout=2).show()
-        # TODO: Implement search
+        """Run the search for the current search box text"""
+        self.search_timer.interval = 0
+        query = self.search_box.text.strip()
+        if query == self.search_query:
+            return
+
+        if not query:
+            self.load_events()
+            return
+
+        try:
+            result = anvil.server.call("search_events", query)
+            if result["success"]:
+                self.search_query = query
+                self.events = result["events"]
+                event_store.put_events(self.events)
+                self.cursor = result.get("cursor")
+                self.render_results()
+            else:
+                alert(f"Error searching events: {result.get('error')}", title="Error")
+        except Exception as e:
+            print(f"Error searching events: {e}")
 
     def view_event_details(self, event_id=None, **event_args):
         """Navigate to event details"""
@@ -703,6 +603,7 @@ class EventsList(EventsListTemplate):
                 result = anvil.server.call("delete_event", event_id)
 
                 if result["success"]:
+                    event_store.forget_event(event_id)
                     Notification(
                         "Event deleted successfully", timeout=3, style="success"
                     ).show()
@@ -717,22 +618,281 @@ class EventsList(EventsListTemplate):
         """Navigate to create event form"""
         open_form("Events.EventForm")
 
-    def is_upcoming(self, event):
-        """Check if event is upcoming"""
-        event_datetime = event.get("event_datetime")
-        if not event_datetime:
-            return False
 
+# ============================================================================
+# EVENT CARD (recycled by the virtual grid)
+# ============================================================================
+
+STATUS_BADGES = {
+    "planning": {"text": "PLANNING", "bg": "#ff9800", "icon": "✏️"},
+    "confirmed": {"text": "CONFIRMED", "bg": "#4caf50", "icon": "✓"},
+    "completed": {"text": "COMPLETED", "bg": "#2196f3", "icon": "🎉"},
+    "cancelled": {"text": "CANCELLED", "bg": "#f44336", "icon": "✗"},
+}
+
+
+def as_datetime(value):
+    """Event datetimes may arrive as ISO strings"""
+    if isinstance(value, str):
         try:
-            if isinstance(event_datetime, str):
-                event_datetime = datetime.fromisoformat(
-                    event_datetime.replace("Z", "+00:00")
-                )
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return value
+    return value
+
+
+def countdown(event_datetime):
+    """(text, color, bold) for the days until an event"""
+    if event_datetime.tzinfo is None:
+        event_datetime = event_datetime.replace(tzinfo=timezone.utc)
+    days_until = (event_datetime - datetime.now(timezone.utc)).days
+
+    if days_until < 0:
+        return f"{abs(days_until)} days ago", "#999", False
+    if days_until == 0:
+        return "📢 TODAY!", "#f44336", True
+    if days_until == 1:
+        return "⚡ Tomorrow", "#ff5722", True
+    if days_until <= 7:
+        return f"⏰ {days_until} days away", "#ff9800", True
+    if days_until <= 30:
+        return f"📆 {days_until} days away", "#2196f3", False
+    return f"🗓️ {days_until} days away", "#9c27b0", False
+
+
+def timestamp(value):
+    """Seconds since the epoch of an event datetime, or None"""
+    value = as_datetime(value)
+    if not hasattr(value, "timestamp"):
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def sort_keys(event):
+    """The values the list filters and sorts an event by, computed once"""
+    return {
+        "datetime": timestamp(event.get("event_datetime")),
+        "created": timestamp(event.get("created_at")),
+        "title": (event.get("title") or "").lower(),
+        "budget": event.get("budget"),
+        "status": event.get("status"),
+    }
+
+
+def matches_filter(keys, filter_status, now):
+    """Client-side twin of EventsModule.event_filter"""
+    if filter_status == "upcoming":
+        return keys["datetime"] is not None and keys["datetime"] > now
+    if filter_status and filter_status != "all":
+        return keys["status"] == filter_status
+    return True
+
+
+def truncate(text, length):
+    return text[: length - 3] + "..." if len(text) > length else text
+
+
+class EventCard:
+    """
+    An event card whose components are built once; bind() points it at
+    another event by setting properties only. Card includes:
+    - Status badge
+    - Event title and description
+    - Date & countdown
+    - Location
+    - Guest count
+    - Budget
+    - Progress indicators (tasks, budget)
+    - Event type and the Details action
+    """
+
+    def __init__(self, on_view):
+        self.event_id = None
+
+        # Main card container (fixed height, see the virtual-card role)
+        self.component = ColumnPanel(
+            spacing="none",
+            spacing_above="none",
+            spacing_below="small",
+            role="virtual-card",
+        )
+
+        card = m3.Card(appearance="outlined")
+        card.role = "card"
+        content = m3.CardContentContainer(margin="16px")
+
+        # Status badge (top right)
+        badge_panel = FlowPanel(spacing="tiny", align="right", spacing_below="small")
+        self.status_badge = Label(font_size=10, bold=True, foreground="white")
+        badge_panel.add_component(self.status_badge)
+        content.add_component(badge_panel)
+
+        # Title and description
+        self.title = Label(font_size=18, bold=True, foreground="#1976d2")
+        self.title.role = "headline"
+        content.add_component(self.title)
+        self.description = Label(font_size=12, foreground="#666", spacing_above="tiny")
+        content.add_component(self.description)
+
+        content.add_component(Spacer(height=8))
+
+        # Date & countdown
+        self.date_panel = ColumnPanel(spacing="tiny", spacing_above="small")
+        date_row = FlowPanel(spacing="tiny")
+        date_row.add_component(Label(text="📅", font_size=14))
+        self.date = Label(font_size=12, bold=True, foreground="#1976d2")
+        date_row.add_component(self.date)
+        self.date_panel.add_component(date_row)
+        self.countdown = Label(font_size=11, spacing_above="tiny")
+        self.date_panel.add_component(self.countdown)
+        content.add_component(self.date_panel)
+
+        # Location
+        self.location_panel = FlowPanel(spacing="tiny", spacing_above="small")
+        self.location_panel.add_component(Label(text="📍", font_size=14))
+        self.location = Label(font_size=12, foreground="#666")
+        self.location_panel.add_component(self.location)
+        content.add_component(self.location_panel)
+
+        # Info row (guests & budget)
+        info_row = FlowPanel(spacing="medium", spacing_above="medium")
+        guest_panel = FlowPanel(spacing="tiny")
+        guest_panel.add_component(Label(text="👥", font_size=14))
+        self.guests = Label(font_size=12, bold=True, foreground="#2196f3")
+        guest_panel.add_component(self.guests)
+        info_row.add_component(guest_panel)
+        self.budget_panel = FlowPanel(spacing="tiny")
+        self.budget_panel.add_component(Label(text="💰", font_size=14))
+        self.budget = Label(font_size=12, bold=True, foreground="#4caf50")
+        self.budget_panel.add_component(self.budget)
+        info_row.add_component(self.budget_panel)
+        content.add_component(info_row)
+
+        # Progress indicators
+        self.progress_panel = ColumnPanel(spacing="tiny", spacing_above="medium")
+        self.task_progress, self.task_text, self.task_bar = self.progress_row(
+            Label(text="✓", font_size=12, foreground="#4caf50")
+        )
+        self.budget_progress, self.budget_text, self.budget_bar = self.progress_row(
+            Label(text="💰", font_size=12)
+        )
+        self.progress_panel.add_component(self.task_progress)
+        self.progress_panel.add_component(self.budget_progress)
+        content.add_component(self.progress_panel)
+
+        # Event type badge
+        self.type_badge = Label(
+            font_size=11, foreground="#673ab7", italic=True, spacing_above="small"
+        )
+        content.add_component(self.type_badge)
 
-            now = datetime.now(timezone.utc)
-            if event_datetime.tzinfo is None:
-                event_datetime = event_datetime.replace(tzinfo=timezone.utc)
+        content.add_component(Spacer(height=8))
+
+        # Action buttons
+        actions_row = FlowPanel(spacing="small", spacing_above="small")
+        self.view_btn = m3.Button(
+            text="Details",
+            icon="mi:visibility",
+            appearance="filled",
+            size="tiny",
+            align="center",
+        )
+        self.view_btn.set_event_handler("click", on_view)
+        actions_row.add_component(self.view_btn, width="100%")
+        content.add_component(actions_row)
+
+        # Make entire card clickable
+        card.set_event_handler(
+            "x-click", lambda **event_args: on_view(event_id=self.event_id)
+        )
+
+        card.add_component(content)
+        self.component.add_component(card)
+
+    def progress_row(self, icon):
+        """(column, text label, bar fill label) for one progress indicator"""
+        row = FlowPanel(spacing="small", align="left")
+        row.add_component(icon)
+        text = Label(font_size=11, foreground="#666")
+        row.add_component(text)
+
+        bar = ColumnPanel(background="#e0e0e0", spacing="none")
+        fill = Label(foreground="white", font_size=9, bold=True)
+        bar.add_component(fill)
+
+        column = ColumnPanel(spacing="tiny")
+        column.add_component(row)
+        column.add_component(bar)
+        return column, text, fill
+
+    def bind(self, event):
+        """Show `event` on this card"""
+        self.event_id = event["id"]
+        self.view_btn.tag.event_id = event["id"]
+
+        status = event.get("status") or "planning"
+        config = STATUS_BADGES.get(
+            status, {"text": status.upper(), "bg": "#757575", "icon": "•"}
+        )
+        self.status_badge.text = f"{config['icon']} {config['text']}"
+        self.status_badge.background = config["bg"]
+
+        self.title.text = event["title"]
+        self.description.text = truncate(event.get("description") or "", 80)
+        self.description.visible = bool(event.get("description"))
+
+        # Date & countdown
+        event_datetime = as_datetime(event.get("event_datetime"))
+        self.date_panel.visible = bool(event_datetime)
+        if event_datetime:
+            has_date = hasattr(event_datetime, "strftime")
+            self.date.text = (
+                event_datetime.strftime("%B %d, %Y at %I:%M %p")
+                if has_date
+                else str(event_datetime)
+            )
+            self.countdown.visible = has_date
+            if has_date:
+                text, color, bold = countdown(event_datetime)
+                self.countdown.text = text
+                self.countdown.foreground = color
+                self.countdown.bold = bold
+
+        # Location
+        self.location_panel.visible = bool(event.get("location_name"))
+        self.location.text = truncate(event.get("location_name") or "", 40)
+
+        # Guests & budget
+        self.guests.text = f"{event.get('guest_count') or 0} guests"
+        budget = event.get("budget") or 0
+        self.budget_panel.visible = budget > 0
+        self.budget.text = f"${budget:,.0f}"
+
+        # Rollup counters maintained on the event row by the server
+        total_tasks = event.get("task_total") or 0
+        completed_tasks = event.get("task_done") or 0
+        estimated_total = event.get("budget_estimated") or 0
+
+        self.task_progress.visible = bool(total_tasks)
+        if total_tasks:
+            percentage = completed_tasks / total_tasks * 100
+            self.task_text.text = f"Tasks: {completed_tasks}/{total_tasks}"
+            self.task_bar.text = f"  {percentage:.0f}%"
+            self.task_bar.background = "#4caf50"
+
+        self.budget_progress.visible = bool(estimated_total and budget > 0)
+        if self.budget_progress.visible:
+            percentage = min(estimated_total / budget * 100, 100)
+            self.budget_text.text = f"Budget: ${estimated_total:,.0f} / ${budget:,.0f}"
+            self.budget_bar.text = f"  {percentage:.0f}%"
+            self.budget_bar.background = "#4caf50"
+
+        self.progress_panel.visible = (
+            self.task_progress.visible or self.budget_progress.visible
+        )
 
-            return event_datetime > now
-        except:
-            return False
+        # Event type badge
+        self.type_badge.visible = bool(event.get("event_type"))
+        self.type_badge.text = f"🎯 {event.get('event_type')}"
@@ -0,0 +1,68 @@
+# Events/task_edits.py
+
+"""
+Queued task edits for the event detail forms.
+
+The form shows an edit (a ticked checkbox, a new due date) as soon as it
+is made and queues it here. Once edits pause for FLUSH_DELAY seconds, or
+when the form is left, everything queued goes to the server in one
+update_tasks_bulk call; only a batch that fails is rolled back.
+"""
+
+from anvil import *
+import anvil.server
+
+FLUSH_DELAY = 0.6
+
+
+class TaskEdits:
+    def __init__(self, on_saved, on_failed):
+        """
+        on_saved(rollups) runs after a batch is stored and nothing new is
+        queued, with the rollups of each touched event keyed by event id;
+        on_failed(snapshots, error) gets each failed task as it was before
+        its first queued edit.
+        """
+        self.on_saved = on_saved
+        self.on_failed = on_failed
+        self.pending = {}  # task_id -> {column: value}
+        self.snapshots = {}  # task_id -> task dict before the queued edits
+
+        self.timer = Timer(interval=0)
+        self.timer.set_event_handler("tick", self.flush)
+
+    def attach(self, container):
+        """Put the flush timer on the page; call after each re-render"""
+        if self.timer.parent is not None:
+            self.timer.remove_from_parent()
+        container.add_component(self.timer)
+
+    def queue(self, task_id, fields, snapshot):
+        """Record an edit; edits to one task merge into a single change"""
+        self.snapshots.setdefault(task_id, snapshot)
+        self.pending.setdefault(task_id, {}).update(fields)
+
+        # Restart the flush delay
+        self.timer.interval = 0
+        self.timer.interval = FLUSH_DELAY
+
+    def flush(self, **event_args):
+        """Send every queued edit now"""
+        self.timer.interval = 0
+        if not self.pending:
+            return
+
+        changes = [[task_id, fields] for task_id, fields in self.pending.items()]
+        snapshots = self.snapshots
+        self.pending, self.snapshots = {}, {}
+
+        try:
+            result = anvil.server.call_s("update_tasks_bulk", changes)
+        except Exception as e:
+            print(f"Error updating tasks: {e}")
+            result = {"success": False, "error": str(e)}
+
+        if not result["success"]:
+            self.on_failed(snapshots, result.get("error"))
+        elif not self.pending:
+            self.on_saved(result["rollups"])
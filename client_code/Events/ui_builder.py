@@ -20,15 +20,23 @@ _section_cards = {}  # NEW: Track cards by section
 # ============================================================================
 
 
-def build_event_plan_ui(event_plan_data, container):
+def build_event_plan_ui(event_plan_data, container, keyed=False, partial=False):
     """
-    Build complete UI for EventPlan response with ordered sections
+    Build complete UI for EventPlan response with ordered sections.
+
+    With keyed=True the plan is reconciled against what an earlier keyed
+    call rendered into the same container: only sections and cards whose
+    data changed are updated, inserted or removed (see KEYED RENDERING).
+    partial=True (keyed only) is for a plan still streaming in: no save
+    button yet.
     """
 
+    if keyed:
+        render_plan_keyed(event_plan_data, container, partial)
+        return
+
     # Clear previous selections AND card tracking
-    clear_selections()
-    global _section_cards
-    _section_cards = {}
+    reset_render_state()
 
     # Add header
     add_plan_header(container, event_plan_data)
@@ -61,6 +69,274 @@ def build_event_plan_ui(event_plan_data, container):
     add_save_button(container, event_plan_data)
 
 
+def reset_render_state():
+    """Clear selections and card tracking before a new plan is rendered"""
+    clear_selections()
+    global _section_cards
+    _section_cards = {}
+
+
+# ============================================================================
+# STREAMING
+# ============================================================================
+
+# Streamed sections that sit beside "plan" in an EventPlan, not inside it
+ROOT_SECTION_KEYS = (
+    "event_classification",
+    "key_considerations",
+    "logistics",
+    "contingency_notes",
+    "reasoning",
+)
+
+
+def plan_from_sections(sections):
+    """
+    EventPlan-shaped dict from the [key, value] sections streamed so far, for
+    build_event_plan_ui(..., keyed=True, partial=True)
+    """
+    event_plan_data = {"plan": {}}
+    for key, value in sections:
+        if key in ROOT_SECTION_KEYS:
+            event_plan_data[key] = value
+        else:
+            event_plan_data["plan"][key] = value
+    return event_plan_data
+
+
+# ============================================================================
+# KEYED RENDERING
+# ============================================================================
+
+# Top-level blocks that are not plan sections
+HEADER_KEY = "_header"
+SAVE_KEY = "_save"
+
+
+def render_plan_keyed(event_plan_data, container, partial=False):
+    """
+    Render a plan into container, reusing what the previous keyed render left
+    there. Every top-level block is keyed by its section key and every card
+    by its section key plus its title_key value; unchanged ones are left
+    alone, so re-planning one section or changing one card touches only
+    those components. Open accordions and selections on kept cards survive.
+    """
+    view = getattr(container.tag, "plan_view", None)
+    if view is None or any(
+        node["component"].parent is not container for node in view.values()
+    ):
+        # First render here, or the container was cleared since
+        container.clear()
+        reset_render_state()
+        view = container.tag.plan_view = {}
+
+    reconcile(
+        container, view, plan_blocks(event_plan_data, partial), build_block, update_block
+    )
+
+
+def plan_blocks(event_plan_data, partial=False):
+    """[(key, data)] for each top-level block of the plan UI, in display order"""
+    blocks = [(HEADER_KEY, None)]
+
+    if "key_considerations" in event_plan_data:
+        blocks.append(("key_considerations", event_plan_data["key_considerations"]))
+
+    # Plan sections first, then root sections, each by rank (as in
+    # build_event_plan_ui)
+    def by_rank(section):
+        return SECTION_CONFIG.get(section[0], {}).get("rank", 999)
+
+    plan_sections = [
+        (key, value)
+        for key, value in event_plan_data.get("plan", {}).items()
+        if key != "event_type"
+    ]
+    root_sections = [
+        (key, event_plan_data[key])
+        for key in ["logistics", "contingency_notes", "reasoning"]
+        if key in event_plan_data
+    ]
+    blocks += sorted(plan_sections, key=by_rank)
+    blocks += sorted(root_sections, key=by_rank)
+
+    if not partial:
+        blocks.append((SAVE_KEY, event_plan_data))
+    return blocks
+
+
+def reconcile(panel, nodes, items, build, update):
+    """
+    Make panel's children match items, a list of (key, data).
+
+    nodes maps each key rendered last time to {"component", "data", ...} and
+    is updated in place. A key whose data is unchanged keeps its component
+    untouched; a changed one goes to update(key, node, data), which patches
+    node["component"] (or swaps in a new one) and returns True, or returns
+    False to have it rebuilt by build(key, data). Keys no longer present
+    are removed. Children end up in the order of items.
+    """
+    keys = set(key for key, data in items)
+    for key in [key for key in nodes if key not in keys]:
+        node = nodes.pop(key)
+        node["component"].remove_from_parent()
+        if "discard" in node:
+            node["discard"]()
+
+    for index, (key, data) in enumerate(items):
+        node = nodes.get(key)
+        if node is None or (node["data"] != data and not update(key, node, data)):
+            if node is not None:
+                node["component"].remove_from_parent()
+                if "discard" in node:
+                    node["discard"]()
+            node = nodes[key] = build(key, data)
+        node["data"] = snapshot(data)
+
+        components = panel.get_components()
+        component = node["component"]
+        if index >= len(components) or components[index] is not component:
+            if component.parent is not None:
+                component.remove_from_parent()
+            panel.add_component(component, index=index)
+
+
+def snapshot(value):
+    """Copy of rendered data, so later edits to the plan dict show up as changes"""
+    if isinstance(value, dict):
+        return {k: snapshot(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [snapshot(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(snapshot(v) for v in value)
+    return value
+
+
+def build_block(key, data):
+    """A new node for one top-level block of the plan UI"""
+    slot = ColumnPanel(spacing_above="none", spacing_below="none")
+    node = {"component": slot}
+
+    if key == HEADER_KEY:
+        add_plan_header(slot, {})
+    elif key == SAVE_KEY:
+        node["component"] = create_save_panel(data)
+    elif key == "key_considerations":
+        add_key_considerations(slot, data)
+    else:
+        header_btn = render_section(slot, key, data)
+        node["header_btn"] = header_btn
+        cards_panel = getattr(header_btn.tag, "cards_panel", None)
+        if cards_panel is not None:
+            # Register the cards just built so the next render can reconcile them
+            node["cards"] = {}
+            for (card_key, card_data), card in zip(
+                keyed_cards(key, data), cards_panel.get_components()
+            ):
+                node["cards"][card_key] = card_node(key, card, card_data)
+            node["discard"] = lambda: forget_section(key)
+    return node
+
+
+def update_block(key, node, data):
+    """Patch a top-level block whose data changed; False to rebuild it"""
+    if key == SAVE_KEY:
+        node["component"].tag.save_btn.tag.event_plan_data = data
+        return True
+
+    if "cards" in node:
+        # Card list: reconcile only the cards, then refresh the item count
+        config = SECTION_CONFIG[key]
+        header_btn = node["header_btn"]
+        items = keyed_cards(key, data)
+
+        def build_card(card_key, card_data):
+            index, item = card_data
+            card = create_section_card(key, item, index, config)
+            return card_node(key, card, card_data)
+
+        reconcile(
+            header_btn.tag.cards_panel, node["cards"], items, build_card, update_card
+        )
+        header_btn.text = accordion_title(config, len(items))
+        return True
+
+    if "header_btn" in node:
+        # Any other section: rebuild it in place, keeping it open if it was
+        was_open = node["header_btn"].tag.is_open()
+        node["component"].remove_from_parent()
+        node.update(build_block(key, data))
+        if was_open and not node["header_btn"].tag.is_open():
+            node["header_btn"].tag.toggle()
+        return True
+
+    return False
+
+
+def keyed_cards(section_key, items):
+    """
+    [(key, (index, item))] for a card_list section's items. Keys are the
+    section key plus the item's title_key value; repeats get a suffix.
+    """
+    if not isinstance(items, list):
+        items = [items]
+    card_type = SECTION_CONFIG[section_key].get("card_type", "generic")
+    title_key = CARD_TYPES.get(card_type, CARD_TYPES["generic"]).get("title_key")
+
+    keyed = []
+    seen = {}
+    for index, item in enumerate(items, 1):
+        title = item.get(title_key) if isinstance(item, dict) and title_key else None
+        key = f"{section_key}/{title if title is not None else f'#{index}'}"
+        seen[key] = seen.get(key, 0) + 1
+        if seen[key] > 1:
+            key = f"{key}~{seen[key]}"
+        keyed.append((key, (index, item)))
+    return keyed
+
+
+def card_node(section_key, card_container, card_data):
+    def discard():
+        forget_card(section_key, card_container, card_data[1])
+
+    return {
+        "component": card_container,
+        "data": snapshot(card_data),
+        "discard": discard,
+    }
+
+
+def update_card(key, node, card_data):
+    """A card that only moved is renumbered; changed content rebuilds it"""
+    old_index, old_item = node["data"]
+    index, item = card_data
+    if old_item != item:
+        return False
+    node["component"].tag.renumber(index)
+    return True
+
+
+def forget_section(section_key):
+    """Drop a removed card list section's selection and card tracking"""
+    _selected_options.pop(section_key, None)
+    _section_cards.pop(section_key, None)
+
+
+def forget_card(section_key, card_container, item):
+    """Drop a removed card from card tracking and the selections"""
+    card = getattr(card_container.tag, "card", None)
+    cards = _section_cards.get(section_key, [])
+    if card in cards:
+        cards.remove(card)
+
+    selected = _selected_options.get(section_key)
+    if isinstance(selected, list):
+        if item in selected:
+            selected.remove(item)
+    elif selected is not None and selected == item:
+        del _selected_options[section_key]
+
+
 # ============================================================================
 # SPECIAL SECTIONS
 # ============================================================================
@@ -157,31 +433,30 @@ def render_plan_sections_sorted(container, plan_data):
 
 
 def render_section(container, section_key, content):
-    """Render a section based on its configuration"""
+    """Render a section based on its configuration; returns its header button"""
 
     config = SECTION_CONFIG.get(section_key)
     if not config:
-        render_generic_section(container, section_key, content)
-        return
+        return render_generic_section(container, section_key, content)
 
     renderer = config.get("renderer", "auto")
 
     if renderer == "card_list":
-        render_card_list_section(container, section_key, content, config)
+        return render_card_list_section(container, section_key, content, config)
     elif renderer == "simple_list":
-        render_simple_list_section(container, section_key, content, config)
+        return render_simple_list_section(container, section_key, content, config)
     elif renderer == "numbered_list":
-        render_numbered_list_section(container, section_key, content, config)
+        return render_numbered_list_section(container, section_key, content, config)
     elif renderer == "text":
-        render_text_section(container, section_key, content, config)
+        return render_text_section(container, section_key, content, config)
     elif renderer == "timeline":
-        render_timeline_section(container, section_key, content, config)
+        return render_timeline_section(container, section_key, content, config)
     elif renderer == "budget":
-        render_budget_section(container, section_key, content, config)
+        return render_budget_section(container, section_key, content, config)
     elif renderer == "structured_list":
-        render_structured_list_section(container, section_key, content, config)
+        return render_structured_list_section(container, section_key, content, config)
     else:
-        render_generic_section(container, section_key, content)
+        return render_generic_section(container, section_key, content)
 
 
 # ============================================================================
@@ -195,10 +470,6 @@ def render_card_list_section(container, section_key, items, config):
     if not isinstance(items, list):
         items = [items]
 
-    # Get card type config
-    card_type = config.get("card_type", "generic")
-    card_config = CARD_TYPES.get(card_type, CARD_TYPES["generic"])
-
     # Check if selectable
     is_selectable = config.get("selectable", False)
     is_multi_select = config.get("multi_select", False)
@@ -226,18 +497,13 @@ def render_card_list_section(container, section_key, items, config):
             )
         )
 
-    # Create cards with selection
+    # Create cards with selection (in their own panel, so keyed re-renders
+    # can reconcile them)
+    cards_panel = ColumnPanel(spacing_above="none", spacing_below="none")
     for i, item in enumerate(items, 1):
-        if is_selectable:
-            card_container = create_selectable_card(
-                item, i, card_config, section_key, selection_label, is_multi_select
-            )
-        else:
-            card = create_configured_card(item, i, card_config)
-            card_container = ColumnPanel(spacing_above="small", spacing_below="none")
-            card_container.add_component(card)
-
-        content_panel.add_component(card_container)
+        cards_panel.add_component(create_section_card(section_key, item, i, config))
+    content_panel.add_component(cards_panel)
+    header_btn.tag.cards_panel = cards_panel
 
     # Assemble
     card_content = m3.CardContentContainer(margin="16px")
@@ -245,6 +511,32 @@ def render_card_list_section(container, section_key, items, config):
 
     container.add_component(header_container, full_width_row=True)
     container.add_component(card_content)
+    return header_btn
+
+
+def create_section_card(section_key, item, index, config):
+    """
+    One card of a card_list section in its outer container.
+    tag.renumber(index) relabels it after cards before it move.
+    """
+    card_type = config.get("card_type", "generic")
+    card_config = CARD_TYPES.get(card_type, CARD_TYPES["generic"])
+
+    if config.get("selectable", False):
+        return create_selectable_card(
+            item,
+            index,
+            card_config,
+            section_key,
+            config.get("selection_label", "Option"),
+            config.get("multi_select", False),
+        )
+
+    card = create_configured_card(item, index, card_config)
+    card_container = ColumnPanel(spacing_above="small", spacing_below="none")
+    card_container.add_component(card)
+    card_container.tag.renumber = card.tag.renumber
+    return card_container
 
 
 def create_selectable_card(
@@ -282,6 +574,12 @@ def create_selectable_card(
 
     card_content.add_component(selection_control)
 
+    def renumber(new_index):
+        selection_control.text = f"{selection_label} #{new_index}"
+
+    card_container.tag.renumber = renumber
+    card_container.tag.card = card
+
     # Card title
     title_key = card_config.get("title_key")
     if title_key and title_key in item:
@@ -382,6 +680,7 @@ def render_simple_list_section(container, section_key, items, config):
 
     container.add_component(header_container, full_width_row=True)
     container.add_component(card_content)
+    return header_btn
 
 
 def render_numbered_list_section(container, section_key, items, config):
@@ -405,6 +704,7 @@ def render_numbered_list_section(container, section_key, items, config):
 
     container.add_component(header_container, full_width_row=True)
     container.add_component(card_content)
+    return header_btn
 
 
 def render_text_section(container, section_key, text, config):
@@ -420,6 +720,7 @@ def render_text_section(container, section_key, text, config):
 
     container.add_component(header_container, full_width_row=True)
     container.add_component(card_content)
+    return header_btn
 
 
 def render_timeline_section(container, section_key, timeline_items, config):
@@ -465,6 +766,7 @@ def render_timeline_section(container, section_key, timeline_items, config):
 
     container.add_component(header_container, full_width_row=True)
     container.add_component(card_content)
+    return header_btn
 
 
 def render_budget_section(container, section_key, budget_items, config):
@@ -496,6 +798,7 @@ def render_budget_section(container, section_key, budget_items, config):
 
     container.add_component(header_container, full_width_row=True)
     container.add_component(card_content)
+    return header_btn
 
 
 def render_structured_list_section(container, section_key, content_dict, config):
@@ -541,6 +844,7 @@ def render_structured_list_section(container, section_key, content_dict, config)
 
     container.add_component(header_container, full_width_row=True)
     container.add_component(card_content)
+    return header_btn
 
 
 def render_generic_section(container, section_key, content):
@@ -553,7 +857,9 @@ def render_generic_section(container, section_key, content):
     }
 
     if isinstance(content, list):
-        render_simple_list_section(container, section_key, content, default_config)
+        return render_simple_list_section(
+            container, section_key, content, default_config
+        )
     elif isinstance(content, dict):
         accordion = create_accordion_container(default_config)
         header_container, header_btn, content_panel = accordion
@@ -567,8 +873,9 @@ def render_generic_section(container, section_key, content):
 
         container.add_component(header_container, full_width_row=True)
         container.add_component(card_content)
+        return header_btn
     else:
-        render_text_section(container, section_key, content, default_config)
+        return render_text_section(container, section_key, content, default_config)
 
 
 # ============================================================================
@@ -576,16 +883,20 @@ def render_generic_section(container, section_key, content):
 # ============================================================================
 
 
+def accordion_title(config, item_count=None):
+    title = config.get("title", "Section")
+    if item_count is not None:
+        title = f"{title} ({item_count} items)"
+    return title
+
+
 def create_accordion_container(config, item_count=None):
     """Create accordion header and content panel with toggle"""
 
-    title = config.get("title", "Section")
+    title = accordion_title(config, item_count)
     color = config.get("color", "#2196f3")
     initially_open = config.get("initially_open", False)
 
-    if item_count is not None:
-        title = f"{title} ({item_count} items)"
-
     header_container = ColumnPanel(
         background="theme:Surface Variant"
         if initially_open
@@ -632,6 +943,8 @@ def create_accordion_container(config, item_count=None):
             header_btn.role = None
 
     header_btn.set_event_handler("click", toggle)
+    header_btn.tag.is_open = lambda: is_expanded["value"]
+    header_btn.tag.toggle = toggle
 
     return (header_container, header_btn, content_panel)
 
@@ -643,15 +956,20 @@ def create_configured_card(item, index, card_config):
     card_content = m3.CardContentContainer(margin="16px")
 
     title_key = card_config.get("title_key")
+    card.tag.renumber = lambda new_index: None
     if title_key and title_key in item:
-        card_content.add_component(
-            Label(
-                text=f"#{index}: {item[title_key]}",
-                font_size=16,
-                bold=True,
-                foreground="#673ab7",
-            )
+        title_label = Label(
+            text=f"#{index}: {item[title_key]}",
+            font_size=16,
+            bold=True,
+            foreground="#673ab7",
         )
+        card_content.add_component(title_label)
+
+        def renumber(new_index):
+            title_label.text = f"#{new_index}: {item[title_key]}"
+
+        card.tag.renumber = renumber
 
     fields = card_config.get("fields", [])
 
@@ -822,6 +1140,14 @@ def create_budget_card(item):
 
 def add_save_button(container, event_plan_data):
     """Add save button at the bottom"""
+    container.add_component(create_save_panel(event_plan_data))
+
+
+def create_save_panel(event_plan_data):
+    """
+    The save button and its hint. The plan saved is the button's
+    tag.event_plan_data, so keyed re-renders can swap it in place.
+    """
 
     button_panel = ColumnPanel(
         spacing="medium",
@@ -848,12 +1174,13 @@ def add_save_button(container, event_plan_data):
     save_btn.tag.event_plan_data = event_plan_data
 
     def on_save_click(**event_args):
-        save_selections(save_btn, event_plan_data)
+        save_selections(save_btn, save_btn.tag.event_plan_data)
 
     save_btn.set_event_handler("click", on_save_click)
     button_panel.add_component(save_btn)
+    button_panel.tag.save_btn = save_btn
 
-    container.add_component(button_panel)
+    return button_panel
 
 
 def save_selections(save_btn, event_plan_data):
@@ -891,6 +1218,7 @@ def save_selections(save_btn, event_plan_data):
     save_data = {
         "event_id": event_id,
         "selected_options": selections,
+        "ai_plan": event_plan_data,
         "timeline": event_plan_data.get("plan", {}).get("timeline", []),
         "budget_breakdown": event_plan_data.get("plan", {}).get("budget_breakdown", []),
     }
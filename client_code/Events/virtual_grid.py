@@ -0,0 +1,135 @@
+# Events/virtual_grid.py
+
+"""
+Virtualized card grid: only the rows in or near the viewport get cards.
+
+Items are laid out in rows of `columns` fixed-height cards. Spacers above
+and below stand in for the rows scrolled out of view, and a small pool of
+cards is re-bound to whichever items are visible as the page scrolls, so
+the number of components stays the same for 30 items or 5,000.
+
+Cards are objects with a `component` and a `bind(item)` method that only
+sets properties on components built once in the card's constructor.
+"""
+
+from anvil import *
+import anvil.js
+import math
+
+# Estimated height of one card row in px, until the first rows are measured
+ROW_HEIGHT = 440
+
+# Rows bound beyond each edge of the viewport, so fast scrolls don't show gaps
+OVERSCAN_ROWS = 2
+
+
+class VirtualGrid:
+    def __init__(self, make_card, columns=3, card_width="32%"):
+        """make_card() returns a new, unbound card"""
+        self.make_card = make_card
+        self.columns = columns
+        self.card_width = card_width
+        self.row_height = ROW_HEIGHT
+        self.measured = False
+
+        self.items = []
+        self.pool = []
+        self.window = None  # (first_row, last_row, item count) currently bound
+        self.frame_pending = False
+        self.active = False
+        # One bound method, so removeEventListener gets the same function
+        # that was added
+        self._on_scroll = self.schedule_refresh
+
+        self.component = ColumnPanel(spacing="none")
+        self.top_spacer = Spacer(height=0)
+        self.cards_panel = FlowPanel(spacing="medium", align="left")
+        self.bottom_spacer = Spacer(height=0)
+        self.component.add_component(self.top_spacer)
+        self.component.add_component(self.cards_panel)
+        self.component.add_component(self.bottom_spacer)
+
+    def set_items(self, items):
+        """Show `items`; call again after the list grows or changes"""
+        self.items = items
+        self.window = None
+        self.refresh()
+
+    def start(self):
+        """Follow page scrolling and resizing"""
+        if self.active:
+            return
+        self.active = True
+        # Capture so scrolls of any scrolling container are seen, not just the page
+        anvil.js.window.addEventListener("scroll", self._on_scroll, True)
+        anvil.js.window.addEventListener("resize", self._on_scroll)
+
+    def stop(self):
+        if not self.active:
+            return
+        self.active = False
+        anvil.js.window.removeEventListener("scroll", self._on_scroll, True)
+        anvil.js.window.removeEventListener("resize", self._on_scroll)
+
+    def schedule_refresh(self, *args):
+        """Re-bind at most once per animation frame while scrolling"""
+        if self.active and not self.frame_pending:
+            self.frame_pending = True
+            anvil.js.window.requestAnimationFrame(self.refresh)
+
+    def visible_rows(self, total_rows):
+        """(first_row, last_row) in or near the viewport, last exclusive"""
+        try:
+            rect = anvil.js.get_dom_node(self.component).getBoundingClientRect()
+            viewport = anvil.js.window.innerHeight
+        except Exception:
+            return 0, min(total_rows, 2 * OVERSCAN_ROWS)
+
+        scrolled = max(0, -rect.top)
+        first = math.floor(scrolled / self.row_height) - OVERSCAN_ROWS
+        last = math.ceil((scrolled + viewport) / self.row_height) + OVERSCAN_ROWS
+        return max(0, min(first, total_rows)), max(0, min(last, total_rows))
+
+    def refresh(self, *args):
+        """Bind the pool to the rows now in view and size the spacers"""
+        self.frame_pending = False
+        total_rows = math.ceil(len(self.items) / self.columns)
+        first, last = self.visible_rows(total_rows)
+        if (first, last, len(self.items)) == self.window:
+            return
+        self.window = (first, last, len(self.items))
+
+        self.top_spacer.height = first * self.row_height
+        self.bottom_spacer.height = (total_rows - last) * self.row_height
+
+        visible = self.items[first * self.columns : last * self.columns]
+        while len(self.pool) < len(visible):
+            card = self.make_card()
+            self.pool.append(card)
+            self.cards_panel.add_component(card.component, width=self.card_width)
+
+        for card, item in zip(self.pool, visible):
+            card.bind(item)
+            card.component.visible = True
+        for card in self.pool[len(visible) :]:
+            card.component.visible = False
+
+        if not self.measured:
+            self.measure_row_height()
+
+    def measure_row_height(self):
+        """Use the real distance between two card rows once there are two"""
+        if len(self.pool) <= self.columns:
+            return
+        try:
+            first = anvil.js.get_dom_node(self.pool[0].component)
+            below = anvil.js.get_dom_node(self.pool[self.columns].component)
+            height = below.offsetTop - first.offsetTop
+        except Exception:
+            return
+        if height > 0:
+            self.measured = True
+            if height != self.row_height:
+                self.row_height = height
+                self.window = None
+                self.schedule_refresh()
@@ -7,6 +7,8 @@ import anvil.tables as tables
 import anvil.tables.query as q
 from anvil.tables import app_tables
 
+from ... import event_store
+
 
 class TaskForm(TaskFormTemplate):
     def __init__(self, event=None, source=None, **properties):
@@ -32,14 +34,23 @@ class TaskForm(TaskFormTemplate):
         selected_event = [
             ev for ev in self.events if ev["title"] == self.dd_event_list.selected_value
         ]
-        app_tables.tasks.add_row(
-            event_link=selected_event[0],
-            task=self.txtbx_title.text,
-            details=self.txtarea_details.text,
-            due_date=self.dtpkr_due_date.date,
-            duration=self.txtbx_duration.text,
-            status=self.rgpnl_status.selected_value,
+        event = selected_event[0]
+        # Events from the store are dicts; get_events returns rows
+        event_id = event["id"] if isinstance(event, dict) else event.get_id()
+        result = anvil.server.call(
+            "save_task",
+            {
+                "event_id": event_id,
+                "task": self.txtbx_title.text,
+                "details": self.txtarea_details.text,
+                "due_date": self.dtpkr_due_date.date,
+                "duration": self.txtbx_duration.text,
+                "status": self.rgpnl_status.selected_value,
+            },
         )
+        event_store.add_task(event_id, result["task"])
+        if result["rollups"]:
+            event_store.set_rollups(event_id, result["rollups"])
         # Raise a custom event to notify the parent form
         self.raise_event("x-refresh_parent")
 
@@ -0,0 +1,271 @@
+# event_store.py
+
+"""
+Client-side store of the user's events, their tasks and budget items.
+
+Forms read records from here instead of each fetching their own copy.
+Records are cached by id and kept fresh by sync(), which asks the server's
+change log only for rows changed since the last sync (get_changes_since),
+at most once every SYNC_INTERVAL seconds. Going list -> detail -> list
+then costs one small delta call, or none.
+"""
+
+import anvil.server
+import time
+
+SYNC_INTERVAL = 5
+
+# get_event_part payloads get_full_event includes
+FULL_EVENT_PARTS = ("ai_response", "event_options")
+
+_events = {}  # event_id -> event record
+_tasks = {}  # event_id -> {task_id: task}
+_budget_items = {}  # event_id -> [budget item]
+_parts = {}  # (event_id, part) -> (event updated_at, data)
+_listings = {}  # (filter_status, sort_by) -> {"ids", "cursor", "stats"}
+_full = set()  # events holding a full header record, not just a list summary
+
+_cursor = None  # change log position of the last sync
+_synced_clock = 0  # local time.time() of the last sync
+
+
+def reset():
+    """Forget everything, e.g. after logging out"""
+    global _cursor, _synced_clock
+    for cache in (_events, _tasks, _budget_items, _parts, _listings):
+        cache.clear()
+    _full.clear()
+    _cursor, _synced_clock = None, 0
+
+
+# ============================================================================
+# SYNC
+# ============================================================================
+
+
+def sync(force=False):
+    """Pull rows changed since the last sync into the store"""
+    global _cursor, _synced_clock
+    if not force and time.time() - _synced_clock < SYNC_INTERVAL:
+        return
+
+    result = anvil.server.call_s("get_changes_since", _cursor, list(_budget_items))
+    if not result["success"]:
+        print(f"Error syncing events: {result.get('error')}")
+        return
+
+    if result["reset"]:
+        # Too far behind the change log; start over
+        reset()
+    if result["inserted_events"]:
+        # The cached listings and their stats no longer cover every event
+        _listings.clear()
+    for event_id in result["deleted"]["event"]:
+        forget_event(event_id)
+
+    for event in result["events"]:
+        if event["id"] in _events:
+            _events[event["id"]].update(event)
+    for task in result["tasks"]:
+        event_id = task["event_link"].get_id()
+        if event_id in _tasks:
+            _tasks[event_id][task["id"]] = task
+    for task_id in result["deleted"]["tasks"]:
+        for tasks in _tasks.values():
+            tasks.pop(task_id, None)
+    for event_id, items in result["budget_items"].items():
+        _budget_items[event_id] = items
+
+    _cursor = result["cursor"]
+    _synced_clock = time.time()
+
+
+def _ensure_baseline():
+    """A change log cursor taken before the first records are loaded"""
+    if _cursor is None:
+        sync(force=True)
+
+
+# ============================================================================
+# EVENTS
+# ============================================================================
+
+
+def put_events(events, full=False):
+    """Merge event records loaded by a form into the store"""
+    for event in events:
+        _events.setdefault(event["id"], {}).update(event)
+        if full:
+            _full.add(event["id"])
+
+
+def get_event(event_id):
+    """
+    An event's header record with its tasks under "tasks" (by due date),
+    loaded from the server only the first time
+    """
+    _ensure_baseline()
+    if event_id not in _full or event_id not in _tasks:
+        result = anvil.server.call("get_event_details", event_id, True)
+        if not result["success"]:
+            return result
+        event = dict(result["event"])
+        set_tasks(event_id, event.pop("tasks"))
+        put_events([event], full=True)
+    else:
+        sync()
+        if event_id not in _events:
+            return {"success": False, "error": "Event not found"}
+
+    event = dict(_events[event_id])
+    event["tasks"] = event_tasks(event_id)
+    return {"success": True, "event": event}
+
+
+def get_full_event(event_id):
+    """
+    An event with its plan (ai_response), event_options, tasks and budget
+    items, loaded in one get_event_details call unless all are cached
+    """
+    _ensure_baseline()
+    sync()
+    cached = (
+        event_id in _full
+        and event_id in _tasks
+        and event_id in _budget_items
+        and all(_fresh_part(event_id, part) is not None for part in FULL_EVENT_PARTS)
+    )
+    if not cached:
+        result = anvil.server.call("get_event_details", event_id)
+        if not result["success"]:
+            return result
+        event = dict(result["event"])
+        set_tasks(event_id, event.pop("tasks"))
+        _budget_items[event_id] = event.pop("budget_items")
+        for part in FULL_EVENT_PARTS:
+            _parts[(event_id, part)] = (event.get("updated_at"), event.pop(part))
+        put_events([event], full=True)
+
+    event = dict(_events[event_id])
+    event["tasks"] = event_tasks(event_id)
+    event["budget_items"] = list(_budget_items[event_id])
+    for part in FULL_EVENT_PARTS:
+        event[part] = _parts[(event_id, part)][1]
+    return {"success": True, "event": event}
+
+
+def set_rollups(event_id, rollups):
+    """Take an event's rollup counts returned by a write"""
+    if event_id in _events:
+        _events[event_id].update(rollups)
+
+
+def forget_event(event_id):
+    _events.pop(event_id, None)
+    _tasks.pop(event_id, None)
+    _budget_items.pop(event_id, None)
+    _full.discard(event_id)
+    for key in [key for key in _parts if key[0] == event_id]:
+        del _parts[key]
+    # Listing stats count the event; reload lists rather than patch them
+    _listings.clear()
+
+
+# ============================================================================
+# LISTINGS (pages of the events list)
+# ============================================================================
+
+
+def get_listing(filter_status, sort_by):
+    """
+    The events already loaded for a list filter and sort, as
+    {"events", "cursor", "stats"}, or None if that list was never loaded
+    """
+    sync()
+    listing = _listings.get((filter_status, sort_by))
+    if listing is None:
+        return None
+    return {
+        "events": [dict(_events[event_id]) for event_id in listing["ids"]],
+        "cursor": listing["cursor"],
+        "stats": listing["stats"],
+    }
+
+
+def put_listing(filter_status, sort_by, events, cursor, stats=None):
+    """Record a page of the events list; pages after the first extend it"""
+    _ensure_baseline()
+    put_events(events)
+    key = (filter_status, sort_by)
+    if stats is not None or key not in _listings:
+        _listings[key] = {"ids": [], "cursor": None, "stats": stats or {}}
+    _listings[key]["ids"].extend(event["id"] for event in events)
+    _listings[key]["cursor"] = cursor
+
+
+# ============================================================================
+# TASKS AND BUDGET ITEMS
+# ============================================================================
+
+
+def set_tasks(event_id, tasks):
+    _tasks[event_id] = {task["id"]: task for task in tasks}
+
+
+def event_tasks(event_id):
+    """Copies of an event's cached tasks, by due date"""
+    tasks = [dict(task) for task in _tasks.get(event_id, {}).values()]
+    return sorted(tasks, key=lambda t: (t.get("due_date") is None, t.get("due_date")))
+
+
+def add_task(event_id, task):
+    """Add a task saved by a form; ignored until the event's tasks are loaded"""
+    if event_id in _tasks:
+        _tasks[event_id][task["id"]] = task
+
+
+def update_task(event_id, task_id, fields):
+    """Apply an edit made on the client to the cached task"""
+    task = _tasks.get(event_id, {}).get(task_id)
+    if task is not None:
+        task.update(fields)
+
+
+def get_budget_items(event_id):
+    """An event's budget items, loaded from the server only the first time"""
+    _ensure_baseline()
+    if event_id not in _budget_items:
+        result = anvil.server.call("get_event_part", event_id, "budget_items")
+        if not result["success"]:
+            return None
+        _budget_items[event_id] = result["data"]
+    else:
+        sync()
+    return _budget_items.get(event_id)
+
+
+def _fresh_part(event_id, part):
+    """A cached part, or None once the event has been written since"""
+    updated_at = _events.get(event_id, {}).get("updated_at")
+    cached = _parts.get((event_id, part))
+    if cached is not None and updated_at is not None and cached[0] == updated_at:
+        return cached[1]
+    return None
+
+
+def get_part(event_id, part):
+    """
+    Any other get_event_part payload, cached until the event's updated_at
+    moves on
+    """
+    sync()
+    data = _fresh_part(event_id, part)
+    if data is not None:
+        return data
+
+    updated_at = _events.get(event_id, {}).get("updated_at")
+    result = anvil.server.call("get_event_part", event_id, part)
+    if not result["success"]:
+        return None
+    _parts[(event_id, part)] = (updated_at, result["data"])
+    return result["data"]
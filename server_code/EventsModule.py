@@ -1,15 +1,25 @@
-# import anvil.users
+import anvil.users
 # import anvil.secrets
 # import anvil.files
 import anvil.server
 
-# import anvil.tables
+import anvil.tables as tables
 from anvil.tables import app_tables, TableError, Transaction
 
-from datetime import datetime
+import base64
+import itertools
+import json
+import re
+from datetime import datetime, timezone
 from anvil.tables import query as q
 from collections import OrderedDict, Counter, defaultdict
 
+from . import bulk_writes
+from . import rollups
+from . import plan_sections
+from . import change_log
+from .usage_ledger import is_admin
+
 
 @anvil.server.callable
 def get_event(title):
@@ -21,7 +31,7 @@ def get_event(title):
 def get_event_data(id=None):
     event = app_tables.event.get_by_id(id)
     tasks = get_event_tasks(id)
-    options = Counter(event["ai_response"])
+    options = Counter(plan_sections.get_event_plan(event))
     # ADD other event info here, e.g. budget, etc.
     return event, tasks, options
 
@@ -35,11 +45,18 @@ def get_event_by_id(id=None):
 
 @anvil.server.callable
 def get_event_tasks(id=None):
-    tasks = app_tables.tasks.search(event_link=get_event_by_id(id))
+    event = app_tables.event.get_by_id(id)
+    tasks = app_tables.tasks.search(event_link=event)
+
+    # len() on a search is a count in the database; no rows are fetched
     tot_cnt = len(tasks)
-    compl_cnt = len([t for t in tasks if t["status"] == "Done"])
+    compl_cnt = len(
+        app_tables.tasks.search(
+            q.fetch_only(), rollups.is_done_query(), event_link=event
+        )
+    )
     incompl_cnt = tot_cnt - compl_cnt
-    pct_compl = round((compl_cnt / tot_cnt) * 100, 0)
+    pct_compl = round((compl_cnt / tot_cnt) * 100, 0) if tot_cnt else 0
     return {
         "tasks": tasks,
         "tot_cnt": tot_cnt,
@@ -49,6 +66,493 @@ def get_event_tasks(id=None):
     }
 
 
+def row_dict(row):
+    """Plain dict of a row's columns plus its id, for the client"""
+    data = dict(row)
+    data["id"] = row.get_id()
+    return data
+
+
+@anvil.server.callable
+def get_event_details(event_id, lazy=False):
+    """
+    An event with its tasks and budget items. Progress totals are the
+    rollup columns on the event row; no counting over child rows.
+
+    With lazy=True only the header fields and tasks are sent, plus
+    plan_outline (the plan's section keys) and has_options; the plan,
+    options and budget items are fetched by section as the view expands them.
+    """
+    if lazy:
+        return get_event_header(event_id)
+
+    event_row = app_tables.event.get_by_id(event_id)
+    if event_row is None:
+        return {"success": False, "error": "Event not found"}
+
+    event = row_dict(event_row)
+    event.update(rollups.get_rollups(event_row))
+    event["ai_response"] = plan_sections.get_event_plan(event_row)
+    event["tasks"] = event_tasks(event_row)
+    event["budget_items"] = [
+        row_dict(item) for item in app_tables.budget_items.search(event_link=event_row)
+    ]
+    return {"success": True, "event": event}
+
+
+# Event columns a detail view renders before any section is expanded
+DETAIL_COLUMNS = (
+    "title",
+    "description",
+    "event_datetime",
+    "guest_count",
+    "budget",
+    "venue_type",
+    "location",
+    "food_bev",
+    "event_setting",
+    "status",
+    "created_at",
+    "event_type",
+    "updated_at",
+) + rollups.ROLLUP_COLUMNS
+
+
+def event_record(row):
+    """
+    An event's header fields as a plain dict: what detail views show before
+    any section is expanded, and what list cards need (location_name).
+    Load the row with q.fetch_only(*DETAIL_COLUMNS).
+    """
+    event = {column: row[column] for column in DETAIL_COLUMNS}
+    event.update(rollups.get_rollups(row))
+    location = row["location"] or {}
+    event["location_name"] = location.get("formatted_address") or location.get(
+        "venue_name"
+    )
+    event["id"] = row.get_id()
+    return event
+
+
+def event_tasks(event_row):
+    return [
+        row_dict(task)
+        for task in app_tables.tasks.search(
+            tables.order_by("due_date"), event_link=event_row
+        )
+    ]
+
+
+def get_event_header(event_id):
+    event_row = app_tables.event.get_by_id(
+        event_id, q.fetch_only("event_options", *DETAIL_COLUMNS)
+    )
+    if event_row is None:
+        return {"success": False, "error": "Event not found"}
+
+    event = event_record(event_row)
+    # Whether to show the options card; the options load when it is opened
+    event["has_options"] = bool(event_row["event_options"])
+    event["plan_outline"] = plan_sections.plan_outline(event_row)
+    event["tasks"] = event_tasks(event_row)
+    return {"success": True, "event": event}
+
+
+# Parts of an event a detail view can load on demand
+EVENT_PARTS = {
+    "ai_response": plan_sections.get_event_plan,
+    "event_options": lambda row: row["event_options"] or {},
+    "budget_items": lambda row: [
+        row_dict(item) for item in app_tables.budget_items.search(event_link=row)
+    ],
+}
+
+
+@anvil.server.callable
+def get_event_part(event_id, part):
+    """One on-demand part of an event: its plan, selected options or budget items"""
+    if part not in EVENT_PARTS:
+        return {"success": False, "error": f"Unknown event part: {part}"}
+
+    event_row = app_tables.event.get_by_id(event_id, q.fetch_only("event_options"))
+    if event_row is None:
+        return {"success": False, "error": "Event not found"}
+    return {"success": True, "data": EVENT_PARTS[part](event_row)}
+
+
+@anvil.server.callable
+def get_changes_since(cursor=None, budget_event_ids=()):
+    """
+    The current user's events and tasks changed after `cursor` (the cursor
+    returned by the previous call), plus the budget item lists of changed
+    events in budget_event_ids. cursor=None returns only a starting cursor;
+    reset=True means the cursor fell off the compacted log and the client
+    should reload what it holds.
+    """
+    try:
+        user = anvil.users.get_user()
+        cursor, reset, changes = change_log.changes_since(user, cursor)
+        result = {
+            "success": True,
+            "cursor": cursor,
+            "reset": reset,
+            "events": [],
+            "tasks": [],
+            "deleted": {"event": [], "tasks": []},
+            "inserted_events": [],
+            "budget_items": {},
+        }
+
+        changed = {"event": {}, "tasks": {}}
+        for (table_name, row_id), (op, event_id) in changes.items():
+            if op == change_log.DELETE:
+                result["deleted"][table_name].append(row_id)
+            else:
+                changed[table_name][row_id] = (op, event_id)
+        if not changed["event"] and not changed["tasks"]:
+            return result
+
+        # Only the events in the delta are loaded; tasks and budget items
+        # then come from one search each over those events
+        touched = set(changed["event"]) | {
+            event_id for _, event_id in changed["tasks"].values()
+        }
+        event_rows = {}
+        for event_id in touched:
+            row = app_tables.event.get_by_id(event_id, q.fetch_only(*DETAIL_COLUMNS))
+            if row is not None:
+                event_rows[event_id] = row
+        for row_id, (op, _) in changed["event"].items():
+            if row_id in event_rows:
+                result["events"].append(event_record(event_rows[row_id]))
+                if op == change_log.INSERT:
+                    result["inserted_events"].append(row_id)
+
+        task_events = [
+            event_rows[event_id]
+            for event_id in {event_id for _, event_id in changed["tasks"].values()}
+            if event_id in event_rows
+        ]
+        if task_events:
+            result["tasks"] = [
+                row_dict(task)
+                for task in app_tables.tasks.search(event_link=q.any_of(*task_events))
+                if task.get_id() in changed["tasks"]
+            ]
+
+        # Budget items are replaced as a set, so changed events get their
+        # whole list
+        budget_events = [
+            event_rows[event_id]
+            for event_id in set(budget_event_ids) & set(changed["event"])
+            if event_id in event_rows
+        ]
+        if budget_events:
+            for event_row in budget_events:
+                result["budget_items"][event_row.get_id()] = []
+            for item in app_tables.budget_items.search(
+                event_link=q.any_of(*budget_events)
+            ):
+                result["budget_items"][item["event_link"].get_id()].append(
+                    row_dict(item)
+                )
+        return result
+    except Exception as e:
+        print(f"✗ Error loading changes: {str(e)}")
+        return {"success": False, "error": str(e)}
+
+
+# sort_by value -> (column, ascending)
+EVENT_SORTS = {
+    "date_desc": ("event_datetime", False),
+    "date_asc": ("event_datetime", True),
+    "title_asc": ("title", True),
+    "created_desc": ("created_at", False),
+    "budget_desc": ("budget", False),
+}
+EVENT_PAGE_SIZE = 24
+MAX_EVENT_PAGE_SIZE = 100
+
+
+def encode_cursor(position):
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_cursor(cursor):
+    return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+
+
+def event_filter(filter_status):
+    """Search kwargs for a status filter from the events list"""
+    if filter_status == "upcoming":
+        return {"event_datetime": q.greater_than(datetime.now(timezone.utc))}
+    if filter_status and filter_status != "all":
+        return {"status": filter_status}
+    return {}
+
+
+def event_stats(user):
+    """Counts for the events list header, computed in the database"""
+    events = app_tables.event.search(user_id=user)
+    return {
+        "total": len(events),
+        "upcoming": len(
+            app_tables.event.search(
+                q.fetch_only(),
+                user_id=user,
+                **event_filter("upcoming"),
+            )
+        ),
+        "planning": len(
+            app_tables.event.search(q.fetch_only(), user_id=user, status="planning")
+        ),
+        "total_budget": sum(
+            row["budget"] or 0
+            for row in app_tables.event.search(q.fetch_only("budget"), user_id=user)
+        ),
+    }
+
+
+# Columns an event card needs; everything else (ai_response, event_options...)
+# stays on the server for list views
+SUMMARY_COLUMNS = (
+    "title",
+    "description",
+    "event_datetime",
+    "location",
+    "guest_count",
+    "budget",
+    "status",
+    "event_type",
+    "created_at",
+) + rollups.ROLLUP_COLUMNS
+
+# Cards show at most this much of the description
+SUMMARY_DESCRIPTION_LENGTH = 80
+
+
+def full_event(row):
+    event = row_dict(row)
+    event.update(rollups.get_rollups(row))
+    return event
+
+
+def event_summary(row):
+    """Compact plain-dict projection of an event for list cards"""
+    location = row["location"] or {}
+    description = row["description"] or ""
+    summary = {
+        "id": row.get_id(),
+        "title": row["title"],
+        # One character over the limit so the card still knows to add "..."
+        "description": description[: SUMMARY_DESCRIPTION_LENGTH + 1],
+        "event_datetime": row["event_datetime"],
+        "location_name": location.get("formatted_address")
+        or location.get("venue_name"),
+        "guest_count": row["guest_count"],
+        "budget": row["budget"],
+        "status": row["status"],
+        "event_type": row["event_type"],
+        # Lets the list re-sort loaded events by creation without a reload
+        "created_at": row["created_at"],
+    }
+    summary.update(rollups.get_rollups(row))
+    return summary
+
+
+def event_page(filter_status, sort_by, cursor, page_size, project, *fetch):
+    """
+    One page of the current user's events, filtered and sorted in the
+    database, with each row passed through `project`. `fetch` limits the
+    columns loaded. The first page also carries the header stats.
+    """
+    try:
+        user = anvil.users.get_user()
+        page_size = max(1, min(int(page_size), MAX_EVENT_PAGE_SIZE))
+        column, ascending = EVENT_SORTS.get(sort_by, EVENT_SORTS["date_desc"])
+
+        offset = 0
+        if cursor:
+            position = decode_cursor(cursor)
+            if position["filter"] != filter_status or position["sort"] != sort_by:
+                return {"success": False, "error": "Cursor does not match the query"}
+            offset = position["offset"]
+
+        rows = app_tables.event.search(
+            *([q.fetch_only(*fetch)] if fetch else []),
+            tables.order_by(column, ascending=ascending),
+            user_id=user,
+            **event_filter(filter_status),
+        )
+        # Fetch one extra row to learn whether another page exists
+        page = list(rows[offset : offset + page_size + 1])
+
+        next_cursor = None
+        if len(page) > page_size:
+            page = page[:page_size]
+            next_cursor = encode_cursor(
+                {
+                    "filter": filter_status,
+                    "sort": sort_by,
+                    "offset": offset + page_size,
+                }
+            )
+
+        events = [project(row) for row in page]
+
+        result = {"success": True, "events": events, "cursor": next_cursor}
+        if not cursor:
+            result["stats"] = event_stats(user)
+        return result
+    except Exception as e:
+        print(f"✗ Error loading events: {str(e)}")
+        return {"success": False, "error": str(e)}
+
+
+@anvil.server.callable
+def get_user_events(
+    filter_status="all", sort_by="date_desc", cursor=None, page_size=EVENT_PAGE_SIZE
+):
+    """
+    One page of the current user's events as full rows. Pass the returned
+    cursor back for the next page; it is None after the last one.
+    """
+    return event_page(filter_status, sort_by, cursor, page_size, full_event)
+
+
+@anvil.server.callable
+def get_event_summaries(
+    filter_status="all", sort_by="date_desc", cursor=None, page_size=EVENT_PAGE_SIZE
+):
+    """Like get_user_events, but each event is the compact card summary"""
+    return event_page(
+        filter_status, sort_by, cursor, page_size, event_summary, *SUMMARY_COLUMNS
+    )
+
+
+# Relative weight of a query term matching each field
+SEARCH_WEIGHTS = {"title": 3, "venue": 2, "description": 1}
+SEARCH_PAGE_SIZE = 24
+# Newest matches ranked per search; a one-letter prefix can match thousands
+MAX_SEARCH_CANDIDATES = 200
+
+
+def venue_name(row):
+    return (row["location"] or {}).get("venue_name") or ""
+
+
+def event_search_text(row):
+    """
+    Text indexed for full-text search: title, venue name and description.
+    Written when an event is added; a path that edits any of those three
+    must rewrite search_text as well.
+    """
+    parts = [row["title"], venue_name(row), row["description"]]
+    return " ".join(part for part in parts if part)
+
+
+def search_terms(query):
+    return re.findall(r"\w+", (query or "").lower())
+
+
+def search_score(row, terms):
+    """Weighted term matches; a whole-word match counts double a prefix match"""
+    fields = {
+        "title": row["title"],
+        "venue": venue_name(row),
+        "description": row["description"],
+    }
+    score = 0
+    for field, text in fields.items():
+        words = search_terms(text)
+        for term in terms:
+            if term in words:
+                score += 2 * SEARCH_WEIGHTS[field]
+            elif any(word.startswith(term) for word in words):
+                score += SEARCH_WEIGHTS[field]
+    return score
+
+
+@anvil.server.callable
+def search_events(query, cursor=None, page_size=SEARCH_PAGE_SIZE):
+    """
+    Ranked prefix search over the current user's events. Every term must
+    match (as a word prefix) the title, venue name or description. Only the
+    newest MAX_SEARCH_CANDIDATES matches are ranked; equal scores stay
+    newest first. Returns one page of event summaries plus a cursor, like
+    get_event_summaries.
+    """
+    try:
+        terms = search_terms(query)
+        if not terms:
+            return {"success": True, "events": [], "cursor": None, "total": 0}
+
+        page_size = max(1, min(int(page_size), MAX_EVENT_PAGE_SIZE))
+        offset = 0
+        if cursor:
+            position = decode_cursor(cursor)
+            if position["query"] != terms:
+                return {"success": False, "error": "Cursor does not match the query"}
+            offset = position["offset"]
+
+        # Postgres tsquery: all terms, each as a prefix
+        matches = app_tables.event.search(
+            q.fetch_only(*SUMMARY_COLUMNS),
+            tables.order_by("event_datetime", ascending=False),
+            search_text=q.full_text_match(
+                " & ".join(f"{term}:*" for term in terms), raw=True
+            ),
+            user_id=anvil.users.get_user(),
+        )
+        # The iterator loads lazily, so only the candidates are fetched
+        candidates = list(itertools.islice(matches, MAX_SEARCH_CANDIDATES))
+        ranked = sorted(candidates, key=lambda row: -search_score(row, terms))
+
+        page = ranked[offset : offset + page_size]
+        next_cursor = None
+        if offset + page_size < len(ranked):
+            next_cursor = encode_cursor({"query": terms, "offset": offset + page_size})
+
+        events = [event_summary(row) for row in page]
+
+        return {
+            "success": True,
+            "events": events,
+            "cursor": next_cursor,
+            "total": len(ranked),
+        }
+    except Exception as e:
+        print(f"✗ Error searching events: {str(e)}")
+        return {"success": False, "error": str(e)}
+
+
+def backfill_search_text():
+    """Fill search_text and event_type for events saved before they were maintained"""
+    for row in app_tables.event.search():
+        row.update(
+            search_text=event_search_text(row),
+            event_type=plan_sections.get_event_plan(row).get("event_classification"),
+        )
+
+
+@anvil.server.callable(require_user=is_admin)
+def start_event_backfills():
+    """
+    Bring events saved before the rollup, search and plan-section columns
+    existed up to date. Runs once per deployment, in a background task since
+    it touches every event; returns the task id. Admins only.
+    """
+    task = anvil.server.launch_background_task("backfill_events")
+    return {"success": True, "task_id": task.get_id()}
+
+
+@anvil.server.background_task
+def backfill_events():
+    rollups.backfill_rollups()
+    backfill_search_text()
+    plan_sections.migrate_event_plans()
+
+
 @anvil.server.callable
 def get_events(user_id=None):
     events = app_tables.event.search(user_id=user_id)
@@ -56,6 +560,34 @@ def get_events(user_id=None):
     # return EVENTS
 
 
+@anvil.server.callable
+@anvil.tables.in_transaction
+def create_event(user_input):
+    """
+    Add an event from the planning form before it has a plan, so the
+    planning job, its usage rows and the saved selections link to it
+    """
+    now = datetime.now(timezone.utc)
+    event_row = app_tables.event.add_row(
+        title=user_input["title"],
+        description=user_input["description"],
+        event_datetime=user_input["event_datetime"],
+        venue_type=user_input["venue_type"],
+        guest_count=int(user_input["guest_count"]),
+        budget=int(user_input["budget"]),
+        food_bev=user_input["food_bev"],
+        event_setting=user_input["event_setting"],
+        user_id=anvil.users.get_user(),
+        status="planning",
+        created_at=now,
+        updated_at=now,
+        **{column: 0 for column in rollups.ROLLUP_COLUMNS},
+    )
+    event_row["search_text"] = event_search_text(event_row)
+    change_log.log_change("event", change_log.INSERT, event_row, event_row)
+    return {"success": True, "event_id": event_row.get_id()}
+
+
 @anvil.server.callable
 @anvil.tables.in_transaction
 def save_event(user_input):
@@ -68,7 +600,11 @@ def save_event(user_input):
         budget=int(user_input["budget"]),
         food_bev=user_input["food_bev"],
         event_setting=user_input["event_setting"],
-        ai_response=user_input["ai_response"],
+        event_type=user_input["ai_response"].get("event_classification"),
+        user_id=anvil.users.get_user(),
+        status="planning",
+        created_at=datetime.now(timezone.utc),
+        updated_at=datetime.now(timezone.utc),
         location={
             "venue_name": "The Morrison Residence",
             "address": "456 Oak Avenue, Portland, OR 97204",
@@ -77,17 +613,14 @@ def save_event(user_input):
         },
     )
 
+    event["search_text"] = event_search_text(event)
+    plan_sections.save_plan(event, user_input["ai_response"])
+
     # tasks=user_input["tasks"]
-    tasks = user_input["ai_response"]["tasks"]
-    for t in tasks:
-        app_tables.tasks.add_row(
-            event_id=event.get_id(),
-            task=t["task"],
-            details=t["details"],
-            duration=t["duration"],
-            due_date=date(t["due_date"]),
-            is_done=False,
-        )
+    rows = bulk_writes.add_tasks(event, user_input["ai_response"]["tasks"])
+    rollups.add_task_counts(event, total=len(rows))
+    change_log.log_change("event", change_log.INSERT, event, event)
+    change_log.log_changes("tasks", change_log.INSERT, rows, event)
     return event
 
 
@@ -104,7 +637,11 @@ def upsert_event_data(form_data):
                 budget=int(form_data["budget"]),
                 food_bev=form_data["food_bev"],
                 event_setting=form_data["event_setting"],
-                ai_response=form_data["ai_response"],
+                event_type=form_data["ai_response"].get("event_classification"),
+                user_id=anvil.users.get_user(),
+                status="planning",
+                created_at=datetime.now(timezone.utc),
+                updated_at=datetime.now(timezone.utc),
                 location={
                     "venue_name": "The Morrison Residence",
                     "address": "456 Oak Avenue, Portland, OR 97204",
@@ -112,19 +649,17 @@ def upsert_event_data(form_data):
                     "indoor": True,
                 },
             )
-            # add new tasks
+            event_row["search_text"] = event_search_text(event_row)
+            plan_sections.save_plan(event_row, form_data["ai_response"])
+
+            # add new tasks, all in one round trip
             task_list = form_data["ai_response"]["tasks"]
-            for task in task_list:
-                result = None
-                result = app_tables.tasks.add_row(
-                    task=task["task"],
-                    details=task["details"],
-                    duration=task["duration"],
-                    due_date=datetime.fromisoformat(task["due_date"]),
-                    event_link=event_row,
-                )
-                if not result:
-                    raise TableError("Task not saved. Attempt Rollback")
+            rows = bulk_writes.add_tasks(event_row, task_list)
+            if len(rows) != len(task_list):
+                raise TableError("Tasks not saved. Attempt Rollback")
+            rollups.add_task_counts(event_row, total=len(rows))
+            change_log.log_change("event", change_log.INSERT, event_row, event_row)
+            change_log.log_changes("tasks", change_log.INSERT, rows, event_row)
         except TableError as e:
             txn.abort()
             return {"success": False, "error": str(e)}
@@ -136,6 +671,64 @@ def upsert_event_data(form_data):
     }
 
 
+@anvil.server.callable
+@anvil.tables.in_transaction
+def save_event_selections(save_data):
+    """Save the chosen plan options, budget items and timeline for an event"""
+    event_row = app_tables.event.get_by_id(save_data["event_id"])
+    if event_row is None:
+        return {"success": False, "error": "Event not found"}
+
+    event_row.update(
+        event_options=save_data["selected_options"],
+        updated_at=datetime.now(timezone.utc),
+    )
+    if save_data.get("ai_plan"):
+        plan_sections.save_plan(event_row, save_data["ai_plan"])
+        event_row["event_type"] = save_data["ai_plan"].get("event_classification")
+    budget_items = bulk_writes.replace_rows(
+        app_tables.budget_items,
+        event_row,
+        bulk_writes.budget_item_rows(event_row, save_data["budget_breakdown"]),
+    )
+    rollups.set_budget_totals(event_row, budget_items)
+    timeline_items = bulk_writes.replace_rows(
+        app_tables.timeline_items,
+        event_row,
+        bulk_writes.timeline_item_rows(event_row, save_data["timeline"]),
+    )
+    change_log.log_change("event", change_log.UPDATE, event_row, event_row)
+
+    return {
+        "success": True,
+        "budget_items_saved": len(budget_items),
+        "timeline_items_saved": len(timeline_items),
+    }
+
+
+@anvil.server.callable
+@anvil.tables.in_transaction
+def delete_event(event_id):
+    """Delete an event with its tasks, budget, timeline and plan rows"""
+    event_row = app_tables.event.get_by_id(event_id)
+    if event_row is None:
+        return {"success": False, "error": "Event not found"}
+
+    tasks = app_tables.tasks.search(event_link=event_row)
+    change_log.log_changes("tasks", change_log.DELETE, tasks, event_row)
+    change_log.log_change("event", change_log.DELETE, event_row, event_row)
+
+    tasks.delete_all_rows()
+    app_tables.budget_items.search(event_link=event_row).delete_all_rows()
+    app_tables.timeline_items.search(event_link=event_row).delete_all_rows()
+    app_tables.ai_response.search(event_id=event_row).delete_all_rows()
+    # Usage stays on the books for cost reporting, unlinked
+    for usage in app_tables.ai_usage.search(event=event_row):
+        usage["event"] = None
+    event_row.delete()
+    return {"success": True}
+
+
 EVENTS = [
     {
         "title": "Mystery Book Club: And Then There Were None",
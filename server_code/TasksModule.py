@@ -7,18 +7,124 @@ import anvil.tables.query as q
 from anvil.tables import app_tables
 import anvil.server
 
+from datetime import datetime, timezone
+
+from . import rollups
+from . import change_log
+
 
 @anvil.server.callable
+@tables.in_transaction
 def save_task(input):
-    app_tables.tasks.add_row(
-        event_link=input["event_link"],
+    """
+    Add a task to an event (input["event_id"], or the event row as
+    input["event_link"]) and return it with its event's updated rollups
+    """
+    event_row = input.get("event_link")
+    if input.get("event_id"):
+        event_row = app_tables.event.get_by_id(input["event_id"])
+
+    task = app_tables.tasks.add_row(
+        event_link=event_row,
         task=input["task"],
         details=input["details"],
         due_date=input["due_date"],
         duration=input["duration"],
-        status=int(input["status"]),
+        status=input["status"],
+        is_done=False,
+        updated_at=datetime.now(timezone.utc),
     )
 
+    event_rollups = None
+    if event_row is not None:
+        rollups.add_task_counts(
+            event_row, total=1, done=int(rollups.task_is_done(task))
+        )
+        event_rollups = rollups.get_rollups(event_row)
+        change_log.log_change("tasks", change_log.INSERT, task, event_row)
+        change_log.log_change("event", change_log.UPDATE, event_row, event_row)
+
+    saved = dict(task)
+    saved["id"] = task.get_id()
+    return {"success": True, "task": saved, "rollups": event_rollups}
+
+
+# Task columns update_tasks_bulk may change
+EDITABLE_TASK_FIELDS = {"task", "details", "due_date", "duration", "status", "is_done"}
+
+
+def apply_task_changes(changes):
+    """
+    Apply [(task_id, {column: value})] edits and keep each touched event's
+    done count in step. Everything is checked before the first write.
+    Returns {event_id: rollups}, or an error string. Call inside a
+    transaction.
+    """
+    edits = []
+    for task_id, fields in changes:
+        unknown = set(fields) - EDITABLE_TASK_FIELDS
+        if unknown:
+            return f"Cannot update task fields: {', '.join(sorted(unknown))}"
+        task = app_tables.tasks.get_by_id(task_id)
+        if task is None:
+            return "Task not found"
+        edits.append((task, dict(fields)))
+
+    # Net change in done tasks per event, applied once per event row
+    deltas = {}
+    event_tasks = {}
+    for task, fields in edits:
+        was_done = rollups.task_is_done(task)
+        if "is_done" in fields:
+            fields["is_done"] = bool(fields["is_done"])
+            if not fields["is_done"] and "status" not in fields:
+                if task["status"] == "Done":
+                    fields["status"] = None
+        task.update(updated_at=datetime.now(timezone.utc), **fields)
+
+        event_row = task["event_link"]
+        if event_row is not None:
+            event_tasks.setdefault(event_row.get_id(), []).append(task)
+            _, delta = deltas.get(event_row.get_id(), (event_row, 0))
+            deltas[event_row.get_id()] = (
+                event_row,
+                delta + int(rollups.task_is_done(task)) - int(was_done),
+            )
+
+    event_rollups = {}
+    for event_id, (event_row, delta) in deltas.items():
+        if delta:
+            rollups.add_task_counts(event_row, done=delta)
+            change_log.log_change("event", change_log.UPDATE, event_row, event_row)
+        change_log.log_changes(
+            "tasks", change_log.UPDATE, event_tasks[event_id], event_row
+        )
+        event_rollups[event_id] = rollups.get_rollups(event_row)
+    return event_rollups
+
+
+@anvil.server.callable
+@tables.in_transaction
+def update_tasks_bulk(changes):
+    """
+    Apply a list of (task_id, {column: value}) edits in one transaction.
+    Returns the updated rollups of every event touched, keyed by event id.
+    """
+    event_rollups = apply_task_changes(changes)
+    if isinstance(event_rollups, str):
+        return {"success": False, "error": event_rollups}
+    return {"success": True, "rollups": event_rollups}
+
+
+@anvil.server.callable
+@tables.in_transaction
+def update_task_status(task_id, is_done):
+    """Tick or untick a task and return its event's updated rollups"""
+    event_rollups = apply_task_changes([(task_id, {"is_done": is_done})])
+    if isinstance(event_rollups, str):
+        return {"success": False, "error": event_rollups}
+    return {"success": True, "rollups": next(iter(event_rollups.values()), None)}
+
 
 @anvil.server.callable
 def save_tasks(tasks):
@@ -0,0 +1,352 @@
+"""
+Offline benchmarks for the plan agent.
+
+Runs against the deterministic fake model, so no network or OpenAI key is
+needed. Set the backend before event_ai is imported, e.g. from the app's
+parent directory with anvil-uplink installed:
+
+    ADURA_MODEL_BACKEND=fake python -m <app_package>.benchmarks
+
+Prints one JSON document with timing stats per benchmark, suitable for
+tracking regressions in CI.
+
+bench_task_writes_live needs real data tables, so it is not part of the
+offline run; call it from a server console or an uplink with table access.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from .models import EventPlan, SINGLE_TYPE_EVENT_PLANS
+from .prompts import system_prompt, slim_system_prompt, user_prompt
+from .classifier import classify_event
+from .sample_events import events
+from . import event_ai
+from . import fake_model
+from . import usage_ledger
+from . import bulk_writes
+from . import EventsModule
+
+
+def measure(fn, repeat=20):
+    """Call fn `repeat` times and return timing stats in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    return {
+        "runs": repeat,
+        "mean_ms": round(statistics.mean(timings), 3),
+        "p50_ms": round(timings[len(timings) // 2], 3),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        "max_ms": round(timings[-1], 3),
+    }
+
+
+def as_user_input(event):
+    """EventDetails -> the dict shape the client sends to run_ai"""
+    return {
+        "title": event.title,
+        "description": event.description,
+        "event_datetime": event.event_date,
+        "guest_count": event.guest_count,
+        "budget": event.total_budget,
+        "venue_type": event.venue_type,
+    }
+
+
+def bench_run_ai(repeat):
+    results = {}
+    for event in events:
+        user_input = as_user_input(event)
+        results[event.title] = measure(
+            lambda: event_ai.run_ai(user_input, use_cache=False), repeat
+        )
+    return results
+
+
+def bench_validation(repeat):
+    results = {}
+    for event in events:
+        plan_json = json.dumps(
+            fake_model.canned_plan(
+                event.title, event.description, event.guest_count, event.total_budget
+            )
+        )
+        results[event.title] = measure(
+            lambda: EventPlan.model_validate_json(plan_json), repeat
+        )
+    return results
+
+
+def bench_serialization(repeat):
+    results = {}
+    for event in events:
+        plan = EventPlan.model_validate(
+            fake_model.canned_plan(
+                event.title, event.description, event.guest_count, event.total_budget
+            )
+        )
+        results[event.title] = {
+            "model_dump": measure(plan.model_dump, repeat),
+            "model_dump_json": measure(plan.model_dump_json, repeat),
+        }
+    return results
+
+
+def bench_cold_start(repeat):
+    """
+    Import cost of event_ai in a fresh interpreter (what every server call
+    pays), then the one-off cost of building the agent on first use.
+    """
+    code = (
+        "import time; t = time.perf_counter(); "
+        f"import {__package__}.event_ai; "
+        "print((time.perf_counter() - t) * 1000)"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    imports = [
+        float(subprocess.check_output([sys.executable, "-c", code], env=env))
+        for _ in range(repeat)
+    ]
+
+    start = time.perf_counter()
+    event_ai.get_agent()
+    first_agent_ms = (time.perf_counter() - start) * 1000
+
+    return {
+        "import_event_ai_mean_ms": round(statistics.mean(imports), 3),
+        "first_get_agent_ms": round(first_agent_ms, 3),
+        "reused_get_agent": measure(event_ai.get_agent, repeat),
+    }
+
+
+def estimate_tokens(text):
+    """Rough OpenAI token count (~4 characters per token)"""
+    return len(text) // 4
+
+
+def bench_plan_modes(repeat):
+    """
+    Prompt + output schema size and fake-model latency for the single-shot
+    path versus the two-stage (classify locally, then slim agent) path.
+    """
+    results = {}
+    for event in events:
+        event_type = classify_event(event)
+        dynamic = event_ai.dynamic_instructions(event)
+        sizes = {
+            "single_shot": (system_prompt, EventPlan),
+            "two_stage": (
+                slim_system_prompt(event_type),
+                SINGLE_TYPE_EVENT_PLANS[event_type],
+            ),
+        }
+
+        modes = {}
+        for mode, (prompt, output_type) in sizes.items():
+            schema = json.dumps(output_type.model_json_schema())
+            modes[mode] = {
+                "prompt_tokens_est": estimate_tokens(prompt + dynamic + user_prompt),
+                "schema_tokens_est": estimate_tokens(schema),
+                "latency": measure(
+                    lambda: event_ai.run_async(
+                        event_ai.agent_for(event, mode).run(user_prompt, deps=event)
+                    ),
+                    repeat,
+                ),
+            }
+
+        single, slim = modes["single_shot"], modes["two_stage"]
+        total_single = single["prompt_tokens_est"] + single["schema_tokens_est"]
+        total_slim = slim["prompt_tokens_est"] + slim["schema_tokens_est"]
+        modes["event_type"] = event_type
+        modes["classify"] = measure(lambda: classify_event(event), repeat)
+        modes["input_token_reduction_pct"] = round(
+            100 * (total_single - total_slim) / total_single, 1
+        )
+        results[event.title] = modes
+    return results
+
+
+class LatencyTable:
+    """
+    Stand-in data table where every call costs one simulated round trip.
+    It models round-trip counts only: timings are whatever round_trip_ms
+    says, not a measurement of add_rows or a transaction.
+    """
+
+    def __init__(self, round_trip_ms):
+        self.round_trip = round_trip_ms / 1000
+
+    def add_row(self, **values):
+        time.sleep(self.round_trip)
+        return values
+
+    def add_rows(self, rows):
+        time.sleep(self.round_trip)
+        return list(rows)
+
+
+def fake_tasks(count):
+    return [
+        {
+            "task": f"Task {i}",
+            "details": "Generated for the benchmark",
+            "duration": "30 minutes",
+            "due_date": "2025-06-01",
+        }
+        for i in range(count)
+    ]
+
+
+def bench_task_writes(repeat, round_trip_ms=2, sizes=(10, 100, 1000)):
+    """
+    Model of saving N tasks one add_row at a time versus one add_rows call:
+    a LatencyTable charges round_trip_ms per call, so this shows N round
+    trips against one, not real database cost (see bench_task_writes_live).
+    """
+    table = LatencyTable(round_trip_ms)
+    results = {"round_trip_ms": round_trip_ms}
+    for size in sizes:
+        tasks = fake_tasks(size)
+
+        def per_row():
+            for row in bulk_writes.task_rows(None, tasks):
+                table.add_row(**row)
+
+        results[size] = {
+            "per_row": measure(per_row, repeat),
+            "bulk": measure(lambda: bulk_writes.add_tasks(None, tasks, table), repeat),
+        }
+    return results
+
+
+def bench_task_writes_live(repeat=3, sizes=(10, 100)):
+    """
+    The same comparison against the real tasks table. Each run writes inside
+    a transaction that is then aborted, so nothing is left behind; the
+    transaction's own cost is part of the timing.
+    """
+    import anvil.tables as tables
+    from anvil.tables import app_tables
+
+    def in_aborted_transaction(write):
+        def run():
+            with tables.Transaction() as txn:
+                write()
+                txn.abort()
+
+        return run
+
+    results = {}
+    for size in sizes:
+        tasks = fake_tasks(size)
+
+        def per_row():
+            for row in bulk_writes.task_rows(None, tasks):
+                app_tables.tasks.add_row(**row)
+
+        results[size] = {
+            "per_row": measure(in_aborted_transaction(per_row), repeat),
+            "bulk": measure(
+                in_aborted_transaction(lambda: bulk_writes.add_tasks(None, tasks)),
+                repeat,
+            ),
+        }
+    return results
+
+
+class SampleRow(dict):
+    """Just enough of a table row for the list projections"""
+
+    def __init__(self, row_id, **values):
+        super().__init__(values)
+        self.row_id = row_id
+
+    def __getitem__(self, key):
+        return self.get(key)
+
+    def get_id(self):
+        return self.row_id
+
+
+def sample_event_rows(count):
+    rows = []
+    for i in range(count):
+        event = EventsModule.EVENTS[i % len(EventsModule.EVENTS)]
+        plan = fake_model.canned_plan(
+            event["title"], event["description"], event["guest_count"], event["budget"]
+        )
+        rows.append(
+            SampleRow(
+                f"[1,{i}]",
+                title=event["title"],
+                description=event["description"],
+                event_datetime=event["event_datetime"],
+                location=event["location"],
+                guest_count=event["guest_count"],
+                budget=event["budget"],
+                status=event["event_status"],
+                event_type=plan["event_classification"],
+                ai_response=plan,
+                event_options={"themes": plan["plan"].get("themes", [])},
+                task_total=12,
+                task_done=5,
+            )
+        )
+    return rows
+
+
+def bench_event_payloads(repeat, count=24):
+    """Size and JSON round trip of one list page: full rows vs card summaries"""
+    rows = sample_event_rows(count)
+    results = {"events": count}
+    for name, project in [
+        ("full", lambda row: dict(row, id=row.get_id())),
+        ("summary", EventsModule.event_summary),
+    ]:
+        payload = json.dumps([project(row) for row in rows])
+        results[name] = {
+            "bytes": len(payload),
+            "decode": measure(lambda: json.loads(payload), repeat),
+        }
+    results["size_ratio"] = round(
+        results["full"]["bytes"] / results["summary"]["bytes"], 1
+    )
+    return results
+
+
+def run_benchmarks(repeat=20):
+    if event_ai.MODEL_BACKEND != "fake":
+        raise RuntimeError("Benchmarks need ADURA_MODEL_BACKEND=fake")
+
+    # No data tables offline
+    usage_ledger.ENABLED = False
+
+    return {
+        "model": event_ai.MODEL_NAME,
+        "fake_latency_s": event_ai.FAKE_MODEL_LATENCY,
+        "cold_start": bench_cold_start(min(repeat, 5)),
+        "run_ai": bench_run_ai(repeat),
+        "plan_modes": bench_plan_modes(repeat),
+        "validation": bench_validation(repeat),
+        "serialization": bench_serialization(repeat),
+        "task_writes": bench_task_writes(min(repeat, 3)),
+        "event_payloads": bench_event_payloads(repeat),
+    }
+
+
+def main():
+    print(json.dumps(run_benchmarks(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
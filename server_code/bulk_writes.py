@@ -0,0 +1,79 @@
+"""
+Bulk writers for the rows that hang off an event.
+
+Saving a plan used to call add_row once per task, so the save cost one
+database round trip per row. These helpers build every row up front and
+insert them with a single add_rows call per table.
+"""
+
+from anvil.tables import app_tables
+
+from datetime import date, datetime, timezone
+
+
+def _as_date(value):
+    if value is None or isinstance(value, date):
+        return value
+    return datetime.fromisoformat(str(value)).date()
+
+
+def task_rows(event_row, tasks):
+    return [
+        {
+            "event_link": event_row,
+            "task": task["task"],
+            "details": task.get("details"),
+            "duration": task.get("duration"),
+            "due_date": _as_date(task.get("due_date")),
+            "is_done": False,
+            "updated_at": datetime.now(timezone.utc),
+        }
+        for task in tasks
+    ]
+
+
+def budget_item_rows(event_row, budget_breakdown):
+    """Rows for the budget_items table from a plan's BudgetItem dicts"""
+    return [
+        {
+            "event_link": event_row,
+            "category": item["category"],
+            "estimated_amount": item.get("amount") or 0,
+            "actual_amount": 0,
+            "percentage": item.get("percentage"),
+            "paid": False,
+            "description": item.get("notes"),
+            "updated_at": datetime.now(timezone.utc),
+        }
+        for item in budget_breakdown
+    ]
+
+
+def timeline_item_rows(event_row, timeline):
+    """Rows for the timeline_items table from a plan's TimelineItem dicts, in order"""
+    return [
+        {
+            "event_link": event_row,
+            "rank": rank,
+            "time": item.get("time"),
+            "activity": item.get("activity"),
+            "responsible_party": item.get("responsible_party"),
+        }
+        for rank, item in enumerate(timeline)
+    ]
+
+
+def _add_rows(table, rows):
+    return table.add_rows(rows) if rows else []
+
+
+def add_tasks(event_row, tasks, table=None):
+    """Insert all tasks for an event in one round trip"""
+    table = table or app_tables.tasks
+    return _add_rows(table, task_rows(event_row, tasks))
+
+
+def replace_rows(table, event_row, rows):
+    """Swap an event's rows in `table` for `rows`. Call inside a transaction."""
+    table.search(event_link=event_row).delete_all_rows()
+    return _add_rows(table, rows)
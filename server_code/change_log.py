@@ -0,0 +1,117 @@
+"""
+Change log across the event and tasks tables.
+
+Every write path appends one entry per event or task row it inserts,
+updates or deletes. Entries are numbered from the owning user's counter row
+in the same transaction as the write, so a user's seq only ever goes up and
+a client that remembers the last seq it saw can ask for just the rows
+changed after it (EventsModule.get_changes_since). Counters are per user so
+writes by different users never contend for the same row.
+
+Each user's log is compacted to its newest CHANGE_LOG_LIMIT entries. A
+cursor older than the compacted part can no longer be served; the client is
+told to reload instead.
+"""
+
+import anvil.tables as tables
+import anvil.tables.query as q
+from anvil.tables import app_tables
+
+from datetime import datetime, timezone
+
+INSERT, UPDATE, DELETE = "insert", "update", "delete"
+
+CHANGE_LOG_LIMIT = 5000
+
+# Compact once this many entries have piled up past the limit
+COMPACT_EVERY = 500
+
+
+def _counter(user):
+    row = app_tables.change_seq.get(name="user", user=user)
+    if row is None:
+        row = app_tables.change_seq.add_row(
+            name="user", user=user, last_seq=0, compacted_seq=0
+        )
+    return row
+
+
+def log_changes(table_name, op, rows, event_row):
+    """
+    Append an entry for each of `rows` (all of `table_name`, all belonging
+    to `event_row`). Call inside the write's transaction, and before
+    deleting the rows.
+    """
+    rows = list(rows)
+    if not rows:
+        return
+
+    user = event_row["user_id"]
+    counter = _counter(user)
+    first = counter["last_seq"] + 1
+    changed_at = datetime.now(timezone.utc)
+    app_tables.change_log.add_rows(
+        [
+            {
+                "seq": first + i,
+                "table_name": table_name,
+                "row_id": row.get_id(),
+                "event_id": event_row.get_id(),
+                "op": op,
+                "user": user,
+                "changed_at": changed_at,
+            }
+            for i, row in enumerate(rows)
+        ]
+    )
+    counter["last_seq"] = first + len(rows) - 1
+
+    if counter["last_seq"] - counter["compacted_seq"] >= (
+        CHANGE_LOG_LIMIT + COMPACT_EVERY
+    ):
+        compact(user, counter)
+
+
+def log_change(table_name, op, row, event_row):
+    log_changes(table_name, op, [row], event_row)
+
+
+def compact(user, counter=None):
+    """Drop every entry of a user's but the newest CHANGE_LOG_LIMIT"""
+    counter = counter or _counter(user)
+    floor = counter["last_seq"] - CHANGE_LOG_LIMIT
+    if floor <= counter["compacted_seq"]:
+        return
+    app_tables.change_log.search(
+        user=user, seq=q.less_than_or_equal_to(floor)
+    ).delete_all_rows()
+    counter["compacted_seq"] = floor
+
+
+@tables.in_transaction
+def changes_since(user, cursor):
+    """
+    (cursor, reset, changes) for a user's rows changed after `cursor`.
+    changes maps (table_name, row_id) to (op, event_id) for the last op
+    logged for the row. reset is True when `cursor` is older than the
+    compacted log, or ahead of the user's counter.
+    """
+    counter = _counter(user)
+    latest = counter["last_seq"]
+    if cursor is None:
+        return latest, False, {}
+    if cursor < counter["compacted_seq"] or cursor > latest:
+        return latest, True, {}
+
+    changes = {}
+    for entry in app_tables.change_log.search(
+        q.fetch_only("seq", "table_name", "row_id", "event_id", "op"),
+        tables.order_by("seq"),
+        user=user,
+        seq=q.all_of(q.greater_than(cursor), q.less_than_or_equal_to(latest)),
+    ):
+        changes[(entry["table_name"], entry["row_id"])] = (
+            entry["op"],
+            entry["event_id"],
+        )
+    return latest, False, changes
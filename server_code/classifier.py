@@ -0,0 +1,65 @@
+"""
+Local rule-based event classifier.
+
+Picks the plan type from keywords in the event title and description, so the
+two-stage planning mode can send the model only that type's instructions and
+output schema without paying for a classification request.
+"""
+
+import re
+
+# Keywords per event type, mirroring the classifications in prompts.py
+KEYWORDS = {
+    "social_celebration": [
+        "birthday", "bday", "shower", "gender reveal", "anniversary", "party",
+        "celebration", "wedding", "engagement", "graduation", "reunion",
+        "holiday", "christmas", "halloween", "bash", "housewarming",
+        "viewing party", "watch party",
+    ],
+    "professional_gathering": [
+        "meetup", "networking", "workshop", "seminar", "conference", "summit",
+        "hackathon", "offsite", "team", "developers", "startup", "panel",
+        "training", "webinar", "tech", "business",
+    ],
+    "intellectual_gathering": [
+        "book club", "book", "reading", "study group", "study", "discussion",
+        "debate", "hobby", "club", "lecture", "poetry", "philosophy",
+        "gardening", "chess", "language exchange",
+    ],
+}
+
+DEFAULT_TYPE = "social_celebration"
+
+# Title words say more about the event than the free-text description
+TITLE_WEIGHT = 2
+
+
+def _score(text, keywords):
+    return sum(
+        1 for keyword in keywords if re.search(rf"\b{re.escape(keyword)}", text)
+    )
+
+
+def classify_text(title, description=""):
+    """Return the best matching event type; ties and no matches fall back to DEFAULT_TYPE"""
+    title = title.lower()
+    description = description.lower()
+
+    scores = {
+        event_type: TITLE_WEIGHT * _score(title, keywords)
+        + _score(description, keywords)
+        for event_type, keywords in KEYWORDS.items()
+    }
+    best = max(scores.values())
+    if best == 0:
+        return DEFAULT_TYPE
+
+    # Prefer the default on ties so ambiguous events keep the richest plan
+    if scores[DEFAULT_TYPE] == best:
+        return DEFAULT_TYPE
+    return max(scores, key=scores.get)
+
+
+def classify_event(event):
+    """Classify an EventDetails"""
+    return classify_text(event.title, event.description)
@@ -1,58 +1,177 @@
 import anvil.users
 import anvil.secrets
-import anvil.files
-from anvil.files import data_files
 import anvil.tables as tables
 import anvil.tables.query as q
 from anvil.tables import app_tables
 import anvil.server
 
-from pydantic_ai import Agent, RunContext
-from pydantic_ai.models.openai import OpenAIModel
-from pydantic_ai.providers.openai import OpenAIProvider
+import asyncio
+import os
+import threading
+import time
+from pydantic_core import from_json
 
-from .models import EventDetails, EventPlan
-from .prompts import system_prompt, user_prompt
+from .models import EventDetails, EventPlan, SINGLE_TYPE_EVENT_PLANS
+from .prompts import system_prompt, slim_system_prompt, user_prompt
+from .classifier import classify_event
+from . import plan_cache
+from . import plan_index
+from . import plan_policy
+from . import fake_model
+from . import usage_ledger
 
+# "openai" for the real model, "fake" for the offline deterministic stand-in
+MODEL_BACKEND = os.environ.get("ADURA_MODEL_BACKEND", "openai")
+FAKE_MODEL_LATENCY = float(os.environ.get("ADURA_FAKE_MODEL_LATENCY", "0"))
 
-openai_api_key = anvil.secrets.get_secret("openai_api_key")
-model = OpenAIModel(
-    "gpt-4o-mini",
-    provider=OpenAIProvider(api_key=openai_api_key),
+# "single_shot" sends every plan type to the model; "two_stage" classifies the
+# event locally first and sends only that type's prompt section and schema
+PLAN_MODE = os.environ.get("ADURA_PLAN_MODE", "single_shot")
+
+OPENAI_MODEL_NAME = "gpt-4o-mini"
+MODEL_NAME = (
+    fake_model.FAKE_MODEL_NAME if MODEL_BACKEND == "fake" else OPENAI_MODEL_NAME
 )
 
-# Create the agent
-event_agent = Agent(
-    model=model,
-    deps_type=EventDetails,
-    output_type=EventPlan,
-    system_prompt=system_prompt,
+# Cheaper, faster model used when the primary keeps failing near the deadline
+OPENAI_FALLBACK_MODEL_NAME = "gpt-4.1-nano"
+FALLBACK_MODEL_NAME = (
+    fake_model.FAKE_MODEL_NAME
+    if MODEL_BACKEND == "fake"
+    else OPENAI_FALLBACK_MODEL_NAME
 )
 
+# Connection pool shared by the model requests of one server thread
+HTTP_MAX_CONNECTIONS = 20
+HTTP_TIMEOUT_SECONDS = 120
+
+
+class _ThreadState(threading.local):
+    """
+    The event loop and everything bound to it, kept per server thread.
+    Pooled connections belong to the loop that opened them, and a loop can
+    only run one run_until_complete at a time, so concurrent calls on
+    different threads each get their own loop, HTTP client, models and
+    agents. Nothing here is shared between threads, so no locking is needed.
+
+    All of it is built on first use, not at import: every server call
+    imports this module, and most never touch the AI.
+    """
+
+    def __init__(self):
+        self.http_client = None
+        self.event_loop = None
+        self.models = {}
+        self.agents = {}
+
+
+_state = _ThreadState()
+
+
+def get_http_client():
+    if _state.http_client is None or _state.http_client.is_closed:
+        import httpx
+
+        _state.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+            ),
+            timeout=httpx.Timeout(HTTP_TIMEOUT_SECONDS, connect=5),
+        )
+    return _state.http_client
+
+
+def run_async(coro):
+    """
+    Run a coroutine on this thread's long-lived event loop, so agent runs
+    reuse pooled connections instead of a fresh asyncio.run() each time.
+    """
+    if _state.event_loop is None or _state.event_loop.is_closed():
+        _state.event_loop = asyncio.new_event_loop()
+    return _state.event_loop.run_until_complete(coro)
+
+
+def build_model(
+    backend=MODEL_BACKEND, latency=FAKE_MODEL_LATENCY, model_name=OPENAI_MODEL_NAME
+):
+    if backend == "fake":
+        return fake_model.build_fake_model(latency=latency)
+
+    from pydantic_ai.models.openai import OpenAIModel
+    from pydantic_ai.providers.openai import OpenAIProvider
+
+    openai_api_key = anvil.secrets.get_secret("openai_api_key")
+    return OpenAIModel(
+        model_name,
+        provider=OpenAIProvider(api_key=openai_api_key, http_client=get_http_client()),
+    )
+
+
+def get_model(fallback=False):
+    if fallback not in _state.models:
+        _state.models[fallback] = build_model(
+            model_name=OPENAI_FALLBACK_MODEL_NAME if fallback else OPENAI_MODEL_NAME
+        )
+    return _state.models[fallback]
+
+
+def get_agent(event_type=None, fallback=False):
+    """
+    Return the plan agent, creating it on first use. With an event_type the
+    agent only knows that type's prompt section and plan model; with
+    fallback it runs on the cheaper fallback model.
+    """
+    key = (event_type, fallback)
+    if key not in _state.agents:
+        from pydantic_ai import Agent, RunContext
+
+        agent = Agent(
+            model=get_model(fallback),
+            deps_type=EventDetails,
+            output_type=(
+                SINGLE_TYPE_EVENT_PLANS[event_type] if event_type else EventPlan
+            ),
+            system_prompt=(
+                slim_system_prompt(event_type) if event_type else system_prompt
+            ),
+        )
+
+        @agent.system_prompt
+        def add_dynamic_instructions(ctx: RunContext[EventDetails]) -> str:
+            """Add event-specific context to the system prompt"""
+            return dynamic_instructions(ctx.deps)
+
+        _state.agents[key] = agent
+    return _state.agents[key]
+
 
-@event_agent.system_prompt
-def add_dynamic_instructions(ctx: RunContext[EventDetails]) -> str:
-    """Add event-specific context to the system prompt"""
+def agent_for(event, mode=None):
+    """Pick the agent for an event according to the planning mode"""
+    if (mode or PLAN_MODE) == "two_stage":
+        return get_agent(classify_event(event))
+    return get_agent()
 
-    budget_per_person = ctx.deps.total_budget / ctx.deps.guest_count
+
+def dynamic_instructions(event: EventDetails) -> str:
+    budget_per_person = event.total_budget / event.guest_count
 
     return f"""
     Current Event Details:
-    - Title: {ctx.deps.title}
-    - Description: {ctx.deps.description}
-    - Date: {ctx.deps.event_date}
-    - Guest Count: {ctx.deps.guest_count}
-    - Total Budget: ${ctx.deps.total_budget} (${budget_per_person:.2f} per person)
-    - Venue: {ctx.deps.venue_type}
+    - Title: {event.title}
+    - Description: {event.description}
+    - Date: {event.event_date}
+    - Guest Count: {event.guest_count}
+    - Total Budget: ${event.total_budget} (${budget_per_person:.2f} per person)
+    - Venue: {event.venue_type}
     
     Important: Create a complete response with ALL required fields filled out.
-    Scale all suggestions appropriately for {ctx.deps.guest_count} guests and ${ctx.deps.total_budget} budget.
+    Scale all suggestions appropriately for {event.guest_count} guests and ${event.total_budget} budget.
     """
 
 
-@anvil.server.callable
-def run_ai(user_input):
-    event = EventDetails(
+def event_from_input(user_input):
+    return EventDetails(
         title=user_input["title"],
         description=user_input["description"],
         event_date=user_input["event_datetime"],
@@ -61,27 +180,484 @@ def run_ai(user_input):
         venue_type=user_input["venue_type"],
     )
 
-    try:
-        result = event_agent.run_sync(
-            user_prompt=user_prompt,
-            deps=event,
+
+def reuse_plan(event):
+    """
+    Look for a plan that can be served without the model: the exact cache
+    first, then the most similar past event. Returns (plan, source, match),
+    with plan None when the model has to be called.
+    """
+    cached = plan_cache.get_cached_plan(event, MODEL_NAME, PLAN_MODE)
+    if cached is not None:
+        return dict(cached), "cache", None
+
+    similar, match = plan_index.find_similar_plan(event)
+    if similar is not None:
+        # Exact repeats of this event now hit the cache directly
+        plan_cache.store_plan(event, MODEL_NAME, similar, PLAN_MODE)
+        return similar, "similar", match
+
+    return None, "model", None
+
+
+def remember_plan(event, output):
+    """Store a model-generated plan in the cache and the similarity index"""
+    plan_cache.store_plan(event, MODEL_NAME, output, PLAN_MODE)
+    plan_index.add_plan(event, output)
+
+
+def annotate_plan(output, event, source, match=None):
+    output["input_event_details"] = event.__dict__()
+    output["cache_hit"] = source in REUSED_SOURCES
+    output["plan_source"] = source
+    if match:
+        output["similar_to"] = match
+    return output
+
+
+# Plan sources that were served from storage rather than generated
+REUSED_SOURCES = ("cache", "similar", "similar_fallback")
+
+
+def _outcome(
+    output, plan_source, model_name, usage=None, attempts=0, errors=(), match=None
+):
+    return {
+        "output": output,
+        "plan_source": plan_source,
+        "model_name": model_name,
+        "usage": usage,
+        "attempts": attempts,
+        "errors": list(errors),
+        "match": match,
+    }
+
+
+async def run_with_policy(
+    event, timings, deadline_seconds=plan_policy.DEADLINE_SECONDS
+):
+    """
+    Generate a plan under a deadline: retry the primary model with jittered
+    backoff, then try the fallback model. Only when both fail is a repaired
+    partial plan from the primary attempts served, and then a loosely
+    similar stored plan. Adds to `timings` in place and raises
+    PlanningError when nothing produced a plan.
+    """
+    from pydantic_ai import capture_run_messages
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + deadline_seconds
+    event_type = classify_event(event)
+    errors = []
+    repaired = None
+
+    def remaining(reserve=0):
+        return deadline - loop.time() - reserve
+
+    attempt = 0
+    while attempt < plan_policy.MAX_ATTEMPTS:
+        budget = min(
+            plan_policy.ATTEMPT_TIMEOUT_SECONDS,
+            remaining(plan_policy.FALLBACK_RESERVE_SECONDS),
+        )
+        if budget <= 0:
+            break
+        attempt += 1
+
+        started = loop.time()
+        with capture_run_messages() as messages:
+            try:
+                result = await asyncio.wait_for(
+                    agent_for(event).run(user_prompt, deps=event), timeout=budget
+                )
+                return _outcome(
+                    result.output.model_dump(),
+                    "model",
+                    MODEL_NAME,
+                    result.usage(),
+                    attempt,
+                    errors,
+                )
+            except Exception as e:
+                errors.append(f"attempt {attempt}: {type(e).__name__}: {e}")
+            finally:
+                timings["model_ms"] += (loop.time() - started) * 1000
+
+        # Kept as a last resort; retries and the fallback model come first
+        started = loop.time()
+        repaired = (
+            plan_policy.repair_plan(
+                plan_policy.output_from_messages(messages), event_type
+            )
+            or repaired
         )
-        # Save to file
-        output = result.output.model_dump()
-        output["input_event_details"] = event.__dict__
-        return output
+        timings["repair_ms"] += (loop.time() - started) * 1000
+
+        if attempt < plan_policy.MAX_ATTEMPTS:
+            delay = min(
+                plan_policy.backoff_delay(attempt - 1),
+                max(0, remaining(plan_policy.FALLBACK_RESERVE_SECONDS)),
+            )
+            await asyncio.sleep(delay)
+            timings["backoff_ms"] += delay * 1000
+
+    if remaining() > 0:
+        started = loop.time()
+        try:
+            result = await asyncio.wait_for(
+                get_agent(event_type, fallback=True).run(user_prompt, deps=event),
+                timeout=remaining(),
+            )
+            return _outcome(
+                result.output.model_dump(),
+                "fallback_model",
+                FALLBACK_MODEL_NAME,
+                result.usage(),
+                attempt,
+                errors,
+            )
+        except Exception as e:
+            errors.append(f"fallback: {type(e).__name__}: {e}")
+        finally:
+            timings["fallback_ms"] += (loop.time() - started) * 1000
+
+    if repaired is not None:
+        return _outcome(repaired, "repaired", MODEL_NAME, None, attempt, errors)
+
+    plan, match = plan_index.find_similar_plan(
+        event, threshold=plan_policy.FALLBACK_SIMILARITY_THRESHOLD
+    )
+    if plan is not None:
+        return _outcome(
+            plan, "similar_fallback", MODEL_NAME, None, attempt, errors, match
+        )
+
+    raise plan_policy.PlanningError(
+        f"Could not plan {event.title}: {errors[-1] if errors else 'deadline exceeded'}",
+        errors,
+        timings,
+    )
+
+
+def _finish_timings(timings, started):
+    timings["total_ms"] = (time.perf_counter() - started) * 1000
+    return {key: round(value, 1) for key, value in timings.items()}
+
+
+def generate_plan(event, use_cache=True, event_row=None, source="run_ai"):
+    """
+    Plan an event, reusing a stored plan when possible. Returns
+    {"success", "ai_plan", "source", "attempts", "errors", "timings"}; raises
+    PlanningError when every attempt and fallback failed.
+    """
+
+    started = time.perf_counter()
+    timings = plan_policy.new_timings()
+    if use_cache:
+        reused, plan_source, match = reuse_plan(event)
+        timings["lookup_ms"] = (time.perf_counter() - started) * 1000
+        if reused is not None:
+            usage_ledger.record_usage(
+                MODEL_NAME,
+                latency_ms=(time.perf_counter() - started) * 1000,
+                cache_hit=True,
+                event=event_row,
+                source=source,
+            )
+            return {
+                "success": True,
+                "ai_plan": annotate_plan(reused, event, plan_source, match),
+                "source": plan_source,
+                "attempts": 0,
+                "errors": [],
+                "timings": _finish_timings(timings, started),
+            }
+
+    try:
+        outcome = run_async(run_with_policy(event, timings))
+    except plan_policy.PlanningError as e:
+        e.timings = _finish_timings(timings, started)
+        raise
+
+    plan_source = outcome["plan_source"]
+    usage_ledger.record_usage(
+        outcome["model_name"],
+        usage=outcome["usage"],
+        latency_ms=(time.perf_counter() - started) * 1000,
+        cache_hit=plan_source in REUSED_SOURCES,
+        event=event_row,
+        source=source,
+    )
+
+    output = outcome["output"]
+    if use_cache and plan_source == "model":
+        remember_plan(event, output)
+
+    return {
+        "success": True,
+        "ai_plan": annotate_plan(output, event, plan_source, outcome["match"]),
+        "source": plan_source,
+        "attempts": outcome["attempts"],
+        "errors": outcome["errors"],
+        "timings": _finish_timings(timings, started),
+    }
+
+
+@anvil.server.callable
+def run_ai(user_input, use_cache=True, event_id=None):
+    """
+    Plan an event. Always returns a dict: {"success": True, "ai_plan", ...}
+    or {"success": False, "error"}, with the time spent in each stage.
+    """
+    try:
+        event = event_from_input(user_input)
+        event_row = app_tables.event.get_by_id(event_id) if event_id else None
+        return generate_plan(event, use_cache=use_cache, event_row=event_row)
     except Exception as e:
-        print(f"✗ Error planning {event.title}: {str(e)}")
+        print(f"✗ Error planning {user_input.get('title')}: {str(e)}")
+        return {
+            "success": False,
+            "error": str(e),
+            "timings": getattr(e, "timings", {}),
+        }
+
+
+# ============================================================================
+# BATCH PLANNING
+# ============================================================================
+
+
+class RateLimiter:
+    """Spaces out request starts to at most `rate` per second"""
+
+    def __init__(self, rate=None):
+        self.interval = 1 / rate if rate else 0
+        self._next_start = 0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+async def _plan_one(event, semaphore, limiter):
+    async with semaphore:
+        await limiter.wait()
+        started = time.perf_counter()
+        outcome = await run_with_policy(event, plan_policy.new_timings())
+        outcome["latency_ms"] = (time.perf_counter() - started) * 1000
+        return outcome
+
+
+async def _plan_many(events, max_concurrency, requests_per_second):
+    # A semaphore of 0 would never let a plan start
+    semaphore = asyncio.Semaphore(max(1, int(max_concurrency)))
+    limiter = RateLimiter(requests_per_second)
+    return await asyncio.gather(
+        *(_plan_one(event, semaphore, limiter) for event in events),
+        return_exceptions=True,
+    )
 
 
 @anvil.server.callable
-def get_event_details():
-    event = EventDetails(
-        title="Liverpool vs West Ham Football Match Viewing Party",
-        description="A gathering to watch the Liverpool vs West Ham football match with friends and family",
-        event_date="2025-11-30",
-        guest_count=10,
-        total_budget=300,
-        venue_type="home",
+def plan_events_batch(
+    events, max_concurrency=5, requests_per_second=2.0, use_cache=True
+):
+    """
+    Plan many events concurrently. `events` may be EventDetails or
+    user_input dicts. Returns one result per event, in input order; an
+    invalid input fails only its own result.
+    Large batches should run from a background task to avoid call timeouts.
+    """
+    started = time.perf_counter()
+
+    events = list(events)
+    titles = [None] * len(events)
+    results = [None] * len(events)
+    pending = []
+    for index, raw in enumerate(events):
+        try:
+            event = raw if isinstance(raw, EventDetails) else event_from_input(raw)
+        except Exception as e:
+            titles[index] = raw.get("title") if isinstance(raw, dict) else None
+            results[index] = (e, None, None)
+            continue
+        events[index] = event
+        titles[index] = event.title
+
+        reused, plan_source, match = None, "model", None
+        if use_cache:
+            reused, plan_source, match = reuse_plan(event)
+        if reused is not None:
+            usage_ledger.record_usage(MODEL_NAME, cache_hit=True, source="batch")
+            results[index] = (reused, plan_source, match)
+        else:
+            pending.append(index)
+
+    outcomes = run_async(
+        _plan_many([events[i] for i in pending], max_concurrency, requests_per_second)
+    )
+    for index, outcome in zip(pending, outcomes):
+        if isinstance(outcome, Exception):
+            results[index] = (outcome, None, None)
+            continue
+
+        plan_source = outcome["plan_source"]
+        usage_ledger.record_usage(
+            outcome["model_name"],
+            usage=outcome["usage"],
+            latency_ms=outcome["latency_ms"],
+            cache_hit=plan_source in REUSED_SOURCES,
+            source="batch",
+        )
+        if use_cache and plan_source == "model":
+            remember_plan(events[index], outcome["output"])
+        results[index] = (outcome["output"], plan_source, outcome["match"])
+
+    batch = []
+    for index, (event, (output, plan_source, match)) in enumerate(zip(events, results)):
+        item = {"index": index, "title": titles[index]}
+        if isinstance(output, Exception):
+            print(f"✗ Error planning {titles[index]}: {str(output)}")
+            item.update(success=False, error=str(output))
+        else:
+            item.update(
+                success=True,
+                ai_plan=annotate_plan(output, event, plan_source, match),
+                source=plan_source,
+            )
+        batch.append(item)
+
+    return {
+        "results": batch,
+        "succeeded": sum(1 for r in batch if r["success"]),
+        "failed": sum(1 for r in batch if not r["success"]),
+        "elapsed": round(time.perf_counter() - started, 3),
+    }
+
+
+# ============================================================================
+# STREAMING
+# ============================================================================
+
+
+def completed_sections(partial, done=False):
+    """
+    Split a partially parsed EventPlan into the sections that are finished.
+    A key is finished once the model has moved on to the next one, so every
+    key but the last is complete (and the last too once the stream is done).
+    Plan sub-sections are emitted individually, in arrival order.
+    With done=True the order is that of the final dumped plan, which can
+    differ from the streamed order, so clients track sections by key.
+    """
+    sections = []
+    keys = list(partial)
+
+    for i, key in enumerate(keys):
+        is_open = not done and i == len(keys) - 1
+        value = partial[key]
+
+        if key == "plan" and isinstance(value, dict):
+            plan_keys = [k for k in value if k != "event_type"]
+            for j, plan_key in enumerate(plan_keys):
+                if is_open and j == len(plan_keys) - 1:
+                    break
+                sections.append((plan_key, value[plan_key]))
+            continue
+
+        if is_open:
+            break
+        sections.append((key, value))
+
+    return sections
+
+
+def _partial_output(response):
+    """Parse the (possibly truncated) output tool arguments of a streamed response"""
+    from pydantic_ai.messages import ToolCallPart
+
+    for part in response.parts:
+        if isinstance(part, ToolCallPart) and part.args:
+            if isinstance(part.args, dict):
+                return part.args
+            return from_json(part.args, allow_partial=True)
+    return {}
+
+
+def _publish_sections(sections, plan=None):
+    anvil.server.task_state["sections"] = [[key, value] for key, value in sections]
+    anvil.server.task_state["done"] = plan is not None
+    if plan is not None:
+        anvil.server.task_state["plan"] = plan
+
+
+async def _stream_plan(event):
+    published = 0
+
+    async with agent_for(event).run_stream(user_prompt, deps=event) as result:
+        async for item in result.stream_responses(debounce_by=0.2):
+            # Older pydantic-ai releases yield (response, is_last) pairs
+            response = item[0] if isinstance(item, tuple) else item
+            sections = completed_sections(_partial_output(response))
+            if len(sections) > published:
+                published = len(sections)
+                _publish_sections(sections)
+
+        output = await result.get_output()
+
+    return output.model_dump(), result.usage()
+
+
+def stream_plan(event, event_row=None, source="job"):
+    """
+    Generate a plan from inside a background task, publishing each finished
+    section through task_state as it streams. Returns the annotated plan.
+    """
+    _publish_sections([])
+
+    started = time.perf_counter()
+    output, plan_source, match = reuse_plan(event)
+    model_name, usage = MODEL_NAME, None
+    if output is None:
+        stream_deadline = (
+            plan_policy.DEADLINE_SECONDS - plan_policy.FALLBACK_RESERVE_SECONDS
+        )
+        try:
+            output, usage = run_async(
+                asyncio.wait_for(_stream_plan(event), stream_deadline)
+            )
+            remember_plan(event, output)
+        except Exception as e:
+            # The reserve goes straight to the fallback model / stored plans
+            print(f"✗ Error streaming {event.title}: {str(e)}")
+            outcome = run_async(
+                run_with_policy(
+                    event,
+                    plan_policy.new_timings(),
+                    deadline_seconds=plan_policy.FALLBACK_RESERVE_SECONDS,
+                )
+            )
+            output, plan_source, match = (
+                outcome["output"],
+                outcome["plan_source"],
+                outcome["match"],
+            )
+            model_name, usage = outcome["model_name"], outcome["usage"]
+
+    usage_ledger.record_usage(
+        model_name,
+        usage=usage,
+        latency_ms=(time.perf_counter() - started) * 1000,
+        cache_hit=plan_source in REUSED_SOURCES,
+        event=event_row,
+        source=source,
     )
-    return event.__dict__()
+
+    plan = annotate_plan(dict(output), event, plan_source, match)
+    _publish_sections(completed_sections(output, done=True), plan=plan)
+    return plan
@@ -0,0 +1,194 @@
+"""
+Deterministic stand-in for the OpenAI model, for offline runs and benchmarks.
+
+The fake model reads the event details out of the system prompt and answers
+with a canned EventPlan for the matching event type, after an optional delay
+that mimics model latency. The same input always produces the same plan.
+"""
+
+import asyncio
+import json
+import re
+
+from .classifier import classify_text
+
+FAKE_MODEL_NAME = "fake-plan-model"
+
+
+def _budget_breakdown(total_budget):
+    split = [("Food & Drinks", 50), ("Decorations", 20), ("Supplies", 20), ("Misc", 10)]
+    return [
+        {
+            "category": category,
+            "amount": round(total_budget * pct / 100, 2),
+            "percentage": float(pct),
+            "notes": None,
+        }
+        for category, pct in split
+    ]
+
+
+def _plan_section(event_type, total_budget):
+    budget = _budget_breakdown(total_budget)
+
+    if event_type == "professional_gathering":
+        return {
+            "event_type": event_type,
+            "agenda": [
+                {"time": "18:00", "item": "Arrivals and networking"},
+                {"time": "18:30", "item": "Lightning talks"},
+                {"time": "19:30", "item": "Open discussion"},
+            ],
+            "networking_approach": "Name tags with interest stickers and a short icebreaker round",
+            "room_setup": "Theatre seating facing the screen with standing tables at the back",
+            "tech_needs": ["Projector", "Microphone", "HDMI adapters"],
+            "refreshments": ["Pizza", "Soft drinks", "Coffee"],
+            "materials": ["Name tags", "Printed agenda"],
+            "budget_breakdown": budget,
+        }
+
+    if event_type == "intellectual_gathering":
+        return {
+            "event_type": event_type,
+            "discussion_format": "Round-robin first impressions, then open discussion",
+            "preparation_guidelines": ["Finish the reading", "Note one favourite passage"],
+            "discussion_prompts": [
+                "What surprised you most?",
+                "Which character changed the most?",
+                "Would you recommend it, and to whom?",
+            ],
+            "seating_arrangement": "Circle of chairs so everyone can see each other",
+            "refreshments": ["Tea", "Coffee", "Biscuits"],
+            "materials_needed": ["Copies of the book", "Notepads"],
+            "budget_breakdown": budget,
+        }
+
+    return {
+        "event_type": "social_celebration",
+        "themes": [
+            {
+                "name": "Garden Party",
+                "description": "Light and floral with plenty of greenery",
+                "color_palette": ["#a8d5ba", "#ffffff", "#f7c6c7"],
+                "atmosphere": "Relaxed and bright",
+            },
+            {
+                "name": "Golden Hour",
+                "description": "Warm tones and soft lighting",
+                "color_palette": ["#f4a261", "#e9c46a", "#264653"],
+                "atmosphere": "Cosy and festive",
+            },
+        ],
+        "decorations": {
+            "essential_items": ["Balloons", "Table covers", "String lights"],
+            "optional_items": ["Photo backdrop"],
+            "diy_opportunities": ["Paper garlands"],
+            "setup_tips": "Set up decorations the evening before",
+        },
+        "menu_options": [
+            {
+                "style": "buffet",
+                "items": ["Sandwiches", "Salads", "Fruit platter"],
+                "dietary_accommodations": ["Vegetarian"],
+                "beverage_pairings": ["Lemonade", "Iced tea"],
+            },
+            {
+                "style": "stations",
+                "items": ["Taco bar", "Dessert table"],
+                "dietary_accommodations": [],
+                "beverage_pairings": ["Mocktails"],
+            },
+        ],
+        "activities": [
+            {
+                "name": "Photo booth",
+                "duration": "Ongoing",
+                "materials_needed": ["Props", "Camera"],
+                "instructions": "Set up near the entrance",
+            },
+            {
+                "name": "Group game",
+                "duration": "30 minutes",
+                "materials_needed": [],
+                "instructions": "Split guests into teams",
+            },
+        ],
+        "timeline": [
+            {"time": "0:00", "activity": "Guests arrive", "responsible_party": "Host"},
+            {"time": "0:30", "activity": "Food served", "responsible_party": None},
+            {"time": "1:30", "activity": "Main moment", "responsible_party": "Host"},
+        ],
+        "budget_breakdown": budget,
+        "special_touches": ["Personalised welcome sign", "Take-home favours"],
+    }
+
+
+def canned_plan(title, description="", guest_count=20, total_budget=500):
+    """Return a complete EventPlan dict for the event"""
+
+    event_type = classify_text(title, description)
+    return {
+        "event_classification": event_type,
+        "key_considerations": [
+            f"Planned for {guest_count} guests",
+            f"Total budget of ${total_budget}",
+            "Keep setup simple for the host",
+        ],
+        "plan": _plan_section(event_type, total_budget),
+        "logistics": ["Confirm headcount a week ahead", "Allow an hour for setup"],
+        "contingency_notes": ["Have a backup indoor space", "Order 10% extra food"],
+        "reasoning": f"A {event_type.replace('_', ' ')} plan scaled to the guest count and budget.",
+    }
+
+
+def _prompt_text(messages):
+    return "\n".join(
+        str(getattr(part, "content", ""))
+        for message in messages
+        for part in getattr(message, "parts", [])
+    )
+
+
+def _field(pattern, text, default):
+    match = re.search(pattern, text)
+    return match.group(1).strip() if match else default
+
+
+def plan_from_messages(messages):
+    """Rebuild the event from the dynamic system prompt and plan it"""
+
+    text = _prompt_text(messages)
+    return canned_plan(
+        title=_field(r"- Title: (.*)", text, ""),
+        description=_field(r"- Description: (.*)", text, ""),
+        guest_count=int(_field(r"- Guest Count: (\d+)", text, 20)),
+        total_budget=int(_field(r"- Total Budget: \$(\d+)", text, 500)),
+    )
+
+
+def build_fake_model(latency=0.0, chunk_size=200):
+    """
+    FunctionModel that answers with a canned plan after `latency` seconds.
+    Streaming runs receive the JSON in `chunk_size` pieces spread over the latency.
+    """
+    from pydantic_ai.messages import ModelResponse, ToolCallPart
+    from pydantic_ai.models.function import AgentInfo, DeltaToolCall, FunctionModel
+
+    async def respond(messages, info: AgentInfo):
+        if latency:
+            await asyncio.sleep(latency)
+        args = json.dumps(plan_from_messages(messages))
+        return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, args)])
+
+    async def stream(messages, info: AgentInfo):
+        args = json.dumps(plan_from_messages(messages))
+        chunks = [args[i : i + chunk_size] for i in range(0, len(args), chunk_size)]
+        delay = latency / len(chunks)
+
+        yield {0: DeltaToolCall(name=info.output_tools[0].name)}
+        for chunk in chunks:
+            if delay:
+                await asyncio.sleep(delay)
+            yield {0: DeltaToolCall(json_args=chunk)}
+
+    return FunctionModel(respond, stream_function=stream, model_name=FAKE_MODEL_NAME)
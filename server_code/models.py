@@ -1,13 +1,5 @@
-import anvil.users
-import anvil.secrets
-import anvil.files
-from anvil.files import data_files
-import anvil.tables as tables
-import anvil.tables.query as q
-from anvil.tables import app_tables
-import anvil.server
 from dataclasses import dataclass
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, create_model
 from typing import List, Literal, Optional, Union
 
 
@@ -136,3 +128,27 @@ class EventPlan(BaseModel):
     logistics: List[str] = Field(..., description="General logistical considerations")
     contingency_notes: List[str] = Field(..., description="Backup plans and what-ifs")
     reasoning: str = Field(..., description="Explanation of choices made")
+
+
+# Single-type Response Models, for when the event type is known up front
+def _single_type_event_plan(name, plan_model):
+    """EventPlan with `plan` narrowed to one plan model (no discriminated union)"""
+    fields = {
+        key: (field.annotation, field) for key, field in EventPlan.model_fields.items()
+    }
+    fields["plan"] = (plan_model, Field(..., description="Complete plan object"))
+    return create_model(name, **fields)
+
+
+PLAN_MODELS = {
+    "social_celebration": SocialCelebrationPlan,
+    "professional_gathering": ProfessionalGatheringPlan,
+    "intellectual_gathering": IntellectualGatheringPlan,
+}
+
+SINGLE_TYPE_EVENT_PLANS = {
+    event_type: _single_type_event_plan(
+        plan_model.__name__.replace("Plan", "EventPlan"), plan_model
+    )
+    for event_type, plan_model in PLAN_MODELS.items()
+}
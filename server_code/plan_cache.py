@@ -0,0 +1,146 @@
+import anvil.tables as tables
+import anvil.tables.query as q
+from anvil.tables import app_tables
+import anvil.server
+
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+
+from .models import EventDetails, EventPlan
+from .prompts import system_prompt, user_prompt
+
+
+# Cached plans expire after this long, and the table never grows past MAX_ENTRIES
+CACHE_TTL = timedelta(days=7)
+MAX_ENTRIES = 500
+
+
+def _prompt_version():
+    """Fingerprint of everything besides the event that shapes the model output"""
+    schema = json.dumps(EventPlan.model_json_schema(), sort_keys=True)
+    digest = hashlib.sha256(
+        "\n".join([system_prompt, user_prompt, schema]).encode("utf-8")
+    )
+    return digest.hexdigest()[:16]
+
+
+PROMPT_VERSION = _prompt_version()
+
+
+def normalize_event(event: EventDetails):
+    """Canonical form of the event fields, so cosmetic edits hit the same entry"""
+    return {
+        "title": " ".join(str(event.title).split()).lower(),
+        "description": " ".join(str(event.description).split()).lower(),
+        "event_date": str(event.event_date),
+        "guest_count": int(event.guest_count),
+        "total_budget": int(event.total_budget),
+        "venue_type": str(event.venue_type).strip().lower(),
+    }
+
+
+def cache_key(event: EventDetails, model_name, mode):
+    """Plans differ by planning mode (single_shot / two_stage), so it is keyed too"""
+    payload = json.dumps(
+        {
+            "event": normalize_event(event),
+            "prompt_version": PROMPT_VERSION,
+            "model": model_name,
+            "mode": mode,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@tables.in_transaction
+def get_cached_plan(event: EventDetails, model_name, mode):
+    """
+    Return the stored EventPlan dump for this event, or None on a miss.
+    Every lookup is counted here, whether or not a plan is stored later;
+    a miss on a new key leaves an empty row (created_at None) to count it.
+    """
+    key = cache_key(event, model_name, mode)
+    now = datetime.now(timezone.utc)
+
+    row = app_tables.plan_cache.get(cache_key=key)
+    if row is None:
+        app_tables.plan_cache.add_row(
+            cache_key=key,
+            model_name=model_name,
+            prompt_version=PROMPT_VERSION,
+            last_used=now,
+            hits=0,
+            misses=1,
+        )
+        return None
+
+    if row["created_at"] is None or now - row["created_at"] > CACHE_TTL:
+        row.update(misses=(row["misses"] or 0) + 1, last_used=now)
+        return None
+
+    row.update(hits=(row["hits"] or 0) + 1, last_used=now)
+    return row["plan"]
+
+
+@tables.in_transaction
+def store_plan(event: EventDetails, model_name, plan, mode):
+    """Save a freshly generated plan; the miss was counted by get_cached_plan"""
+    key = cache_key(event, model_name, mode)
+    now = datetime.now(timezone.utc)
+
+    row = app_tables.plan_cache.get(cache_key=key)
+    if row is None:
+        app_tables.plan_cache.add_row(
+            cache_key=key,
+            model_name=model_name,
+            prompt_version=PROMPT_VERSION,
+            plan=plan,
+            created_at=now,
+            last_used=now,
+            hits=0,
+            misses=0,
+        )
+    else:
+        row.update(
+            plan=plan,
+            prompt_version=PROMPT_VERSION,
+            created_at=now,
+            last_used=now,
+        )
+
+    _evict(now)
+
+
+def _evict(now):
+    """Drop expired entries, then the least recently used ones over MAX_ENTRIES"""
+    for row in app_tables.plan_cache.search(created_at=q.less_than(now - CACHE_TTL)):
+        row.delete()
+
+    rows = app_tables.plan_cache.search(
+        tables.order_by("last_used", ascending=False),
+    )
+    if len(rows) > MAX_ENTRIES:
+        for row in list(rows)[MAX_ENTRIES:]:
+            row.delete()
+
+
+@anvil.server.callable
+def get_plan_cache_stats():
+    rows = app_tables.plan_cache.search(
+        q.fetch_only("hits", "misses"),
+    )
+    hits = sum(r["hits"] or 0 for r in rows)
+    misses = sum(r["misses"] or 0 for r in rows)
+    lookups = hits + misses
+    return {
+        # Rows without created_at only count misses; no plan is stored
+        "entries": len(
+            app_tables.plan_cache.search(q.fetch_only(), created_at=q.not_(None))
+        ),
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+        "prompt_version": PROMPT_VERSION,
+    }
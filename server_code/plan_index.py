@@ -0,0 +1,286 @@
+"""
+Local similarity index over previously planned events.
+
+Each event is reduced to a bag of terms (title, description, venue type plus
+guest-count and budget buckets) and compared by TF-IDF cosine similarity.
+A new event that is close enough to one already planned reuses that plan,
+rescaled to its own budget and guest count, instead of another model call.
+Entries persist in the plan_index table, one per distinct event (doc_key),
+capped at MAX_ENTRIES. Each server process keeps the index loaded and
+reloads it once another process has written a newer entry.
+"""
+
+import anvil.tables as tables
+import anvil.tables.query as q
+from anvil.tables import app_tables
+
+import copy
+import hashlib
+import json
+import math
+import re
+from collections import Counter
+from datetime import datetime, timezone
+
+from .models import EventDetails
+from .classifier import classify_event
+from .plan_cache import PROMPT_VERSION
+
+# Minimum cosine similarity for a stored plan to be reused
+SIMILARITY_THRESHOLD = 0.75
+
+# Oldest entries are dropped past this many
+MAX_ENTRIES = 2000
+
+# Bucket edges; events in the same bucket share a term
+GUEST_BUCKETS = [10, 25, 50, 100, 250]
+BUDGET_BUCKETS = [100, 250, 500, 1000, 2500, 5000]
+
+# Title words say more about the event than the free-text description
+TITLE_WEIGHT = 2
+
+STOPWORDS = {
+    "a", "an", "and", "at", "for", "from", "in", "of", "on", "or", "our",
+    "the", "to", "with", "we", "will", "is", "are", "be", "this", "that",
+}
+
+
+def _bucket(value, edges):
+    value = int(value or 0)
+    for index, edge in enumerate(edges):
+        if value <= edge:
+            return index
+    return len(edges)
+
+
+def _words(text):
+    return [
+        word
+        for word in re.findall(r"[a-z0-9]+", str(text or "").lower())
+        if word not in STOPWORDS and len(word) > 1
+    ]
+
+
+def event_terms(event: EventDetails):
+    """Term frequencies describing the event"""
+    terms = Counter()
+    for word in _words(event.title):
+        terms[word] += TITLE_WEIGHT
+    terms.update(_words(event.description))
+    terms[f"venue:{str(event.venue_type).strip().lower()}"] += 1
+    terms[f"guests:{_bucket(event.guest_count, GUEST_BUCKETS)}"] += 1
+    terms[f"budget:{_bucket(event.total_budget, BUDGET_BUCKETS)}"] += 1
+    return dict(terms)
+
+
+def doc_key(event: EventDetails):
+    """Identity of an indexed event; re-planning the same event replaces its entry"""
+    payload = json.dumps(
+        {
+            "terms": event_terms(event),
+            "guest_count": int(event.guest_count),
+            "total_budget": int(event.total_budget),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PlanIndex:
+    """In-memory TF-IDF index; documents can be added one at a time"""
+
+    def __init__(self):
+        self.docs = []
+        self.document_frequency = Counter()
+
+    def __len__(self):
+        return len(self.docs)
+
+    def add(self, doc_id, terms, event_type):
+        self.docs.append((doc_id, terms, event_type))
+        self.document_frequency.update(terms.keys())
+
+    def _idf(self, term):
+        return math.log((1 + len(self.docs)) / (1 + self.document_frequency[term])) + 1
+
+    def _vector(self, terms):
+        vector = {term: count * self._idf(term) for term, count in terms.items()}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        return vector, norm
+
+    def similarity(self, a, b):
+        vector_a, norm_a = self._vector(a)
+        vector_b, norm_b = self._vector(b)
+        if not norm_a or not norm_b:
+            return 0.0
+        dot = sum(weight * vector_b.get(term, 0.0) for term, weight in vector_a.items())
+        return dot / (norm_a * norm_b)
+
+    def nearest(self, terms, event_type):
+        """Return (doc_id, score) of the closest document of the same type"""
+        best_id, best_score = None, 0.0
+        for doc_id, doc_terms, doc_type in self.docs:
+            if doc_type != event_type:
+                continue
+            score = self.similarity(terms, doc_terms)
+            if score > best_score:
+                best_id, best_score = doc_id, score
+        return best_id, best_score
+
+
+_index = None
+_index_version = None  # created_at of the newest entry when _index was loaded
+
+
+def _newest_entry_time():
+    newest = app_tables.plan_index.search(
+        q.fetch_only("created_at"),
+        tables.order_by("created_at", ascending=False),
+        prompt_version=PROMPT_VERSION,
+    )
+    for row in newest[:1]:
+        return row["created_at"]
+    return None
+
+
+def get_index():
+    """
+    The loaded index, (re)loaded on first use and whenever any process has
+    added, replaced or evicted entries since (every write stamps created_at)
+    """
+    global _index, _index_version
+    version = _newest_entry_time()
+    if _index is None or version != _index_version:
+        index = PlanIndex()
+        rows = app_tables.plan_index.search(
+            q.fetch_only("terms", "event_type"),
+            prompt_version=PROMPT_VERSION,
+        )
+        for row in rows:
+            index.add(row.get_id(), row["terms"], row["event_type"])
+        _index, _index_version = index, version
+    return _index
+
+
+# Dollar amounts in plan text, optionally per person
+MONEY_PATTERN = re.compile(
+    r"\$\s?(\d[\d,]*(?:\.\d+)?)"
+    r"(\s*(?:per|/|a)\s*(?:person|guest|head|attendee))?",
+    re.IGNORECASE,
+)
+GUEST_NOUNS = r"(?:guests|people|attendees|persons|adults|kids|children)"
+
+
+def _money(amount):
+    return f"${amount:,.2f}" if amount < 10 else f"${amount:,.0f}"
+
+
+def _adapt_text(text, budget_ratio, per_person_ratio, old_guests, new_guests):
+    """Rewrite the amounts and guest counts a stored plan's prose mentions"""
+
+    def rescale(match):
+        amount = float(match.group(1).replace(",", ""))
+        ratio = per_person_ratio if match.group(2) else budget_ratio
+        return _money(amount * ratio) + (match.group(2) or "")
+
+    if budget_ratio != 1 or per_person_ratio != 1:
+        text = MONEY_PATTERN.sub(rescale, text)
+    if old_guests and new_guests and old_guests != new_guests:
+        text = re.sub(
+            rf"\b{int(old_guests)}(\s+{GUEST_NOUNS})\b", rf"{int(new_guests)}\1", text
+        )
+    return text
+
+
+def _adapt_strings(value, *args):
+    if isinstance(value, str):
+        return _adapt_text(value, *args)
+    if isinstance(value, list):
+        return [_adapt_strings(item, *args) for item in value]
+    if isinstance(value, dict):
+        return {key: _adapt_strings(item, *args) for key, item in value.items()}
+    return value
+
+
+def adapt_plan(plan, old_budget, new_budget, old_guests=None, new_guests=None):
+    """
+    Copy of a stored plan for another budget and guest count:
+    budget_breakdown amounts are rescaled, and the dollar amounts and guest
+    counts in its text (key_considerations, section prose) are rewritten.
+    """
+    plan = copy.deepcopy(plan)
+
+    budget_ratio = 1
+    if old_budget and new_budget:
+        budget_ratio = new_budget / old_budget
+    per_person_ratio = budget_ratio
+    if old_guests and new_guests:
+        per_person_ratio = budget_ratio * old_guests / new_guests
+
+    for item in plan.get("plan", {}).get("budget_breakdown") or []:
+        if item.get("amount") is not None:
+            item["amount"] = round(item["amount"] * budget_ratio, 2)
+
+    return _adapt_strings(plan, budget_ratio, per_person_ratio, old_guests, new_guests)
+
+
+def find_similar_plan(event: EventDetails, threshold=SIMILARITY_THRESHOLD):
+    """
+    Return (plan, match) for the closest stored event above the threshold,
+    or (None, None). `match` names the source event and its similarity.
+    """
+    index = get_index()
+    if not len(index):
+        return None, None
+
+    doc_id, score = index.nearest(event_terms(event), classify_event(event))
+    if doc_id is None or score < threshold:
+        return None, None
+
+    row = app_tables.plan_index.get_by_id(doc_id)
+    if row is None:
+        return None, None
+
+    plan = adapt_plan(
+        row["plan"],
+        row["total_budget"],
+        event.total_budget,
+        row["guest_count"],
+        event.guest_count,
+    )
+    match = {"title": row["title"], "similarity": round(score, 3)}
+    return plan, match
+
+
+@tables.in_transaction
+def add_plan(event: EventDetails, plan):
+    """
+    Persist a freshly generated plan, replacing the entry for the same event
+    if there is one, then drop the oldest entries past MAX_ENTRIES. Every
+    process (this one included) reloads its index on its next lookup.
+    """
+    fields = dict(
+        title=event.title,
+        event_type=classify_event(event),
+        terms=event_terms(event),
+        total_budget=int(event.total_budget),
+        guest_count=int(event.guest_count),
+        prompt_version=PROMPT_VERSION,
+        plan=plan,
+        created_at=datetime.now(timezone.utc),
+    )
+
+    key = doc_key(event)
+    row = app_tables.plan_index.get(doc_key=key)
+    if row is None:
+        app_tables.plan_index.add_row(doc_key=key, **fields)
+    else:
+        row.update(**fields)
+
+    rows = app_tables.plan_index.search(
+        q.fetch_only("created_at"),
+        tables.order_by("created_at", ascending=False),
+    )
+    if len(rows) > MAX_ENTRIES:
+        for old in list(rows)[MAX_ENTRIES:]:
+            old.delete()
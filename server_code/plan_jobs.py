@@ -0,0 +1,99 @@
+from anvil.tables import app_tables
+import anvil.server
+
+import uuid
+from datetime import datetime, timezone
+
+from . import event_ai
+
+
+@anvil.server.callable
+def submit_plan_job(user_input, event_id=None):
+    """
+    Queue AI planning for an event and return a job id right away.
+    The plan is generated (streamed) in a background task and written to
+    ai_response; poll get_plan_job for its progress.
+    """
+
+    # Validate the input before queueing so bad requests fail fast
+    event_ai.event_from_input(user_input)
+
+    job_id = uuid.uuid4().hex
+    row = app_tables.ai_response.add_row(
+        job_id=job_id,
+        event_id=app_tables.event.get_by_id(event_id) if event_id else None,
+        status="queued",
+        created_at=datetime.now(timezone.utc),
+    )
+
+    task = anvil.server.launch_background_task("run_plan_job", job_id, user_input)
+    row["task_id"] = task.get_id()
+
+    return {"success": True, "job_id": job_id}
+
+
+@anvil.server.background_task
+def run_plan_job(job_id, user_input):
+    row = app_tables.ai_response.get(job_id=job_id)
+    row["status"] = "running"
+
+    event = event_ai.event_from_input(user_input)
+    try:
+        plan = event_ai.stream_plan(event, event_row=row["event_id"])
+        row.update(
+            ai_response=plan,
+            status="done",
+            completed_at=datetime.now(timezone.utc),
+        )
+    except Exception as e:
+        print(f"✗ Error planning {event.title}: {str(e)}")
+        row.update(
+            status="failed",
+            error=str(e),
+            completed_at=datetime.now(timezone.utc),
+        )
+
+
+@anvil.server.callable
+def get_plan_job(job_id):
+    """
+    Return the status of a planning job right away; clients poll it on a
+    timer rather than holding a server call open. "sections" holds the
+    [key, value] plan sections finished so far, in the order published.
+    """
+
+    row = app_tables.ai_response.get(job_id=job_id)
+    if row is None:
+        return {"success": False, "error": f"Unknown job: {job_id}"}
+
+    status = _check_task_alive(row)
+    result = {"success": True, "job_id": job_id, "status": status, "sections": []}
+    if status == "done":
+        result["ai_plan"] = row["ai_response"]
+    elif status == "failed":
+        result["error"] = row["error"]
+
+    if status in ("running", "done") and row["task_id"]:
+        state = anvil.server.get_background_task(row["task_id"]).get_state()
+        result["sections"] = state.get("sections", [])
+    return result
+
+
+def _check_task_alive(row):
+    """Mark a job failed if its background task died without reporting back"""
+
+    status = row["status"]
+    if status not in ("queued", "running") or not row["task_id"]:
+        return status
+
+    task = anvil.server.get_background_task(row["task_id"])
+    termination = task.get_termination_status()
+    if termination in ("failed", "killed", "missing"):
+        row.update(
+            status="failed",
+            error=f"Planning task {termination}",
+            completed_at=datetime.now(timezone.utc),
+        )
+        return "failed"
+
+    return status
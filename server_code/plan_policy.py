@@ -0,0 +1,167 @@
+"""
+Deadline, retry and repair policy for plan generation.
+
+A planning request gets one overall deadline. The primary model is retried
+with jittered exponential backoff until FALLBACK_RESERVE_SECONDS are left;
+that reserve goes to one attempt with the cheaper fallback model. A run that
+fails EventPlan validation is repaired from its last tool-call arguments when
+enough of the plan arrived; a repaired plan is only served once every model
+attempt has failed. event_ai.run_with_policy drives the attempts.
+"""
+
+import random
+import typing
+
+from pydantic import BaseModel, ValidationError
+from pydantic_core import from_json
+
+from .models import EventPlan, PLAN_MODELS
+
+# Whole request, including retries, backoff and the fallback attempt
+DEADLINE_SECONDS = 60
+# A single model attempt never runs longer than this
+ATTEMPT_TIMEOUT_SECONDS = 30
+# Time kept back for the fallback model once the primary keeps failing
+FALLBACK_RESERVE_SECONDS = 15
+
+MAX_ATTEMPTS = 3
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 4
+
+# When every model attempt fails, a loosely similar stored plan beats nothing
+FALLBACK_SIMILARITY_THRESHOLD = 0.5
+
+# Share of a plan's sections that must have arrived non-empty (budget_breakdown
+# always among them) before a partial plan is worth repairing
+REPAIR_MIN_SECTION_SHARE = 0.75
+
+
+class PlanningError(Exception):
+    """Every attempt, fallback and stored plan failed for a request"""
+
+    def __init__(self, message, errors=None, timings=None):
+        super().__init__(message)
+        self.errors = errors or []
+        self.timings = timings or {}
+
+
+def new_timings():
+    return {
+        "lookup_ms": 0.0,
+        "model_ms": 0.0,
+        "backoff_ms": 0.0,
+        "repair_ms": 0.0,
+        "fallback_ms": 0.0,
+        "total_ms": 0.0,
+    }
+
+
+def backoff_delay(attempt):
+    """Full-jitter exponential backoff for retry number `attempt` (0-based)"""
+    ceiling = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2**attempt)
+    return random.uniform(0, ceiling)
+
+
+def output_from_messages(messages):
+    """Output tool arguments of the last model response, parsed leniently"""
+    from pydantic_ai.messages import ModelResponse, ToolCallPart
+
+    for message in reversed(messages or []):
+        if not isinstance(message, ModelResponse):
+            continue
+        for part in message.parts:
+            if isinstance(part, ToolCallPart) and part.args:
+                if isinstance(part.args, dict):
+                    return part.args
+                try:
+                    return from_json(part.args, allow_partial=True)
+                except ValueError:
+                    return {}
+    return {}
+
+
+def _is_model(annotation):
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+def _fill(data, model):
+    """Fill missing list/str/sub-model fields with empty values, drop broken list items"""
+    filled = {}
+    for name, field in model.model_fields.items():
+        annotation = field.annotation
+        item_type = (typing.get_args(annotation) or [None])[0]
+        value = data.get(name)
+
+        if value is None:
+            if not field.is_required():
+                continue
+            if annotation is str:
+                value = ""
+            elif typing.get_origin(annotation) is list:
+                value = []
+            elif _is_model(annotation):
+                value = {}
+            else:
+                continue
+
+        if _is_model(annotation) and isinstance(value, dict):
+            value = _fill(value, annotation)
+        elif typing.get_origin(annotation) is list and _is_model(item_type):
+            value = [_fill(item, item_type) for item in value if isinstance(item, dict)]
+            value = [item for item in value if _validates(item, item_type)]
+
+        filled[name] = value
+    return filled
+
+
+def _validates(data, model):
+    try:
+        model.model_validate(data)
+        return True
+    except ValidationError:
+        return False
+
+
+def _has_content(value):
+    """True unless value is empty, or a sub-model filled only with empty defaults"""
+    if isinstance(value, dict):
+        return any(_has_content(item) for item in value.values())
+    return bool(value)
+
+
+def _has_core_sections(plan, plan_model):
+    """A non-empty budget_breakdown and at least REPAIR_MIN_SECTION_SHARE of the rest"""
+    if not plan.get("budget_breakdown"):
+        return False
+    sections = [name for name in plan_model.model_fields if name != "event_type"]
+    arrived = [name for name in sections if _has_content(plan.get(name))]
+    return len(arrived) >= REPAIR_MIN_SECTION_SHARE * len(sections)
+
+
+def repair_plan(data, event_type):
+    """
+    Complete a partial EventPlan dict with empty defaults. Returns the
+    validated dump, or None when too little of the plan arrived to be useful
+    (see _has_core_sections).
+    """
+    plan = data.get("plan") if isinstance(data, dict) else None
+    if not isinstance(plan, dict):
+        return None
+
+    if plan.get("event_type") in PLAN_MODELS:
+        event_type = plan["event_type"]
+    plan_model = PLAN_MODELS[event_type]
+
+    repaired = _fill({k: v for k, v in data.items() if k != "plan"}, EventPlan)
+    repaired["event_classification"] = (
+        repaired.get("event_classification") or event_type
+    )
+    # Judged after broken list items were dropped
+    repaired["plan"] = dict(_fill(plan, plan_model), event_type=event_type)
+    if not _has_core_sections(repaired["plan"], plan_model):
+        return None
+
+    try:
+        return EventPlan.model_validate(repaired).model_dump()
+    except ValidationError:
+        return None
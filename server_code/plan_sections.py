@@ -0,0 +1,202 @@
+"""
+AI plans stored one row per section in the ai_response table.
+
+Top-level EventPlan keys are stored under their own name and the entries of
+the nested plan object as "plan.<key>". Each row keeps its rank (order in
+the plan) and a version that goes up whenever that section is rewritten, so
+views can load single sections and edits touch only the section changed.
+Planning job rows share the table; section rows are the ones with a
+section_key.
+"""
+
+import anvil.tables as tables
+import anvil.tables.query as q
+from anvil.tables import app_tables
+import anvil.server
+
+from datetime import datetime, timezone
+
+from . import change_log
+
+PLAN_PREFIX = "plan."
+
+# Keys run_ai and the client add to a plan that are not part of it
+PLAN_METADATA_KEYS = {
+    "event_id",
+    "input_event_details",
+    "cache_hit",
+    "plan_source",
+    "similar_to",
+}
+
+
+def split_plan(plan):
+    """[(section_key, payload)] for an EventPlan dict, in plan order"""
+    sections = []
+    for key, value in (plan or {}).items():
+        if key in PLAN_METADATA_KEYS:
+            continue
+        if key == "plan" and isinstance(value, dict):
+            sections.extend((PLAN_PREFIX + k, v) for k, v in value.items())
+        else:
+            sections.append((key, value))
+    return sections
+
+
+def assemble_plan(rows):
+    """Rebuild the EventPlan dict from section rows"""
+    plan = {}
+    for row in sorted(rows, key=lambda r: r["rank"]):
+        key = row["section_key"]
+        if key.startswith(PLAN_PREFIX):
+            plan.setdefault("plan", {})[key[len(PLAN_PREFIX) :]] = row["payload"]
+        else:
+            plan[key] = row["payload"]
+    return plan
+
+
+def section_rows(event_row, *columns):
+    return app_tables.ai_response.search(
+        q.fetch_only("section_key", "rank", *columns),
+        event_id=event_row,
+        section_key=q.not_(None),
+    )
+
+
+@tables.in_transaction
+def save_plan(event_row, plan):
+    """Store a whole plan as section rows, replacing the event's previous plan"""
+    versions = {
+        row["section_key"]: row["version"] or 0
+        for row in section_rows(event_row, "version")
+    }
+    section_rows(event_row).delete_all_rows()
+
+    rows = [
+        {
+            "event_id": event_row,
+            "section_key": key,
+            "rank": rank,
+            "payload": payload,
+            "version": versions.get(key, 0) + 1,
+        }
+        for rank, (key, payload) in enumerate(split_plan(plan))
+    ]
+    return app_tables.ai_response.add_rows(rows) if rows else []
+
+
+def get_event_plan(event_row):
+    """
+    The event's full plan. Events saved before plans were split still
+    have it in event.ai_response.
+    """
+    rows = list(section_rows(event_row, "payload"))
+    if rows:
+        return assemble_plan(rows)
+    return event_row["ai_response"] or {}
+
+
+def legacy_section_rows(event_row):
+    """
+    Section rows, as dicts, split from the event.ai_response blob of an
+    event saved before plans were split. Version 0: never rewritten.
+    """
+    return [
+        {"section_key": key, "rank": rank, "version": 0, "payload": payload}
+        for rank, (key, payload) in enumerate(split_plan(event_row["ai_response"]))
+    ]
+
+
+def plan_outline(event_row):
+    """The event's section keys in plan order"""
+    rows = sorted(section_rows(event_row), key=lambda r: r["rank"])
+    if not rows:
+        rows = legacy_section_rows(event_row)
+    return [row["section_key"] for row in rows]
+
+
+def migrate_event_plans():
+    """Split every event's ai_response blob into section rows"""
+    for event_row in app_tables.event.search(ai_response=q.not_(None)):
+        if not len(section_rows(event_row)):
+            save_plan(event_row, event_row["ai_response"])
+
+
+@anvil.server.callable
+def get_event_sections(event_id, section_keys=None):
+    """
+    Sections of an event's plan, in plan order. With section_keys only
+    those sections' payloads are loaded; without, just the keys and
+    versions (the plan's outline).
+    """
+    event_row = app_tables.event.get_by_id(event_id)
+    if event_row is None:
+        return {"success": False, "error": "Event not found"}
+
+    if section_keys is None:
+        rows = list(section_rows(event_row, "version"))
+    elif not section_keys:
+        # q.any_of() with no arguments is not a valid query
+        return {"success": True, "sections": []}
+    else:
+        rows = list(
+            app_tables.ai_response.search(
+                q.fetch_only("section_key", "rank", "version", "payload"),
+                event_id=event_row,
+                section_key=q.any_of(*section_keys),
+            )
+        )
+
+    # Not split yet: serve the sections from the old blob
+    if not rows and (section_keys is None or not len(section_rows(event_row))):
+        rows = legacy_section_rows(event_row)
+        if section_keys is not None:
+            rows = [row for row in rows if row["section_key"] in section_keys]
+
+    sections = [
+        {
+            "section_key": row["section_key"],
+            "rank": row["rank"],
+            "version": row["version"],
+            **({"payload": row["payload"]} if section_keys is not None else {}),
+        }
+        for row in sorted(rows, key=lambda r: r["rank"])
+    ]
+    return {"success": True, "sections": sections}
+
+
+@anvil.server.callable
+@tables.in_transaction
+def update_event_section(event_id, section_key, payload, expected_version=None):
+    """
+    Rewrite one plan section. Pass the version that was read as
+    expected_version to refuse overwriting someone else's newer edit.
+    """
+    event_row = app_tables.event.get_by_id(event_id)
+    if event_row is None:
+        return {"success": False, "error": "Event not found"}
+
+    row = app_tables.ai_response.get(event_id=event_row, section_key=section_key)
+    if row is None:
+        app_tables.ai_response.add_row(
+            event_id=event_row,
+            section_key=section_key,
+            rank=len(section_rows(event_row)),
+            payload=payload,
+            version=1,
+        )
+        event_row["updated_at"] = datetime.now(timezone.utc)
+        change_log.log_change("event", change_log.UPDATE, event_row, event_row)
+        return {"success": True, "version": 1}
+
+    if expected_version is not None and row["version"] != expected_version:
+        return {
+            "success": False,
+            "error": "Section was changed by someone else",
+            "version": row["version"],
+        }
+
+    row.update(payload=payload, version=(row["version"] or 0) + 1)
+    event_row["updated_at"] = datetime.now(timezone.utc)
+    change_log.log_change("event", change_log.UPDATE, event_row, event_row)
+    return {"success": True, "version": row["version"]}
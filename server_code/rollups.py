@@ -0,0 +1,79 @@
+"""
+Per-event rollup columns: task_total, task_done, budget_estimated and
+budget_actual on the event row.
+
+Every write to tasks or budget_items updates these in the same transaction,
+so list and detail views read progress off the event row instead of
+fetching and counting its child rows. Each update also stamps the event's
+updated_at, so clients syncing changes pick up the new counts.
+"""
+
+import anvil.tables as tables
+import anvil.tables.query as q
+from anvil.tables import app_tables
+
+from datetime import datetime, timezone
+
+ROLLUP_COLUMNS = ("task_total", "task_done", "budget_estimated", "budget_actual")
+
+
+def is_done_query():
+    """Tasks count as done when ticked or moved to the Done status"""
+    return q.any_of(status="Done", is_done=True)
+
+
+def task_is_done(task):
+    return bool(task["is_done"]) or task["status"] == "Done"
+
+
+def get_rollups(event_row):
+    """The rollup values of an event, with 0 for columns never written"""
+    return {column: event_row[column] or 0 for column in ROLLUP_COLUMNS}
+
+
+def add_task_counts(event_row, total=0, done=0):
+    """Shift the task counters by a delta. Call inside the write's transaction."""
+    event_row.update(
+        task_total=max((event_row["task_total"] or 0) + total, 0),
+        task_done=max((event_row["task_done"] or 0) + done, 0),
+        updated_at=datetime.now(timezone.utc),
+    )
+
+
+def set_budget_totals(event_row, budget_items):
+    """Set the budget totals from the event's complete list of budget item rows or dicts"""
+    event_row.update(
+        budget_estimated=sum(item["estimated_amount"] or 0 for item in budget_items),
+        budget_actual=sum(item["actual_amount"] or 0 for item in budget_items),
+        updated_at=datetime.now(timezone.utc),
+    )
+
+
+def recompute_task_counts(event_row):
+    """Recount from the tasks table; len() on a search is a database count"""
+    event_row.update(
+        task_total=len(app_tables.tasks.search(q.fetch_only(), event_link=event_row)),
+        task_done=len(
+            app_tables.tasks.search(
+                q.fetch_only(), is_done_query(), event_link=event_row
+            )
+        ),
+        updated_at=datetime.now(timezone.utc),
+    )
+
+
+@tables.in_transaction
+def recompute_rollups(event_row):
+    recompute_task_counts(event_row)
+    set_budget_totals(
+        event_row,
+        app_tables.budget_items.search(
+            q.fetch_only("estimated_amount", "actual_amount"), event_link=event_row
+        ),
+    )
+
+
+def backfill_rollups():
+    """Fill the rollup columns for events saved before they existed"""
+    for event_row in app_tables.event.search():
+        recompute_rollups(event_row)
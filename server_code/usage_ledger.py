@@ -0,0 +1,123 @@
+import anvil.users
+import anvil.tables.query as q
+from anvil.tables import app_tables
+import anvil.server
+
+from collections import defaultdict
+from datetime import datetime, timezone
+
+# Set to False to skip the ledger, e.g. for offline benchmarks
+ENABLED = True
+
+# USD per 1M tokens: (input, output)
+PRICING = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+}
+
+
+def estimate_cost(model_name, request_tokens, response_tokens):
+    input_price, output_price = PRICING.get(model_name, (0, 0))
+    return (request_tokens * input_price + response_tokens * output_price) / 1_000_000
+
+
+def record_usage(
+    model_name,
+    usage=None,
+    latency_ms=0,
+    cache_hit=False,
+    event=None,
+    source="run_ai",
+):
+    """
+    Append one agent run to the ai_usage ledger. `usage` is the RunUsage
+    from result.usage(); cache hits are recorded with zero tokens.
+    """
+    if not ENABLED:
+        return
+
+    request_tokens = (usage.input_tokens or 0) if usage else 0
+    response_tokens = (usage.output_tokens or 0) if usage else 0
+
+    try:
+        app_tables.ai_usage.add_row(
+            event=event,
+            user=anvil.users.get_user(),
+            source=source,
+            model_name=model_name,
+            request_tokens=request_tokens,
+            response_tokens=response_tokens,
+            total_tokens=request_tokens + response_tokens,
+            cost_usd=estimate_cost(model_name, request_tokens, response_tokens),
+            latency_ms=round(latency_ms, 1),
+            cache_hit=cache_hit,
+            created_at=datetime.now(timezone.utc),
+        )
+    except Exception as e:
+        # Accounting must never fail a planning request
+        print(f"✗ Error recording usage: {str(e)}")
+
+
+def _empty_totals():
+    return {
+        "runs": 0,
+        "cache_hits": 0,
+        "request_tokens": 0,
+        "response_tokens": 0,
+        "total_tokens": 0,
+        "cost_usd": 0.0,
+        "latency_ms": 0.0,
+    }
+
+
+def _add(totals, row):
+    totals["runs"] += 1
+    totals["cache_hits"] += 1 if row["cache_hit"] else 0
+    totals["request_tokens"] += row["request_tokens"] or 0
+    totals["response_tokens"] += row["response_tokens"] or 0
+    totals["total_tokens"] += row["total_tokens"] or 0
+    totals["cost_usd"] += row["cost_usd"] or 0
+    totals["latency_ms"] += row["latency_ms"] or 0
+
+
+def is_admin(user):
+    """Only admins (users.is_admin) may see usage across all users"""
+    return user is not None and bool(user["is_admin"])
+
+
+@anvil.server.callable(require_user=is_admin)
+def get_usage_summary(start=None, end=None):
+    """
+    Token and cost totals per user and per day, optionally within
+    [start, end). Admins only, since it lists every user's email.
+    """
+
+    filters = []
+    if start:
+        filters.append(q.greater_than_or_equal_to(start))
+    if end:
+        filters.append(q.less_than(end))
+    query = {"created_at": q.all_of(*filters)} if filters else {}
+
+    per_user = defaultdict(_empty_totals)
+    per_day = defaultdict(_empty_totals)
+    overall = _empty_totals()
+
+    for row in app_tables.ai_usage.search(**query):
+        user = row["user"]
+        _add(per_user[user["email"] if user else "anonymous"], row)
+        _add(per_day[row["created_at"].date().isoformat()], row)
+        _add(overall, row)
+
+    for totals in [overall, *per_user.values(), *per_day.values()]:
+        latency_ms = totals.pop("latency_ms")
+        totals["cost_usd"] = round(totals["cost_usd"], 6)
+        totals["avg_latency_ms"] = (
+            round(latency_ms / totals["runs"], 1) if totals["runs"] else 0.0
+        )
+
+    return {
+        "overall": overall,
+        "per_user": dict(per_user),
+        "per_day": dict(sorted(per_day.items())),
+    }